@@ -8,12 +8,21 @@ import numpy as np
 import cv2
 import time
 import os
+import sys
 import csv
+from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 from ultralytics import YOLO
 import pandas as pd
 
+APP_DIR = Path(__file__).resolve().parent.parent
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from core.progress_events import JSON_PROGRESS_FLAG, ProgressReporter
+from core import label_store as label_store_utils
+
 # -------------------------------------------------
 # LOAD CLASSES
 # -------------------------------------------------
@@ -31,26 +40,11 @@ label_dict = {i: name for i, name in enumerate(class_list)}
 # -------------------------------------------------
 def load_yolo_gt(label_path, img_w, img_h):
     """Load YOLO txt labels and convert normalized boxes to pixel coordinates."""
-    gt = []
-    if not os.path.exists(label_path):
-        return gt
-
-    with open(label_path) as f:
-        for line in f:
-            cls, xc, yc, bw, bh = map(float, line.split())
-
-            xc *= img_w
-            yc *= img_h
-            bw *= img_w
-            bh *= img_h
-
-            x1 = int(xc - bw / 2)
-            y1 = int(yc - bh / 2)
-            x2 = int(xc + bw / 2)
-            y2 = int(yc + bh / 2)
-
-            gt.append([int(cls), x1, y1, x2, y2])
-    return gt
+    labels = label_store_utils.parse_label_file(label_path).astype(np.float64)
+    xc, yc = labels[:, 1] * img_w, labels[:, 2] * img_h
+    bw, bh = labels[:, 3] * img_w, labels[:, 4] * img_h
+    corners = np.stack([xc - bw / 2, yc - bh / 2, xc + bw / 2, yc + bh / 2], axis=1).astype(int)
+    return [[int(cls), *box] for cls, box in zip(labels[:, 0], corners.tolist())]
 
 # -------------------------------------------------
 # IOU
@@ -74,14 +68,18 @@ def evaluate_folder(
     folder_path,
     output_dir,
     iou_thresh=0.5,
-    conf_thresh=0.25
+    conf_thresh=0.25,
+    reporter=None,
+    progress_label=""
 ):
     """Evaluate a model on all JPG images in a folder and compute metrics.
 
     - Draws GT boxes in green and prediction boxes in red.
     - Tracks overall and per-class TP/FP/FN.
+    - Reports per-image progress through `reporter` when given.
     - Returns metric dictionary for logging.
     """
+    reporter = reporter or ProgressReporter("evaluate", enabled=False)
     os.makedirs(output_dir, exist_ok=True)
 
     num_classes = len(label_dict)
@@ -92,15 +90,16 @@ def evaluate_folder(
     # Per-class stats
     per_class = {cid: {"tp": 0, "fp": 0, "fn": 0} for cid in label_dict}
 
-    for file in sorted(os.listdir(folder_path)):
-        if not file.lower().endswith(".jpg"):
-            continue
+    files = [file for file in sorted(os.listdir(folder_path)) if file.lower().endswith(".jpg")]
 
+    for file_idx, file in enumerate(files, start=1):
         img_path = os.path.join(folder_path, file)
         label_path = img_path.replace(".jpg", ".txt")
 
         img = cv2.imread(img_path)
         if img is None:
+            reporter.warning(f"Could not read {file}")
+            reporter.progress(file_idx, len(files), message=f"{progress_label}{file}")
             continue
 
         h, w, _ = img.shape
@@ -171,6 +170,7 @@ def evaluate_folder(
         # ---- Save the image with GT and predicted boxes ----
         cv2.imwrite(os.path.join(output_dir, file), img)
         print(f"Processed {file}")
+        reporter.progress(file_idx, len(files), message=f"{progress_label}{file}")
 
     # ---- Metrics ----
     overall_precision = TP / (TP + FP) if TP + FP else 0
@@ -219,7 +219,9 @@ def log_metrics(csv_path, model_name, metrics):
 # -------------------------------------------------
 
 if __name__ == "__main__":
-    import sys
+    json_progress = JSON_PROGRESS_FLAG in sys.argv
+    cli_args = [arg for arg in sys.argv[1:] if arg != JSON_PROGRESS_FLAG]
+    reporter = ProgressReporter("evaluate_models", enabled=json_progress)
     
     # Get all available models from model folder
     model_dir = "model/"
@@ -227,11 +229,12 @@ if __name__ == "__main__":
     
     if not available_models:
         print("No models found in model/ folder!")
+        reporter.error("No models found in model/ folder!")
         sys.exit(1)
     
     # Allow selecting model via command line argument or process all
-    if len(sys.argv) > 1:
-        detection_model = sys.argv[1]
+    if cli_args:
+        detection_model = cli_args[0]
         if not detection_model.endswith('.pt'):
             detection_model += '.pt'
         models_to_process = [detection_model] if detection_model in available_models else []
@@ -241,8 +244,12 @@ if __name__ == "__main__":
     
     if not models_to_process:
         print(f"No valid models to process. Available: {available_models}")
+        reporter.error(f"No valid models to process. Available: {available_models}")
         sys.exit(1)
     
+    reporter.start(total=0, models=models_to_process)
+    processed_models = {}
+
     # Process each model
     for detection_model in models_to_process:
         print(f"\n{'='*60}")
@@ -252,9 +259,11 @@ if __name__ == "__main__":
         model_path = model_dir + detection_model
         
         try:
-            model = YOLO(model_path)
+            with reporter.stage(f"model_load:{detection_model}"):
+                model = YOLO(model_path)
         except Exception as e:
             print(f"Failed to load model {detection_model}: {e}")
+            reporter.warning(f"Failed to load model {detection_model}: {e}")
             continue
         
         model_name = str(detection_model).split(".")[0]
@@ -264,7 +273,9 @@ if __name__ == "__main__":
         metrics = evaluate_folder(
             model,
             folder_path="ground_truth/1",
-            output_dir=output_predictions
+            output_dir=output_predictions,
+            reporter=reporter,
+            progress_label=f"{model_name}: "
         )
         
         print(f"\nResults for {model_name}:")
@@ -284,9 +295,14 @@ if __name__ == "__main__":
         
         print(f"\nMetrics saved to metrics.csv")
         print(f"Output images saved to {output_predictions}/")
+        processed_models[model_name] = metrics
     
     print(f"\n{'='*60}")
     print("All models processed successfully!")
     print(f"{'='*60}")
+    reporter.summary(
+        {"models": processed_models, "metrics_csv": "metrics.csv"},
+        message=f"Evaluated {len(processed_models)}/{len(models_to_process)} models.",
+    )
 
 
@@ -0,0 +1,6 @@
+"""Page modules for the Streamlit app.
+
+`streamlit_app.py` renders the shared chrome (styles, navigation, sidebar,
+footer) and then imports and runs only the active page's `render()`, so a
+rerun never executes the code of the pages that are not on screen.
+"""
@@ -0,0 +1,1074 @@
+"""Annotate page: frame extraction, filtering, augmentation, auto-annotation and the gallery."""
+
+from pathlib import Path
+import io
+import os
+import sys
+import zipfile
+
+import streamlit as st
+
+from app_pages.common import BASE_DIR, VIDEOS_DIR, format_duration, render_job_panel, submit_worker_job
+from core import class_manager as class_utils
+from core import file_index as file_index_utils
+from core import jobs as job_utils
+from core import model_registry as model_registry_utils
+from core.lazy_imports import lazy_module
+from data_augmentation import DEFAULT_AUGMENT_BATCH_SIZE, DEFAULT_AUGMENT_WORKERS
+
+pd = lazy_module("pandas")
+class_remap_utils = lazy_module("core.class_remap")
+dataset_stats_utils = lazy_module("core.dataset_stats")
+gallery_prefetch_utils = lazy_module("core.gallery_prefetch")
+gallery_utils = lazy_module("core.gallery_utils")
+thumbnail_utils = lazy_module("core.thumbnail_cache")
+
+
+def render_dataset_stats(label_dir: Path):
+    """Class counts, box histograms and label problems for one annotation folder (cached per folder signature)."""
+    refresh = st.button("Recompute", key="dataset_stats_refresh")
+    try:
+        with st.spinner("Reading label files..."):
+            stats = dataset_stats_utils.get_dataset_stats(label_dir, refresh=refresh)
+    except OSError as exc:
+        st.error(f"Could not read labels: {exc}")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Label files", stats["files"])
+    col2.metric("Boxes", stats["boxes"])
+    col3.metric("Boxes / image", f"{stats['mean_boxes_per_image']:.2f}")
+    col4.metric("Images without labels", stats["images_without_labels"])
+    source = "cached" if stats.get("cached") else f"computed in {stats['seconds']:.2f}s"
+    st.caption(f"{stats['images']} images · {stats['empty_label_files']} empty label files · {source}")
+
+    names = stats["class_names"]
+    if stats["class_counts"]:
+        class_df = pd.DataFrame([
+            {
+                "Class": f"{class_id}: {names[class_id]}" if 0 <= class_id < len(names) else str(class_id),
+                "Boxes": count,
+                "Images": stats["images_per_class"].get(class_id, 0),
+            }
+            for class_id, count in sorted(stats["class_counts"].items())
+        ])
+        st.bar_chart(class_df.set_index("Class")[["Boxes"]])
+        st.dataframe(class_df, use_container_width=True, hide_index=True)
+
+    col_size, col_aspect, col_per_image = st.columns(3)
+    with col_size:
+        st.caption("Box size (sqrt of normalized area)")
+        size_hist = stats["box_size_hist"]
+        st.bar_chart(pd.DataFrame({"Boxes": size_hist["counts"]}, index=size_hist["labels"]))
+    with col_aspect:
+        st.caption("Box aspect (normalized width:height)")
+        aspect_hist = stats["aspect_hist"]
+        st.bar_chart(pd.DataFrame({"Boxes": aspect_hist["counts"]}, index=aspect_hist["labels"]))
+    with col_per_image:
+        st.caption("Boxes per image")
+        st.bar_chart(pd.DataFrame({"Images": list(stats["boxes_per_image"].values())}, index=list(stats["boxes_per_image"])))
+
+    problems = [
+        ("out_of_range_boxes", "out_of_range_files", "boxes with coordinates outside the image"),
+        ("unknown_class_boxes", "unknown_class_files", "boxes with a class id missing from classes.txt"),
+        ("malformed_files_count", "malformed_files", "label files with malformed lines"),
+    ]
+    for count_key, files_key, message in problems:
+        if stats[count_key]:
+            st.warning(f"{stats[count_key]} {message}")
+            st.code("\n".join(stats[files_key]), language=None)
+
+
+def relabel_classes(label_dir: Path, mapping: dict, new_classes: list) -> None:
+    """Rewrite the label files of `label_dir` through `mapping` and save `new_classes`; report the result."""
+    try:
+        with st.spinner("Relabeling..."):
+            summary = class_remap_utils.apply_remap(label_dir, mapping, new_classes)
+    except (OSError, RuntimeError, ValueError) as exc:
+        st.session_state["class_remap_result"] = ("error", f"Relabel failed: {exc}")
+        return
+    if not summary["completed"]:
+        st.session_state["class_remap_result"] = (
+            "error",
+            f"{summary['error_count']} label files could not be rewritten (e.g. {summary['errors'][0][0]}); "
+            "resume the remap once they are writable.",
+        )
+        return
+    st.session_state["class_remap_result"] = (
+        "success",
+        f"Relabeled {summary['files_affected']} files: {summary['boxes_moved']} boxes renumbered, "
+        f"{summary['boxes_deleted']} deleted in {summary['seconds']:.2f}s.",
+    )
+
+
+def render_class_remap(label_dir: Path, current_classes: list):
+    """Reorder, merge, rename or delete classes and rewrite the existing label files to match."""
+    result = st.session_state.pop("class_remap_result", None)
+    if result:
+        getattr(st, result[0])(result[1])
+
+    pending = class_remap_utils.pending_remap(label_dir)
+    if pending is not None:
+        st.warning(f"An interrupted class remap is pending ({len(pending['files'])} files journaled).")
+        if st.button("Resume remap", key="resume_class_remap"):
+            try:
+                with st.spinner("Resuming..."):
+                    summary = class_remap_utils.resume_remap(label_dir)
+                st.session_state["class_remap_result"] = (
+                    ("success", f"Remap finished: {summary['files_affected']} files rewritten, {summary['files_skipped']} already done.")
+                    if summary["completed"] else ("error", f"{summary['error_count']} label files still failed.")
+                )
+            except OSError as exc:
+                st.session_state["class_remap_result"] = ("error", f"Resume failed: {exc}")
+            st.rerun()
+        return
+
+    with st.expander("Reorder, merge, rename or delete classes"):
+        st.caption(
+            "Edit the class list (one per line; the order sets the ids). Classes left out are deleted with their boxes. "
+            "Use `old = new` lines to rename a class or merge several into one."
+        )
+        new_text = st.text_area("New class list", value="\n".join(current_classes), key="class_remap_new")
+        alias_text = st.text_area("Renames / merges", placeholder="car = vehicle\ntruck = vehicle", key="class_remap_aliases")
+        new_classes = [line.strip() for line in new_text.splitlines() if line.strip()]
+        try:
+            mapping = class_remap_utils.build_mapping(current_classes, new_classes, class_remap_utils.parse_aliases(alias_text.splitlines()))
+        except ValueError as exc:
+            st.error(str(exc))
+            return
+
+        changes = class_remap_utils.describe_mapping(mapping, current_classes, new_classes)
+        if not changes and new_classes == current_classes:
+            return
+        st.code("\n".join(changes) if changes else "Only new classes are added", language=None)
+
+        col_preview, col_apply = st.columns(2)
+        with col_preview:
+            if st.button("Preview", key="class_remap_preview"):
+                summary = class_remap_utils.dry_run(label_dir, mapping)
+                st.info(
+                    f"{summary['files_affected']} of {summary['files']} label files change: "
+                    f"{summary['boxes_moved']} boxes renumbered, {summary['boxes_deleted']} deleted."
+                )
+        with col_apply:
+            if st.button("Apply", key="class_remap_apply", type="primary"):
+                relabel_classes(label_dir, mapping, new_classes)
+                st.rerun()
+
+
+def render():
+    """Render the Annotate page."""
+    FRAMES_DIR = Path(st.session_state["frames_dir"])
+    ANNOT_DIR = Path(st.session_state["annot_dir"])
+
+    # Keep the on-disk thumbnail cache bounded; once per browser session is enough.
+    if "thumbnail_cache_pruned" not in st.session_state:
+        thumbnail_utils.prune_thumbnail_cache(thumbnail_utils.DEFAULT_THUMBNAIL_DIR)
+        thumbnail_utils.prune_thumbnail_cache(thumbnail_utils.DEFAULT_OVERLAY_DIR)
+        st.session_state["thumbnail_cache_pruned"] = True
+
+    # Hero Header
+    st.markdown("""
+    <div class="hero-header">
+        <h1 class="hero-title">
+            <svg width="32" height="32" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" style="display:inline;vertical-align:middle;margin-right:8px;">
+                <polygon points="23 7 16 12 23 17 23 7"></polygon>
+                <rect x="1" y="5" width="15" height="14" rx="2" ry="2"></rect>
+            </svg>
+            Percieva<sup>TM</sup> Auto-Annotation Studio
+        </h1>
+        <p class="hero-subtitle">End-to-end video annotation pipeline powered by AI</p>
+        <div class="hero-badges">
+            <span class="hero-badge">
+                <svg width="12" height="12" viewBox="0 0 24 24" fill="currentColor"><polygon points="13 2 3 14 12 14 11 22 21 10 12 10 13 2"></polygon></svg>
+                Smart Capture
+            </span>
+            <span class="hero-badge">
+                <svg width="12" height="12" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><circle cx="12" cy="12" r="10"></circle><circle cx="12" cy="12" r="3"></circle></svg>
+                Auto Detect
+            </span>
+            <span class="hero-badge">
+                <svg width="12" height="12" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M21 16V8a2 2 0 0 0-1-1.73l-7-4a2 2 0 0 0-2 0l-7 4A2 2 0 0 0 3 8v8a2 2 0 0 0 1 1.73l7 4a2 2 0 0 0 2 0l7-4A2 2 0 0 0 21 16z"></path></svg>
+                Export Ready
+            </span>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    compare_base_dir = BASE_DIR / "Model_Compare"
+    filter_new_model_dir = compare_base_dir / "new_model"
+    filter_yolo_model_dir = compare_base_dir / "yolo model"
+    filter_runner_script = BASE_DIR.parent / "performance_testing" / "filter_frames_by_model_gap.py"
+
+    def latest_model_file(model_dir: Path):
+        """Return the most recently modified `.pt` model file in a directory."""
+        model_dir.mkdir(parents=True, exist_ok=True)
+        return model_registry_utils.latest_model(model_dir)
+
+    def list_yolo_models(model_dir: Path):
+        """List YOLO baseline models, preferring filenames containing `yolo`."""
+        model_dir.mkdir(parents=True, exist_ok=True)
+        all_models = [path for path, _ in model_registry_utils.list_models(model_dir)]
+        yolo_models = [path for path in all_models if "yolo" in path.stem.lower()]
+        return yolo_models if yolo_models else all_models
+
+    # Tabs for different sections
+    tabs = st.tabs(["Upload", "Filter", "Augment", "Image Gallery", "Auto-Annotate", "Annotated Gallery"])
+    
+    # TAB 1: UPLOAD
+    with tabs[0]:
+        st.markdown("""
+        <div class="section-card">
+            <div class="section-header">
+                <div class="section-icon">
+                    <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="white" stroke-width="2">
+                        <path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>
+                        <polyline points="17 8 12 3 7 8"></polyline>
+                        <line x1="12" y1="3" x2="12" y2="15"></line>
+                    </svg>
+                </div>
+                <div>
+                    <h3 class="section-title">Upload & Extract Frames</h3>
+                    <p class="section-desc">Import video files or image datasets</p>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col_info1, col_info2, col_info3 = st.columns(3)
+        with col_info1:
+            st.metric("Supported Videos", "MP4, AVI, MOV")
+        with col_info2:
+            st.metric("Image Formats", "JPG, PNG, BMP")
+        with col_info3:
+            st.metric("Max Size", "200 MB")
+        
+        st.warning("""
+        **Video Size Limit:** Videos must be under 200MB for upload.
+        
+        **If your video is larger:** Use the `tools/segment_video.py` tool to split it into 200MB chunks:
+        ```
+        python tools/segment_video.py large_video.mp4 ./segmented_videos 200
+        ```
+        Then upload each segment separately. All segments will be extracted to the same output folder.
+        """)
+        
+        st.info(f"Current destination: `{FRAMES_DIR}`. Edit in **Settings** to use a different directory.")
+        
+        st.markdown("<p class='section-desc' style='margin:0.15rem 0 0.45rem 0;'>Choose your input type to continue with upload and extraction.</p>", unsafe_allow_html=True)
+        src_type = st.segmented_control(
+            "Select source",
+            ["Video (.mp4)", "Images (ZIP/Files)"],
+            default="Video (.mp4)",
+            key="upload_source_selector",
+        )
+        if src_type is None:
+            src_type = "Video (.mp4)"
+        
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            dest_base = st.text_input("Destination folder", value=str(FRAMES_DIR), label_visibility="collapsed")
+        with col2:
+            create_subfolder = st.checkbox("Auto subfolder", value=True)
+        
+        if src_type == "Video (.mp4)":
+            up_video = st.file_uploader("Select MP4 video", type=["mp4"], key="video_upl")
+            interval = st.number_input("Frame interval (seconds)", min_value=1, max_value=30, value=3, step=1)
+            
+            if up_video is not None:
+                st.success(f"Video loaded: {up_video.name} ({up_video.size / 1024 / 1024:.2f} MB)")
+                if st.button("Extract Frames", type="primary"):
+                    saved = Path(VIDEOS_DIR) / up_video.name
+                    saved.parent.mkdir(parents=True, exist_ok=True)
+                    with open(saved, "wb") as f:
+                        f.write(up_video.getbuffer())
+                    vid_name = Path(up_video.name).stem if create_subfolder else ""
+                    out_dir = Path(dest_base) / vid_name if vid_name else Path(dest_base)
+                    # Previous frames are cleared by the worker before extraction.
+                    submit_worker_job(
+                        "extract_frames",
+                        f"Extract {up_video.name}",
+                        "extract_frames",
+                        {"video_path": str(saved), "output_dir": str(out_dir), "interval_seconds": int(interval)},
+                    )
+                    st.rerun()
+
+            render_job_panel("extract_frames", unit="frames")
+            extract_job = job_utils.latest_job("extract_frames")
+            if extract_job and extract_job["status"] == "succeeded" and extract_job["result"]:
+                st.success(f"Cleared previous frames and extracted {extract_job['result'].get('frames_written', 0)} new frames to {extract_job['result'].get('output_dir', '')}")
+        else:
+            up_zip = st.file_uploader("Images ZIP", type=["zip"], key="zip_upl")
+            up_imgs = st.file_uploader("Or image files", type=["jpg", "jpeg", "png", "bmp"], accept_multiple_files=True, key="imgs_upl")
+            
+            if up_zip is not None or up_imgs:
+                if st.button("Save Images", type="primary"):
+                    with st.spinner("Saving images..."):
+                        out_dir = Path(dest_base)
+                        out_dir.mkdir(parents=True, exist_ok=True)
+                        # Clear existing images
+                        for item in out_dir.iterdir():
+                            if item.is_file() and item.suffix.lower() in ['.jpg', '.jpeg', '.png', '.bmp']:
+                                item.unlink()
+                        if up_zip:
+                            with zipfile.ZipFile(io.BytesIO(up_zip.getvalue())) as zf:
+                                zf.extractall(out_dir)
+                        if up_imgs:
+                            for f in up_imgs:
+                                with open(out_dir / f.name, "wb") as fo:
+                                    fo.write(f.getbuffer())
+                    st.success(f"Cleared previous images and saved {len(up_imgs) if up_imgs else 'ZIP'} new images to {out_dir}")
+                    st.balloons()
+    
+    # TAB 2: FILTER
+    with tabs[1]:
+        st.markdown("""
+        <div class="section-card">
+            <div class="section-header">
+                <div class="section-icon">
+                    <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="white" stroke-width="2">
+                        <polygon points="22 3 2 3 10 12.46 10 19 14 21 14 12.46 22 3"></polygon>
+                    </svg>
+                </div>
+                <div>
+                    <h3 class="section-title">Model-Based Frame Filter</h3>
+                    <p class="section-desc">Keep only frames where latest model performs worse than YOLO</p>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+        latest_new_model = latest_model_file(filter_new_model_dir)
+        yolo_candidates = list_yolo_models(filter_yolo_model_dir)
+
+        source_filter_dir = st.text_input("Source frames folder", value=str(FRAMES_DIR), key="filter_source_folder")
+        destination_filter_dir = st.text_input(
+            "Poor frames folder (custom model worse)",
+            value=str(ANNOT_DIR / "filtered_poor"),
+            key="filter_destination_folder",
+        )
+        other_destination_filter_dir = st.text_input(
+            "Other frames folder (same/better than YOLO)",
+            value=str(ANNOT_DIR / "filtered_other"),
+            key="filter_other_destination_folder",
+        )
+
+        if latest_new_model:
+            st.info(f"Latest new model: `{latest_new_model.name}`")
+        else:
+            st.warning(f"No `.pt` model found in `{filter_new_model_dir}`")
+
+        if yolo_candidates:
+            yolo_model_choice = st.selectbox(
+                "YOLO model",
+                options=yolo_candidates,
+                format_func=lambda path: path.name,
+                key="filter_yolo_model_select",
+            )
+        else:
+            yolo_model_choice = None
+            st.warning(f"No `.pt` model found in `{filter_yolo_model_dir}`")
+
+        st.caption("Threshold guidance: adjust these to control how strict the filter is when deciding whether your model is worse than YOLO.")
+        conf_threshold_filter = st.slider(
+            "Confidence threshold",
+            0.05,
+            0.95,
+            0.25,
+            0.05,
+            key="filter_conf_threshold",
+            help="Only detections with confidence above this value are considered. Higher values keep fewer boxes (stricter), lower values keep more boxes (looser).",
+        )
+        iou_threshold_filter = st.slider(
+            "IoU threshold",
+            0.10,
+            0.95,
+            0.40,
+            0.05,
+            key="filter_iou_threshold",
+            help="Minimum overlap needed to treat boxes as matching. Higher values require tighter box alignment, lower values allow looser matches.",
+        )
+        st.info(
+            "Higher confidence or higher IoU generally marks more frames as poor (more strict). "
+            "Lower confidence or lower IoU generally marks fewer frames as poor (more lenient)."
+        )
+
+        if st.button("Run Filter", type="primary", use_container_width=True):
+            if latest_new_model is None:
+                st.error("No latest model found in new_model folder.")
+            elif yolo_model_choice is None:
+                st.error("No YOLO model found in model folder.")
+            elif not filter_runner_script.exists():
+                st.error(f"Filter runner not found: {filter_runner_script}")
+            else:
+                src_path = Path(source_filter_dir)
+                if not src_path.exists():
+                    st.error(f"Source folder does not exist: {src_path}")
+                else:
+                    job_utils.get_manager().submit_command(
+                        "filter",
+                        f"Filter {src_path.name} ({latest_new_model.name} vs {yolo_model_choice.name})",
+                        [
+                            sys.executable,
+                            str(filter_runner_script),
+                            "--mode",
+                            "filter",
+                            "--new-model",
+                            str(latest_new_model),
+                            "--yolo-model",
+                            str(yolo_model_choice),
+                            "--source-dir",
+                            str(src_path),
+                            "--destination-dir",
+                            str(destination_filter_dir),
+                            "--other-destination-dir",
+                            str(other_destination_filter_dir),
+                            "--conf-thresh",
+                            str(conf_threshold_filter),
+                            "--iou-thresh",
+                            str(iou_threshold_filter),
+                            "--clear-destination",
+                            "--json-progress",
+                        ],
+                        cwd=BASE_DIR.parent,
+                    )
+                    st.rerun()
+
+        render_job_panel("filter", unit="frames")
+
+        # Results come from the newest finished filter job, so they survive reruns and refreshes.
+        filter_job = job_utils.latest_job("filter")
+        if filter_job and filter_job["status"] == "succeeded":
+            summary = filter_job["result"]
+            if summary is None:
+                st.warning("Filter completed, but summary was not found.")
+                log_tail = job_utils.read_log_tail(filter_job)
+                if log_tail:
+                    st.code(log_tail)
+            else:
+                st.session_state["filter_poor_dir"] = summary.get("poor_destination_dir", destination_filter_dir)
+                st.session_state["filter_other_dir"] = summary.get("other_destination_dir", other_destination_filter_dir)
+                st.session_state["filter_annotated_dir"] = summary.get("annotated_destination_dir", "")
+
+                st.success("Filtering completed. Frames were split into poor and other sets.")
+                st.info("✨ **Annotated comparison images** showing both your model (blue) and YOLO predictions (green) are ready in the annotated folder!")
+                
+                # Color legend for annotated images
+                st.markdown("""
+                <div style="background: linear-gradient(135deg, rgba(59, 130, 246, 0.1) 0%, rgba(34, 197, 94, 0.1) 100%); border: 1px solid rgba(148, 163, 184, 0.3); border-radius: 12px; padding: 1rem; margin: 1rem 0;">
+                    <p style="color: #cbd5e1; margin: 0 0 0.75rem 0; font-weight: 600;">📋 Annotation Legend:</p>
+                    <div style="display: flex; gap: 2rem; flex-wrap: wrap;">
+                        <div style="display: flex; align-items: center; gap: 0.75rem;">
+                            <div style="width: 24px; height: 24px; border: 3px solid #3b82f6; border-radius: 2px; background: rgba(59, 130, 246, 0.1);"></div>
+                            <span style="color: #cbd5e1;"><span style="color: #3b82f6; font-weight: 700;">Blue</span> = Your Custom Model</span>
+                        </div>
+                        <div style="display: flex; align-items: center; gap: 0.75rem;">
+                            <div style="width: 24px; height: 24px; border: 3px solid #22c55e; border-radius: 2px; background: rgba(34, 197, 94, 0.1);"></div>
+                            <span style="color: #cbd5e1;"><span style="color: #22c55e; font-weight: 700;">Green</span> = YOLO Baseline</span>
+                        </div>
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                metric_col1, metric_col2, metric_col3 = st.columns(3)
+                with metric_col1:
+                    st.metric("Total Images", int(summary.get("total_images", 0)))
+                with metric_col2:
+                    st.metric("Poor Frames", int(summary.get("poor_images", summary.get("selected_images", 0))))
+                with metric_col3:
+                    st.metric("Other Frames", int(summary.get("other_images", 0)))
+                
+                st.divider()
+                st.subheader("📁 Output Folders")
+                col_fold1, col_fold2 = st.columns(2)
+                with col_fold1:
+                    st.markdown(f"""
+                    **Raw Poor Frames**  
+                    `{summary.get('poor_destination_dir', destination_filter_dir)}`
+                    """)
+                with col_fold2:
+                    st.markdown(f"""
+                    **Annotated Poor Frames**  
+                    `{summary.get('annotated_destination_dir', str(Path(destination_filter_dir) / '_annotated'))}`
+                    """)
+                
+                if summary.get("other_destination_dir"):
+                    st.markdown(f"""
+                    **Other Frames (Same/Better)**  
+                    `{summary.get('other_destination_dir', other_destination_filter_dir)}`
+                    """)
+
+    # TAB 3: AUGMENT
+    with tabs[2]:
+        st.markdown("""
+        <div class="section-card">
+            <div class="section-header">
+                <div class="section-icon">
+                    <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="white" stroke-width="2">
+                        <circle cx="13.5" cy="6.5" r="0.5" fill="white"></circle>
+                        <circle cx="17.5" cy="10.5" r="0.5" fill="white"></circle>
+                        <circle cx="8.5" cy="7.5" r="0.5" fill="white"></circle>
+                        <circle cx="6.5" cy="12.5" r="0.5" fill="white"></circle>
+                        <path d="M12 2C6.5 2 2 6.5 2 12s4.5 10 10 10c.926 0 1.648-.746 1.648-1.688 0-.437-.18-.835-.437-1.125-.29-.289-.438-.652-.438-1.125a1.64 1.64 0 0 1 1.668-1.668h1.996c3.051 0 5.555-2.503 5.555-5.555C21.965 6.012 17.461 2 12 2z"></path>
+                    </svg>
+                </div>
+                <div>
+                    <h3 class="section-title">Data Augmentation</h3>
+                    <p class="section-desc">Expand your dataset with intelligent transformations</p>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col_m1, col_m2, col_m3 = st.columns(3)
+        with col_m1:
+            st.metric("Techniques", "6+")
+        with col_m2:
+            st.metric("Variants", "0-6 per image")
+        with col_m3:
+            st.metric("Output", "JPEG/PNG")
+        
+        st.divider()
+        
+        aug_target = st.text_input("Source folder", value=str(FRAMES_DIR), key="aug_folder")
+        variants = st.slider("Variants per image", 0, 6, 2)
+        aug_augmented_dir = Path(st.session_state.get("frames_dir", str(FRAMES_DIR))) / "augmented"
+        aug_destination = st.radio(
+            "Save variants to",
+            ["Output frames / augmented", "Next to the source images"],
+            horizontal=True,
+            help="Variants are written once, straight to this folder.",
+        )
+        cpu_count = os.cpu_count() or 1
+        if cpu_count > 1:
+            aug_workers = st.slider(
+                "Parallel workers",
+                1,
+                cpu_count,
+                min(DEFAULT_AUGMENT_WORKERS, cpu_count),
+                help="Images are spread over this many processes. Output is the same for any setting.",
+            )
+        else:
+            # A 1..1 slider raises in Streamlit; there is nothing to choose on one CPU.
+            aug_workers = 1
+        
+        st.markdown("#### Augmentation Techniques")
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            use_noise = st.checkbox("Gaussian noise", True)
+            use_blur = st.checkbox("Gaussian blur", True)
+        with col_b:
+            use_motion = st.checkbox("Motion blur", True)
+            use_brightness = st.checkbox("Brightness/Contrast", True)
+        with col_c:
+            use_rotate = st.checkbox("Small rotation", True)
+            use_fog = st.checkbox("Light fog", False)
+        aug_fast = st.checkbox(
+            "Fast kernels",
+            True,
+            help="Lookup-table and cached-kernel versions of the same transforms; noise and motion blur differ slightly from the reference functions.",
+        )
+        aug_batched = st.checkbox(
+            "Batch same-resolution frames",
+            False,
+            help="Stack consecutive frames of the same size and augment them together.",
+        )
+        aug_with_labels = st.checkbox(
+            "Transform YOLO labels",
+            False,
+            help="For images with a same-name .txt label, write a matching label for each variant (rotated boxes included), so augmented frames need no re-annotation.",
+        )
+        
+        st.divider()
+        
+        if st.button("Run Augmentation", type="primary", use_container_width=True):
+            aug_output = str(aug_augmented_dir) if aug_destination.startswith("Output frames") else aug_target
+            submit_worker_job(
+                "augment",
+                f"Augment {Path(aug_target).name} ({variants} per image)",
+                "augment",
+                {
+                    "input_dir": aug_target,
+                    "output_dir": aug_output,
+                    "variants_per_image": variants,
+                    "workers": aug_workers,
+                    "with_labels": aug_with_labels,
+                    "batch_size": DEFAULT_AUGMENT_BATCH_SIZE if aug_batched else 0,
+                    "options": {
+                        "use_gaussian_noise": use_noise,
+                        "use_salt_pepper": False,
+                        "use_small_rotate": use_rotate,
+                        "use_brightness_contrast": use_brightness,
+                        "use_gaussian_blur": use_blur,
+                        "use_motion_blur": use_motion,
+                        "use_fog": use_fog,
+                        "use_color_shift": False,
+                        "engine": "fast" if aug_fast else "reference",
+                    },
+                },
+            )
+            st.rerun()
+
+        render_job_panel("augment", unit="images")
+        augment_job = job_utils.latest_job("augment")
+        if augment_job and augment_job["status"] == "succeeded" and augment_job["result"]:
+            augment_result = augment_job["result"]
+            st.success(f"Created {augment_result.get('written', 0)} augmented images in `{augment_result.get('output_dir', '')}`")
+            if augment_result.get("images_per_s"):
+                st.caption(
+                    f"{augment_result['images']} source images in {format_duration(augment_result['seconds'])} · "
+                    f"{augment_result['images_per_s']:.1f} images/s on {augment_result['workers']} worker(s) · "
+                    f"seed {augment_result['seed']}"
+                )
+            if augment_result.get("labels_written"):
+                st.caption(
+                    f"Wrote {augment_result['labels_written']} transformed label files; "
+                    f"{augment_result.get('dropped_boxes', 0)} boxes fell outside the frame and were dropped"
+                )
+            st.balloons()
+    
+    # TAB 4: IMAGE GALLERY (BEFORE ANNOTATION)
+    with tabs[3]:
+        st.markdown("""
+        <div class="section-card">
+            <div class="section-header">
+                <div class="section-icon">
+                    <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="white" stroke-width="2">
+                        <rect x="3" y="3" width="18" height="18" rx="2" ry="2"></rect>
+                        <circle cx="8.5" cy="8.5" r="1.5"></circle>
+                        <polyline points="21 15 16 10 5 21"></polyline>
+                    </svg>
+                </div>
+                <div>
+                    <h3 class="section-title">Image Gallery</h3>
+                    <p class="section-desc">Preview and manage your dataset before annotation</p>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        default_frames_dir = str(Path(st.session_state.get("frames_dir", str(FRAMES_DIR))))
+        default_annot_dir = str(Path(st.session_state.get("annot_dir", str(ANNOT_DIR))))
+        default_filter_poor_dir = st.session_state.get("filter_poor_dir", str(ANNOT_DIR / "filtered_poor"))
+        default_filter_other_dir = st.session_state.get("filter_other_dir", str(ANNOT_DIR / "filtered_other"))
+        default_filter_annotated_dir = st.session_state.get("filter_annotated_dir", str(Path(default_filter_poor_dir) / ".." / "filtered_poor_annotated"))
+
+        gallery_sources = {
+            "Frames (Upload/Augment)": default_frames_dir,
+            "Filtered - Poor (Raw)": default_filter_poor_dir,
+            "Filtered - Poor (Annotated)": default_filter_annotated_dir,
+            "Filtered - Other": default_filter_other_dir,
+            "Annotation Folder": default_annot_dir,
+            "Custom": default_frames_dir,
+        }
+        selected_gallery_source = st.selectbox(
+            "Choose folder to view",
+            options=list(gallery_sources.keys()),
+            key="gallery_source_choice",
+        )
+
+        if selected_gallery_source == "Custom":
+            gallery_dir_input = st.text_input(
+                "Custom gallery folder",
+                value=default_frames_dir,
+                key="gallery_custom_folder",
+            )
+        else:
+            gallery_dir_input = gallery_sources[selected_gallery_source]
+
+        gallery_dir = Path(gallery_dir_input)
+        st.caption(f"Viewing folder: `{gallery_dir}`")
+        
+        # Show color legend for annotated filter images
+        if "Annotated" in selected_gallery_source:
+            st.markdown("""
+            <div style="background: linear-gradient(135deg, rgba(59, 130, 246, 0.1) 0%, rgba(34, 197, 94, 0.1) 100%); border: 1px solid rgba(148, 163, 184, 0.3); border-radius: 12px; padding: 1rem; margin: 1rem 0;">
+                <p style="color: #cbd5e1; margin: 0 0 0.75rem 0; font-weight: 600;">📋 Color Legend:</p>
+                <div style="display: flex; gap: 2rem; flex-wrap: wrap;">
+                    <div style="display: flex; align-items: center; gap: 0.75rem;">
+                        <div style="width: 24px; height: 24px; border: 3px solid #3b82f6; border-radius: 2px; background: rgba(59, 130, 246, 0.1);"></div>
+                        <span style="color: #cbd5e1;"><span style="color: #3b82f6; font-weight: 700;">Blue</span> = Your Custom Model</span>
+                    </div>
+                    <div style="display: flex; align-items: center; gap: 0.75rem;">
+                        <div style="width: 24px; height: 24px; border: 3px solid #22c55e; border-radius: 2px; background: rgba(34, 197, 94, 0.1);"></div>
+                        <span style="color: #cbd5e1;"><span style="color: #22c55e; font-weight: 700;">Green</span> = YOLO Baseline</span>
+                    </div>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        IMAGES_PER_PAGE = 12
+        
+        def get_all_images_gallery(dir_path):
+            """Return the indexed, pre-sorted gallery images under the selected directory."""
+            return file_index_utils.list_indexed(dir_path)
+        
+        def load_image_gallery(path):
+            """Load one image as RGB PIL for Streamlit display."""
+            return gallery_utils.load_image_pil_rgb(path)
+
+        def load_thumbnails_gallery(paths):
+            """Return encoded thumbnail tiles for one gallery page."""
+            return gallery_prefetch_utils.load_page_tiles(paths)
+        
+        cols_per_row = st.selectbox("Grid columns", [2, 3, 4, 5], 1, key="gallery_cols_per_row")
+        
+        all_imgs = get_all_images_gallery(gallery_dir)
+        total_pages = max(1, (len(all_imgs) + IMAGES_PER_PAGE - 1) // IMAGES_PER_PAGE)
+        
+        if "gallery_page" not in st.session_state:
+            st.session_state["gallery_page"] = 1
+        
+        if all_imgs:
+            st.markdown(f"""
+            <div style="background: linear-gradient(135deg, rgba(6, 182, 212, 0.1) 0%, rgba(139, 92, 246, 0.05) 100%); border: 1px solid rgba(148, 163, 184, 0.2); border-radius: 12px; padding: 1rem; margin-bottom: 1.5rem; backdrop-filter: blur(5px);">
+                <p style="color: #cbd5e1; margin: 0; font-weight: 600;">📊 Total images: <span style="color: #06b6d4; font-weight: 800;">{len(all_imgs)}</span></p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            # Pagination controls with buttons that work immediately
+            col_prev, col_page, col_next = st.columns([0.8, 2, 0.8])
+            with col_prev:
+                def on_prev_click():
+                    """Move image gallery pagination to previous page."""
+                    if st.session_state["gallery_page"] > 1:
+                        st.session_state["gallery_page"] -= 1
+                st.button("◀ Previous", key="gallery_prev_btn", use_container_width=True, on_click=on_prev_click)
+            
+            with col_page:
+                pages = list(range(1, total_pages + 1))
+                def on_page_change():
+                    """Sync image gallery page selector with session state."""
+                    st.session_state["gallery_page"] = st.session_state["gallery_page_select"]
+                current_page = st.selectbox(
+                    "Page",
+                    pages,
+                    index=min(st.session_state["gallery_page"] - 1, len(pages) - 1),
+                    key="gallery_page_select",
+                    label_visibility="collapsed",
+                    on_change=on_page_change
+                )
+                st.markdown(f"<p style='text-align: center; color: #94a3b8; margin: 0.5rem 0; font-size: 0.9rem;'>Page <span style='color: #06b6d4; font-weight: 800;'>{st.session_state['gallery_page']}</span> of <span style='color: #8b5cf6; font-weight: 800;'>{total_pages}</span></p>", unsafe_allow_html=True)
+            
+            with col_next:
+                def on_next_click():
+                    """Move image gallery pagination to next page."""
+                    if st.session_state["gallery_page"] < total_pages:
+                        st.session_state["gallery_page"] += 1
+                st.button("Next ▶", key="gallery_next_btn", use_container_width=True, on_click=on_next_click)
+            
+            st.divider()
+            
+            # Display images for current page
+            start_idx = (st.session_state["gallery_page"] - 1) * IMAGES_PER_PAGE
+            end_idx = min(start_idx + IMAGES_PER_PAGE, len(all_imgs))
+            page_imgs = all_imgs[start_idx:end_idx]
+            
+            # Full resolution is decoded only for the tile the user opened.
+            full_view_path = st.session_state.get("gallery_full_view")
+            if full_view_path and Path(full_view_path) in page_imgs:
+                with st.container(border=True):
+                    col_full_title, col_full_close = st.columns([4, 1])
+                    with col_full_title:
+                        st.markdown(f"**{Path(full_view_path).name}**")
+                    with col_full_close:
+                        if st.button("Close", key="gallery_full_close", use_container_width=True):
+                            st.session_state.pop("gallery_full_view", None)
+                            st.rerun()
+                    full_pil = load_image_gallery(Path(full_view_path))
+                    if full_pil:
+                        st.image(full_pil, use_container_width=True)
+
+            st.markdown(f"<p class='gallery-info-text'>Displaying images {start_idx + 1}-{end_idx} of {len(all_imgs)} • {cols_per_row} columns</p>", unsafe_allow_html=True)
+            cols = st.columns(cols_per_row)
+            page_thumbs = load_thumbnails_gallery(page_imgs)
+            
+            for i, (p, thumb) in enumerate(zip(page_imgs, page_thumbs)):
+                col_idx = i % cols_per_row
+                with cols[col_idx]:
+                    if thumb:
+                        st.image(thumb, use_container_width=True)
+                        
+                        # View/Delete buttons below image - neatly placed and centered
+                        st.markdown('<div style="text-align: center; margin-top: 0.5rem;"></div>', unsafe_allow_html=True)
+                        col_view, col_del = st.columns(2)
+                        with col_view:
+                            if st.button("View", key=f"view_gallery_{i}_{start_idx}", use_container_width=True, help=f"Open {p.name} at full resolution"):
+                                st.session_state["gallery_full_view"] = str(p)
+                                st.rerun()
+                        with col_del:
+                            if st.button("Delete", key=f"del_gallery_{i}_{start_idx}", use_container_width=True, help=f"Delete {p.name}"):
+                                try:
+                                    gallery_prefetch_utils.delete_frame(gallery_dir, p)
+                                    st.success(f"Deleted {p.name}")
+                                    st.rerun()
+                                except Exception as e:
+                                    st.error(f"Error: {str(e)[:50]}")
+                    else:
+                        st.error(f"Failed to load {p.name}")
+
+            # Decode the previous and next pages while this one is reviewed.
+            gallery_prefetch_utils.prefetch_neighbor_pages(all_imgs, st.session_state["gallery_page"], IMAGES_PER_PAGE)
+        else:
+            st.markdown("""
+            <div style="text-align: center; padding: 2rem; background: rgba(15, 23, 42, 0.4); border: 2px dashed rgba(148, 163, 184, 0.2); border-radius: 16px;">
+                <p style="color: #94a3b8; font-size: 1.1rem; margin: 0;">No images found</p>
+                <p style="color: #64748b; font-size: 0.9rem; margin: 0.5rem 0 0 0;">Start by uploading images or extracting frames from a video</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # TAB 5: AUTO-ANNOTATE
+    with tabs[4]:
+        st.markdown("""
+        <div class="section-card">
+            <div class="section-header">
+                <div class="section-icon">
+                    <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="white" stroke-width="2">
+                        <rect x="3" y="11" width="18" height="11" rx="2" ry="2"></rect>
+                        <path d="M7 11V7a5 5 0 0 1 10 0v4"></path>
+                    </svg>
+                </div>
+                <div>
+                    <h3 class="section-title">AI Auto-Annotation</h3>
+                    <p class="section-desc">YOLO-powered object detection</p>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col_m1, col_m2, col_m3 = st.columns(3)
+        with col_m1:
+            st.metric("Model", "YOLO v11")
+        with col_m2:
+            st.metric("Format", "YOLO TXT")
+        with col_m3:
+            st.metric("GPU", "Enabled")
+        
+        annot_dir_input = st.text_input("Annotation directory", value=str(ANNOT_DIR), key="annot_input")
+        
+        # Class Management
+        st.markdown("#### Class Management")
+        annot_dir_path = Path(annot_dir_input)
+        annot_dir_path.mkdir(parents=True, exist_ok=True)
+        CLASSES_TXT = annot_dir_path / "classes.txt"
+        DEFAULT_NEW_CLASSES = BASE_DIR / "class" / "new_classes.txt"
+
+        # First-run bootstrap is delegated to a shared utility to keep this UI replaceable.
+        classes_existed = CLASSES_TXT.exists()
+        try:
+            class_utils.ensure_classes_file(annot_dir_path, DEFAULT_NEW_CLASSES)
+            if not classes_existed and CLASSES_TXT.exists():
+                st.info(f"Initialized `{CLASSES_TXT.name}` from `{DEFAULT_NEW_CLASSES}`")
+        except Exception as bootstrap_err:
+            st.warning(f"Could not initialize classes file automatically: {bootstrap_err}")
+        
+        def load_classes():
+            """Load currently configured class list from classes.txt."""
+            return class_utils.load_classes_file(CLASSES_TXT)
+        
+        def save_classes(classes_list):
+            """Persist class list to classes.txt used by auto-annotation."""
+            class_utils.save_classes_file(CLASSES_TXT, classes_list)
+        
+        current_classes = load_classes()
+        
+        if current_classes:
+            st.write("Current classes:", ", ".join(current_classes))
+        
+        col_add, col_remove = st.columns(2)
+        with col_add:
+            new_class = st.text_input("Add class", placeholder="class name")
+            if st.button("Add", key="add_class"):
+                if new_class.strip() and new_class.lower() not in [c.lower() for c in current_classes]:
+                    current_classes.append(new_class.lower())
+                    save_classes(current_classes)
+                    st.rerun()
+        
+        with col_remove:
+            if current_classes:
+                cls_remove = st.selectbox("Remove class", current_classes, key="remove_class_sel")
+                st.caption("Deletes this class's boxes and renumbers the classes after it in every label file.")
+                if st.button("Remove", key="remove_class"):
+                    remaining = [name for name in current_classes if name != cls_remove]
+                    relabel_classes(annot_dir_path, class_remap_utils.build_mapping(current_classes, remaining), remaining)
+                    st.rerun()
+
+        render_class_remap(annot_dir_path, current_classes)
+        
+        st.divider()
+        
+        if st.button("Run Auto-Annotation", type="primary"):
+            frames_dir = Path(st.session_state.get("frames_dir", str(FRAMES_DIR)))
+            annot_dir = Path(annot_dir_input)
+            annot_dir.mkdir(parents=True, exist_ok=True)
+
+            # Safety net before annotation: ensure classes.txt exists in destination.
+            classes_file = annot_dir / "classes.txt"
+            if not classes_file.exists() and DEFAULT_NEW_CLASSES.exists():
+                try:
+                    class_utils.ensure_classes_file(annot_dir, DEFAULT_NEW_CLASSES)
+                except Exception as copy_err:
+                    st.warning(f"Could not create classes.txt from new_classes.txt: {copy_err}")
+            
+            def list_images(dir_path):
+                """Return indexed image files to validate frame availability."""
+                return file_index_utils.list_indexed(dir_path)
+            
+            frames_list = list_images(frames_dir)
+            if not frames_list:
+                st.error(f"No frames found in {frames_dir}")
+            else:
+                job_utils.get_manager().submit_command(
+                    "auto_annotate",
+                    f"Annotate {len(frames_list)} frames from {frames_dir.name}",
+                    [sys.executable, "tools/auto_annotation_runner.py", "--frames-dir", str(frames_dir), "--annot-dir", str(annot_dir), "--json-progress"],
+                    cwd=BASE_DIR,
+                )
+                st.rerun()
+
+        render_job_panel("auto_annotate", unit="frames")
+        annotate_job = job_utils.latest_job("auto_annotate")
+        if annotate_job and annotate_job["status"] == "succeeded":
+            st.success("Auto-annotation completed.")
+    
+    # TAB 6: ANNOTATED GALLERY (AFTER ANNOTATION)
+    with tabs[5]:
+        st.markdown("""
+        <div class="section-card">
+            <div class="section-header">
+                <div class="section-icon">
+                    <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="white" stroke-width="2">
+                        <path d="M1 12s4-8 11-8 11 8 11 8-4 8-11 8-11-8-11-8z"></path>
+                        <circle cx="12" cy="12" r="3"></circle>
+                    </svg>
+                </div>
+                <div>
+                    <h3 class="section-title">Annotated Gallery</h3>
+                    <p class="section-desc">Review annotated images with bounding boxes</p>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        preview_dir = Path(st.session_state.get("annot_dir", str(ANNOT_DIR)))
+        ANNOTATED_IMAGES_PER_PAGE = 12
+        
+        def get_all_annotated_images_ann(dir_path):
+            """Return the indexed, pre-sorted annotated images for the review gallery."""
+            return file_index_utils.list_indexed(dir_path)
+        
+        def load_image_ann(path):
+            """Load one annotated image as RGB PIL."""
+            return gallery_utils.load_image_pil_rgb(path)
+        
+        def draw_boxes_ann(img_pil, txt_path):
+            """Render YOLO txt boxes on top of a preview image."""
+            return gallery_utils.draw_yolo_boxes_from_txt(img_pil, txt_path)
+
+        def load_thumbnails_ann(paths):
+            """Return encoded tiles with boxes already drawn for one annotated page."""
+            return gallery_prefetch_utils.load_page_tiles(paths, annotated=True)
+        
+        cols_per_row = st.selectbox("Grid columns", [2, 3, 4, 5], 1, key="annotated_cols_per_row")
+        
+        all_annotated_imgs = get_all_annotated_images_ann(preview_dir)
+        total_annotated_pages = max(1, (len(all_annotated_imgs) + ANNOTATED_IMAGES_PER_PAGE - 1) // ANNOTATED_IMAGES_PER_PAGE)
+        
+        if "annotated_page" not in st.session_state:
+            st.session_state["annotated_page"] = 1
+        
+        if all_annotated_imgs:
+            st.markdown(f"""
+            <div style="background: linear-gradient(135deg, rgba(6, 182, 212, 0.1) 0%, rgba(139, 92, 246, 0.05) 100%); border: 1px solid rgba(148, 163, 184, 0.2); border-radius: 12px; padding: 1rem; margin-bottom: 1.5rem; backdrop-filter: blur(5px);">
+                <p style="color: #cbd5e1; margin: 0; font-weight: 600;">🏷️ Total annotated images: <span style="color: #06b6d4; font-weight: 800;">{len(all_annotated_imgs)}</span></p>
+            </div>
+            """, unsafe_allow_html=True)
+
+            if st.checkbox("Show dataset statistics", key="show_dataset_stats"):
+                render_dataset_stats(preview_dir)
+            
+            # Pagination controls with callbacks
+            col_prev, col_page, col_next = st.columns([0.8, 2, 0.8])
+            with col_prev:
+                def on_prev_click_ann():
+                    """Move annotated gallery pagination to previous page."""
+                    if st.session_state["annotated_page"] > 1:
+                        st.session_state["annotated_page"] -= 1
+                st.button("◀ Previous", key="annotated_prev_btn", use_container_width=True, on_click=on_prev_click_ann)
+            
+            with col_page:
+                pages = list(range(1, total_annotated_pages + 1))
+                def on_page_change_ann():
+                    """Sync annotated gallery page selector with session state."""
+                    st.session_state["annotated_page"] = st.session_state["annotated_page_select"]
+                current_page = st.selectbox(
+                    "Page",
+                    pages,
+                    index=min(st.session_state["annotated_page"] - 1, len(pages) - 1),
+                    key="annotated_page_select",
+                    label_visibility="collapsed",
+                    on_change=on_page_change_ann
+                )
+                st.markdown(f"<p style='text-align: center; color: #94a3b8; margin: 0.5rem 0; font-size: 0.9rem;'>Page <span style='color: #06b6d4; font-weight: 800;'>{st.session_state['annotated_page']}</span> of <span style='color: #8b5cf6; font-weight: 800;'>{total_annotated_pages}</span></p>", unsafe_allow_html=True)
+            
+            with col_next:
+                def on_next_click_ann():
+                    """Move annotated gallery pagination to next page."""
+                    if st.session_state["annotated_page"] < total_annotated_pages:
+                        st.session_state["annotated_page"] += 1
+                st.button("Next ▶", key="annotated_next_btn", use_container_width=True, on_click=on_next_click_ann)
+            
+            st.divider()
+            
+            # Display images for current page
+            start_idx = (st.session_state["annotated_page"] - 1) * ANNOTATED_IMAGES_PER_PAGE
+            end_idx = min(start_idx + ANNOTATED_IMAGES_PER_PAGE, len(all_annotated_imgs))
+            page_annotated_imgs = all_annotated_imgs[start_idx:end_idx]
+            
+            # Full resolution is decoded only for the tile the user opened.
+            full_view_path = st.session_state.get("annotated_full_view")
+            if full_view_path and Path(full_view_path) in page_annotated_imgs:
+                with st.container(border=True):
+                    col_full_title, col_full_close = st.columns([4, 1])
+                    with col_full_title:
+                        st.markdown(f"**{Path(full_view_path).name}**")
+                    with col_full_close:
+                        if st.button("Close", key="annotated_full_close", use_container_width=True):
+                            st.session_state.pop("annotated_full_view", None)
+                            st.rerun()
+                    full_pil = load_image_ann(Path(full_view_path))
+                    if full_pil:
+                        st.image(draw_boxes_ann(full_pil, Path(full_view_path).with_suffix(".txt")), use_container_width=True)
+
+            st.markdown(f"<p class='gallery-info-text'>Displaying images {start_idx + 1}-{end_idx} of {len(all_annotated_imgs)} • {cols_per_row} columns</p>", unsafe_allow_html=True)
+            cols = st.columns(cols_per_row)
+            page_annotated_thumbs = load_thumbnails_ann(page_annotated_imgs)
+            
+            for i, (p, thumb) in enumerate(zip(page_annotated_imgs, page_annotated_thumbs)):
+                col_idx = i % cols_per_row
+                with cols[col_idx]:
+                    if thumb:
+                        st.image(thumb, use_container_width=True)
+                        
+                        # View/Delete buttons below image - neatly placed and centered
+                        st.markdown('<div style="text-align: center; margin-top: 0.5rem;"></div>', unsafe_allow_html=True)
+                        col_view, col_del = st.columns(2)
+                        with col_view:
+                            if st.button("View", key=f"view_annotated_{i}_{start_idx}", use_container_width=True, help=f"Open {p.name} at full resolution"):
+                                st.session_state["annotated_full_view"] = str(p)
+                                st.rerun()
+                        with col_del:
+                            if st.button("Delete", key=f"del_annotated_{i}_{start_idx}", use_container_width=True, help="Delete image and annotation"):
+                                try:
+                                    gallery_prefetch_utils.delete_frame(preview_dir, p, with_label=True)
+                                    st.success(f"Deleted {p.name}")
+                                    st.rerun()
+                                except Exception as e:
+                                    st.error(f"Error: {str(e)[:50]}")
+                    else:
+                        st.error(f"Failed to load {p.name}")
+
+            # Decode the previous and next pages while this one is reviewed.
+            gallery_prefetch_utils.prefetch_neighbor_pages(all_annotated_imgs, st.session_state["annotated_page"], ANNOTATED_IMAGES_PER_PAGE, annotated=True)
+        else:
+            st.info("No annotated images yet")
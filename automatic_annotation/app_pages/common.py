@@ -0,0 +1,116 @@
+"""Helpers shared by the page modules: paths, app styles and background jobs."""
+
+from functools import lru_cache
+from pathlib import Path
+import json
+import sys
+
+import streamlit as st
+
+from core import jobs as job_utils
+from core import model_registry as model_registry_utils
+
+APP_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = APP_DIR
+VIDEOS_DIR = BASE_DIR / "videos"
+COMPARE_BASE_DIR = APP_DIR / "Model_Compare"
+APP_CSS_PATH = APP_DIR / "assets" / "app.css"
+
+
+@lru_cache(maxsize=4)
+def _read_css(path_str: str, mtime_ns: int) -> str:
+    return Path(path_str).read_text(encoding="utf-8")
+
+
+def load_app_css(path: Path = APP_CSS_PATH) -> str:
+    """Return the app stylesheet, re-read only when the file changes."""
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return ""
+    return _read_css(str(path), mtime_ns)
+
+
+def inject_app_css() -> None:
+    """Apply the shared stylesheet to the current page."""
+    css = load_app_css()
+    if css:
+        st.markdown(f"<style>\n{css}</style>", unsafe_allow_html=True)
+
+
+# ===== BACKGROUND JOBS =====
+JOB_POLL_INTERVAL_S = 1.0
+
+
+def format_duration(seconds):
+    """Format seconds as a short `1h 02m` / `3m 05s` / `12s` string."""
+    seconds = int(max(0, seconds))
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {secs:02d}s"
+    return f"{secs}s"
+
+
+def submit_worker_job(kind, label, task, params):
+    """Queue a `core.job_worker` task as a background job."""
+    command = [sys.executable, "-m", "core.job_worker", task, json.dumps(params)]
+    return job_utils.get_manager().submit_command(kind, label, command, cwd=APP_DIR)
+
+
+@st.cache_resource
+def get_model_registry():
+    """Return the model registry shared by every session of this server."""
+    return model_registry_utils.get_registry()
+
+
+def render_job_panel(kind, unit="items", limit=3):
+    """Show live progress, throughput and ETA for recent background jobs of `kind`."""
+    active_ids = {job["id"] for job in job_utils.list_jobs(kind, limit) if job["status"] in job_utils.ACTIVE_STATES}
+
+    @st.fragment(run_every=JOB_POLL_INTERVAL_S if active_ids else None)
+    def job_panel():
+        jobs = job_utils.list_jobs(kind, limit)
+        for job in jobs:
+            with st.container(border=True):
+                col_label, col_action = st.columns([5, 1])
+                with col_label:
+                    st.markdown(f"**{job['label']}** · `{job['status']}`")
+                with col_action:
+                    if job["status"] in job_utils.ACTIVE_STATES:
+                        if st.button("Cancel", key=f"job_cancel_{job['id']}", use_container_width=True):
+                            job_utils.get_manager().cancel(job["id"])
+
+                done = int(job["progress_done"] or 0)
+                total = int(job["progress_total"] or 0)
+                rate, eta = job_utils.job_rate_and_eta(job)
+                stats = [f"{done}/{total} {unit}" if total else f"{done} {unit}"]
+                if rate:
+                    stats.append(f"{rate:.1f} {unit}/s")
+                if eta is not None:
+                    stats.append(f"ETA {format_duration(eta)}")
+                elif job["started_at"] and job["finished_at"]:
+                    stats.append(f"took {format_duration(job['finished_at'] - job['started_at'])}")
+
+                if job["status"] == "running" or (job["status"] == "succeeded" and total):
+                    st.progress(min(1.0, done / total) if total else 0.0, text=" · ".join(stats))
+                elif job["status"] == "queued":
+                    st.caption("Waiting for earlier jobs to finish...")
+
+                if job["status"] in ("failed", "interrupted"):
+                    st.error(job["message"])
+                    log_tail = job_utils.read_log_tail(job)
+                    if log_tail:
+                        with st.expander("Log", expanded=False):
+                            st.code(log_tail)
+                elif job["message"] and job["status"] == "running":
+                    st.caption(job["message"])
+
+        # A watched job just finished: rerun the page so its results render.
+        if active_ids and not any(job["id"] in active_ids and job["status"] in job_utils.ACTIVE_STATES for job in jobs):
+            st.rerun()
+
+    job_panel()
+
@@ -0,0 +1,391 @@
+"""Insights page: metrics trends and the chat assistant over evaluation results."""
+
+import os
+import time
+
+import streamlit as st
+
+from app_pages.common import COMPARE_BASE_DIR, format_duration
+from core.lazy_imports import lazy_module
+
+insights_chat_utils = lazy_module("core.insights_chat")
+insights_router_utils = lazy_module("core.insights_router")
+metrics_view_utils = lazy_module("core.metrics_views")
+response_cache_utils = lazy_module("core.response_cache")
+
+
+def render():
+    """Render the Insights page."""
+    st.markdown(
+        """
+        <style>
+        @keyframes slideUp {
+            from { opacity: 0; transform: translateY(20px); }
+            to { opacity: 1; transform: translateY(0); }
+        }
+        @keyframes slideInLeft {
+            from { opacity: 0; transform: translateX(-20px); }
+            to { opacity: 1; transform: translateX(0); }
+        }
+        @keyframes slideInRight {
+            from { opacity: 0; transform: translateX(20px); }
+            to { opacity: 1; transform: translateX(0); }
+        }
+        @keyframes fadeIn {
+            from { opacity: 0; }
+            to { opacity: 1; }
+        }
+        @keyframes glow {
+            0%, 100% { box-shadow: 0 0 20px rgba(34, 211, 238, 0.1); }
+            50% { box-shadow: 0 0 40px rgba(34, 211, 238, 0.25); }
+        }
+        @keyframes float {
+            0%, 100% { transform: translateY(0px); }
+            50% { transform: translateY(-3px); }
+        }
+        @keyframes pulse {
+            0%, 100% { opacity: 1; }
+            50% { opacity: 0.8; }
+        }
+        @keyframes messageEnter {
+            from { opacity: 0; transform: translateY(10px) scale(0.99); }
+            to { opacity: 1; transform: translateY(0) scale(1); }
+        }
+        @keyframes shimmerBorder {
+            0% { background-position: 0% 50%; }
+            50% { background-position: 100% 50%; }
+            100% { background-position: 0% 50%; }
+        }
+        
+        .insights-container {
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 0 1rem 4rem 1rem;
+            animation: slideUp 0.6s cubic-bezier(0.34, 1.56, 0.64, 1);
+        }
+        
+        .hero-header {
+            text-align: center;
+            margin-bottom: 3rem;
+            animation: slideUp 0.7s cubic-bezier(0.34, 1.56, 0.64, 1);
+            padding: 2rem 0;
+        }
+        
+        .hero-title {
+            font-size: 2.2rem;
+            font-weight: 700;
+            color: #e2e8f0;
+            margin-bottom: 0.8rem;
+            letter-spacing: -0.02em;
+        }
+        
+        .hero-subtitle {
+            font-size: 1rem;
+            color: rgba(226, 232, 240, 0.65);
+            font-weight: 400;
+            animation: slideUp 0.8s cubic-bezier(0.34, 1.56, 0.64, 1) 0.1s both;
+        }
+        
+        .insights-chat-history {
+            margin-bottom: 2.5rem;
+            scroll-behavior: smooth;
+            animation: fadeIn 0.6s ease-out 0.2s both;
+        }
+        
+        .insights-chat-input-container {
+            margin-top: 3rem;
+            animation: slideUp 0.8s cubic-bezier(0.34, 1.56, 0.64, 1) 0.2s both;
+            position: relative;
+        }
+        
+        div[data-testid="stChatMessage"] {
+            background: linear-gradient(135deg, rgba(15, 23, 42, 0.7) 0%, rgba(30, 41, 59, 0.65) 100%);
+            border: 1px solid rgba(34, 211, 238, 0.15);
+            border-radius: 18px;
+            padding: 1.2rem 1.4rem;
+            margin-bottom: 1rem;
+            box-shadow: 0 12px 35px rgba(2, 6, 23, 0.2), inset 0 1px 0 rgba(255, 255, 255, 0.08);
+            transition: all 0.35s cubic-bezier(0.34, 1.56, 0.64, 1);
+            animation: messageEnter 0.35s cubic-bezier(0.22, 1, 0.36, 1);
+            backdrop-filter: blur(8px);
+        }
+
+        div[data-testid="stChatMessage"][data-testid*="user"] {
+            border-color: rgba(59, 130, 246, 0.28);
+            box-shadow: 0 12px 35px rgba(30, 64, 175, 0.12), inset 0 1px 0 rgba(255, 255, 255, 0.08);
+        }
+
+        div[data-testid="stChatMessage"][data-testid*="assistant"] {
+            border-color: rgba(34, 211, 238, 0.22);
+        }
+        
+        div[data-testid="stChatMessage"]:hover {
+            border-color: rgba(34, 211, 238, 0.25);
+            box-shadow: 0 20px 50px rgba(34, 211, 238, 0.1), inset 0 1px 0 rgba(255, 255, 255, 0.12);
+            transform: translateY(-2px);
+            background: linear-gradient(135deg, rgba(15, 23, 42, 0.8) 0%, rgba(30, 41, 59, 0.75) 100%);
+        }
+        
+        div[data-testid="stChatMessage"] [data-testid="stMarkdownContainer"] p {
+            color: #e2e8f0;
+            line-height: 1.8;
+            font-weight: 400;
+            letter-spacing: 0.3px;
+        }
+        
+        div[data-testid="stChatInputContainer"] {
+            margin: 0 !important;
+            padding: 0 !important;
+        }
+        
+        div[data-testid="stChatInput"] {
+            position: relative;
+            animation: slideUp 0.8s cubic-bezier(0.34, 1.56, 0.64, 1) 0.25s both;
+        }
+        
+        div[data-testid="stChatInput"] textarea {
+            background: linear-gradient(135deg, rgba(15, 23, 42, 0.95) 0%, rgba(30, 41, 59, 0.9) 100%) !important;
+            border-radius: 16px !important;
+            border: 1.5px solid rgba(34, 211, 238, 0.25) !important;
+            padding: 1.1rem 1.4rem !important;
+            min-height: 54px !important;
+            max-height: 150px !important;
+            font-size: 0.96rem !important;
+            color: #e2e8f0 !important;
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', sans-serif !important;
+            transition: all 0.4s cubic-bezier(0.34, 1.56, 0.64, 1) !important;
+            box-shadow: 
+                0 8px 32px rgba(34, 211, 238, 0.08),
+                inset 0 1px 0 rgba(255, 255, 255, 0.1),
+                inset 0 -1px 0 rgba(0, 0, 0, 0.1) !important;
+            caret-color: #22d3ee !important;
+            backdrop-filter: blur(12px) !important;
+            letter-spacing: 0.3px;
+        }
+        
+        div[data-testid="stChatInput"] textarea::placeholder {
+            color: rgba(226, 232, 240, 0.5) !important;
+            font-style: italic;
+            font-weight: 500;
+        }
+        
+        div[data-testid="stChatInput"] textarea:focus {
+            border-color: rgba(34, 211, 238, 0.65) !important;
+            outline: none !important;
+            box-shadow: 
+                0 0 0 3px rgba(34, 211, 238, 0.1),
+                0 20px 60px rgba(34, 211, 238, 0.2),
+                inset 0 1px 2px rgba(255, 255, 255, 0.15),
+                inset 0 0 20px rgba(34, 211, 238, 0.1) !important;
+            background: linear-gradient(135deg, rgba(15, 23, 42, 1) 0%, rgba(30, 41, 59, 0.95) 100%) !important;
+            transform: translateY(-2px) !important;
+        }
+        
+        div[data-testid="stChatInput"] textarea:hover:not(:focus) {
+            border-color: rgba(34, 211, 238, 0.35) !important;
+            box-shadow: 
+                0 12px 40px rgba(34, 211, 238, 0.1),
+                inset 0 1px 0 rgba(255, 255, 255, 0.12) !important;
+            background: linear-gradient(135deg, rgba(15, 23, 42, 0.98) 0%, rgba(30, 41, 59, 0.93) 100%) !important;
+        }
+        
+        div[data-testid="stChatInput"] button {
+            background: linear-gradient(135deg, #22d3ee 0%, #06b6d4 100%) !important;
+            border: none !important;
+            border-radius: 12px !important;
+            padding: 0.7rem 1.2rem !important;
+            font-weight: 600 !important;
+            transition: all 0.3s cubic-bezier(0.34, 1.56, 0.64, 1) !important;
+            box-shadow: 0 8px 25px rgba(34, 211, 238, 0.3) !important;
+            cursor: pointer;
+            color: #0c2340 !important;
+        }
+        
+        div[data-testid="stChatInput"] button:hover {
+            box-shadow: 0 12px 35px rgba(34, 211, 238, 0.4) !important;
+            transform: translateY(-2px) !important;
+            background: linear-gradient(135deg, #06b6d4 0%, #0891b2 100%) !important;
+        }
+        
+        div[data-testid="stChatInput"] button:active {
+            transform: translateY(0) !important;
+            box-shadow: 0 4px 15px rgba(34, 211, 238, 0.2) !important;
+        }
+        
+        .st-emotion-cache-jchovf.e5ztmp71 {
+            margin-top: 0 !important;
+        }
+        
+        [data-testid="stBottomBlockContainer"] {
+            margin-top: -3.5rem !important;
+            padding: 1.5rem 1.5rem 1rem 1.5rem !important;
+            min-height: 100px !important;
+            max-height: 140px !important;
+            background: linear-gradient(135deg, rgba(15, 23, 42, 0.6) 0%, rgba(20, 30, 48, 0.5) 100%) !important;
+            border: 1px solid rgba(34, 211, 238, 0.15) !important;
+            border-radius: 16px !important;
+            backdrop-filter: blur(10px) !important;
+            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3), inset 0 1px 0 rgba(34, 211, 238, 0.1) !important;
+        }
+
+        @media (prefers-reduced-motion: reduce) {
+            .insights-container,
+            .hero-header,
+            .hero-subtitle,
+            .insights-chat-history,
+            .insights-chat-input-container,
+            div[data-testid="stChatMessage"],
+            div[data-testid="stChatInput"],
+            div[data-testid="stChatInput"] button,
+            div[data-testid="stChatInput"] textarea {
+                animation: none !important;
+                transition: none !important;
+                transform: none !important;
+            }
+        }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    compare_base_dir = COMPARE_BASE_DIR
+    metrics_csv = compare_base_dir / "metrics.csv"
+
+    metrics_views = metrics_view_utils.load_metrics_views(metrics_csv)
+    metrics_df = metrics_views["frame"]
+    metrics_signature = metrics_views["signature"]
+    
+    if st.session_state.get("insights_chat_metrics_signature") != metrics_signature:
+        st.session_state["insights_chat_metrics_signature"] = metrics_signature
+        st.session_state["insights_chat_history"] = []
+
+    provider_options = list(insights_chat_utils.PROVIDER_CONFIG.keys())
+    provider = provider_options[0]
+    provider_config = insights_chat_utils.PROVIDER_CONFIG[provider]
+    api_key = os.getenv(provider_config["env_var"], "")
+    model_name = provider_config["default_model"]
+
+    chat_history = st.session_state.setdefault("insights_chat_history", [])
+
+    # Open main container - everything stays inside
+    st.markdown('<div class="insights-container">', unsafe_allow_html=True)
+    
+    # Header
+    st.markdown(
+        """
+        <div class="hero-header">
+            <h1 class="hero-title">
+                <svg width="32" height="32" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" style="display:inline;vertical-align:middle;margin-right:8px;animation: float 3s ease-in-out infinite;">
+                    <path d="M12 2a3 3 0 0 0-3 3v1H7a3 3 0 0 0-3 3v4a3 3 0 0 0 3 3h1.1l1.3 3.16A1.5 1.5 0 0 0 10.78 20h2.44a1.5 1.5 0 0 0 1.38-.84L15.9 16H17a3 3 0 0 0 3-3V9a3 3 0 0 0-3-3h-2V5a3 3 0 0 0-3-3Z"></path>
+                    <path d="M9 10h6"></path>
+                    <path d="M9 13h4"></path>
+                </svg>
+                Insights Copilot
+            </h1>
+            <p class="hero-subtitle">Ask questions about your metrics • concise answers by default</p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+    
+    # Chat history - no wrapper box
+    st.markdown('<div class="insights-chat-history">', unsafe_allow_html=True)
+    
+    for message in chat_history:
+        role = message.get("role", "assistant")
+        avatar = ":material/smart_toy:" if role == "assistant" else ":material/account_circle:"
+        with st.chat_message(role, avatar=avatar):
+            st.markdown(message.get("content", ""))
+            meta = message.get("meta") or {}
+            if meta.get("local"):
+                st.caption(f":material/offline_bolt: answered from metrics · {meta['total_s'] * 1000:.0f} ms")
+            elif meta.get("cached"):
+                st.caption(f":material/bolt: cached answer · {format_duration(meta.get('age_s', 0))} old")
+            elif meta.get("total_s") is not None:
+                first_token = f"first token {meta['ttft_s']:.2f} s · " if meta.get("ttft_s") is not None else ""
+                prompt_size = f" · ~{meta['prompt_tokens']} prompt tokens" if meta.get("prompt_tokens") else ""
+                st.caption(f"{first_token}{meta['total_s']:.2f} s total{prompt_size}")
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Input container
+    st.markdown('<div class="insights-chat-input-container">', unsafe_allow_html=True)
+    
+    user_prompt = st.chat_input("What insights about your models? Ask anything...")
+
+    st.markdown('</div></div>', unsafe_allow_html=True)  # Close input container and main container
+
+    if user_prompt:
+        chat_history.append({"role": "user", "content": user_prompt})
+
+        # Templated questions (best model, weakest class, class trend...) are answered locally.
+        started = time.perf_counter()
+        routed = insights_router_utils.route_question(user_prompt, metrics_views)
+        if routed is not None:
+            chat_history.append({
+                "role": "assistant",
+                "content": routed["text"],
+                "meta": {"local": True, "intent": routed["intent"], "total_s": time.perf_counter() - started},
+            })
+            st.rerun()
+
+        retrieval_index = insights_chat_utils.get_retrieval_index(
+            metrics_df, metrics_signature, class_rows=metrics_views["class_analysis"]
+        )
+        selected_docs, metrics_context = insights_chat_utils.retrieve_context(
+            metrics_df, user_prompt, index=retrieval_index
+        )
+
+        response_meta = {}
+        if not api_key:
+            response = f"Set {provider_config['env_var']} environment variable with your API key."
+        elif metrics_df.empty:
+            response = "No metrics data found. Run evaluations in Model Comparison first."
+        else:
+            response_cache = response_cache_utils.get_cache()
+            cache_prompt = insights_chat_utils.conversation_prompt(chat_history)
+            cache_key = response_cache_utils.response_key(
+                metrics_signature, cache_prompt, metrics_context, provider, model_name
+            )
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                response = cached["text"]
+                response_meta = {"cached": True, "age_s": time.time() - cached["created_at"]}
+            else:
+                with st.chat_message("user", avatar=":material/account_circle:"):
+                    st.markdown(user_prompt)
+                # Stream the answer into the page as tokens arrive.
+                with st.chat_message("assistant", avatar=":material/smart_toy:"):
+                    stream_stats = {}
+                    try:
+                        messages = insights_chat_utils.build_messages(chat_history, metrics_context)
+                        st.write_stream(
+                            insights_chat_utils.stream_chat_completion(
+                                provider=provider,
+                                api_key=api_key,
+                                model_name=model_name,
+                                messages=messages,
+                                stats=stream_stats,
+                            )
+                        )
+                        response = stream_stats["text"]
+                        response_meta = {
+                            "ttft_s": stream_stats["ttft_s"],
+                            "total_s": stream_stats["total_s"],
+                            "prompt_tokens": stream_stats["prompt_tokens"],
+                        }
+                        if response:
+                            response_cache.put(
+                                cache_key,
+                                response,
+                                signature=metrics_signature,
+                                prompt=cache_prompt,
+                                provider=provider,
+                                model=model_name,
+                                meta=response_meta,
+                            )
+                    except Exception as exc:
+                        response = f"Request failed: {exc}"
+
+        chat_history.append({"role": "assistant", "content": response, "meta": response_meta})
+        st.rerun()
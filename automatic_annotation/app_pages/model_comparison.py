@@ -0,0 +1,502 @@
+"""Model Comparison page: evaluate models against ground truth and browse metrics."""
+
+from datetime import datetime
+
+import streamlit as st
+
+from app_pages.common import COMPARE_BASE_DIR, get_model_registry, render_job_panel
+from core import jobs as job_utils
+from core import model_registry as model_registry_utils
+from core.lazy_imports import lazy_module
+
+cv2 = lazy_module("cv2")
+pd = lazy_module("pandas")
+metrics_view_utils = lazy_module("core.metrics_views")
+model_eval_utils = lazy_module("core.model_evaluation")
+
+
+def run_evaluation_job(reporter, registry, model_name, conf_threshold, iou_threshold, compare_base_dir):
+    """Evaluate one model inside a background job using cached model weights."""
+    results = model_eval_utils.evaluate_and_log(
+        model_name,
+        conf_threshold=conf_threshold,
+        iou_threshold=iou_threshold,
+        compare_base_dir=compare_base_dir,
+        progress_callback=reporter.callback(),
+        model_loader=registry.get,
+    )
+    if results.get("error"):
+        raise RuntimeError(results["error"])
+    results["model_cache"] = dict(registry.stats)
+    return results
+
+
+def render():
+    """Render the Model Comparison page."""
+    st.markdown("""
+    <div class="hero-header">
+        <h1 class="hero-title">
+            <svg width="32" height="32" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" style="display:inline;vertical-align:middle;margin-right:8px;">
+                <circle cx="12" cy="12" r="3"></circle>
+                <path d="M12 1v6m0 6v6m5.2-13.2l-4.2 4.2m0 6l4.2 4.2M23 12h-6m-6 0H5m13.2 5.2l-4.2-4.2m0-6l4.2-4.2"></path>
+            </svg>
+            Comparison
+        </h1>
+        <p class="hero-subtitle">Benchmark YOLO models against ground truth with clear per-class insights</p>
+        <div class="hero-badges">
+            <span class="hero-badge">Ground Truth Eval</span>
+            <span class="hero-badge">Per-Class Matrix</span>
+            <span class="hero-badge">Metrics Timeline</span>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Paths - Comparison folder structure
+    MODELS_DIR = COMPARE_BASE_DIR / "model"
+    NEW_MODEL_DIR = COMPARE_BASE_DIR / "new_model"
+    COMPARE_OUTPUT_DIR = COMPARE_BASE_DIR / "output"
+    METRICS_CSV = COMPARE_BASE_DIR / "metrics.csv"
+    
+    # Create directories if they don't exist
+    MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    NEW_MODEL_DIR.mkdir(parents=True, exist_ok=True)
+    COMPARE_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    
+    # Helper functions
+    def get_available_models():
+        """Return model names available for evaluation in comparison page."""
+        models = []
+        # Get models from model folder (looking for .pt files); listings are cached per folder mtime
+        for pt_file, _ in model_registry_utils.list_models(MODELS_DIR):
+            model_name = pt_file.stem  # Get filename without extension (v1, v2, etc.)
+            models.append(model_name)
+        # Add new_model if it has .pt files
+        if model_registry_utils.list_models(NEW_MODEL_DIR):
+            models.insert(0, "Latest (new_model)")
+        return models
+    
+    def get_model_output_frames(model_name):
+        """Get previewable comparison output frames for selected model."""
+        # Handle "Latest (new_model)" special case
+        if model_name == "Latest (new_model)":
+            model_output_dir = COMPARE_OUTPUT_DIR / "new_model"
+        else:
+            model_output_dir = COMPARE_OUTPUT_DIR / model_name
+        
+        if model_output_dir.exists():
+            frames = sorted(model_output_dir.glob("*.jpg")) + sorted(model_output_dir.glob("*.png"))
+            return frames[:6]  # Return first 6 frames for preview
+        return []
+
+    def get_latest_new_model_info():
+        """Return metadata for the newest model in `new_model` directory."""
+        latest = model_registry_utils.latest_model(NEW_MODEL_DIR)
+        if latest is None:
+            return None
+        return {
+            "name": latest.stem,
+            "path": latest,
+            "updated": datetime.fromtimestamp(latest.stat().st_mtime)
+        }
+
+    # Get available models
+    available_models = get_available_models()
+    latest_new_model = get_latest_new_model_info()
+    
+    if not available_models:
+        st.warning("No models found in models folder")
+
+    st.markdown("""
+    <div class="section-card" style="margin-top: 0.5rem; padding: 1.25rem 1.5rem;">
+        <div style="display: flex; align-items: center; justify-content: space-between; gap: 1rem; flex-wrap: wrap;">
+            <div>
+                <h3 style="margin: 0; color: #f8fafc; font-size: 1.1rem; font-weight: 700;">Run Model Evaluation</h3>
+                <p style="margin: 0.35rem 0 0; color: #cbd5e1; font-size: 0.92rem;">Evaluates the selected model on ground truth and appends metrics to the CSV.</p>
+            </div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if available_models:
+        col_eval_1, col_eval_2, col_eval_3, col_eval_4 = st.columns([2, 1, 1, 1])
+        with col_eval_1:
+            selected_model = st.selectbox("Model to evaluate", available_models, key="model_eval_select")
+        with col_eval_2:
+            eval_conf_threshold = st.slider("Eval conf", 0.05, 0.95, 0.50, 0.05, key="model_eval_conf")
+        with col_eval_3:
+            eval_iou_threshold = st.slider("Eval IoU", 0.10, 0.95, 0.50, 0.05, key="model_eval_iou")
+        with col_eval_4:
+            if st.button("Run Evaluation", type="primary", use_container_width=True):
+                if selected_model:
+                    # Runs in-process so the cached model registry skips reloading weights.
+                    job_utils.get_manager().submit_callable(
+                        "evaluate",
+                        f"Evaluate {selected_model} (conf {eval_conf_threshold:.2f}, IoU {eval_iou_threshold:.2f})",
+                        run_evaluation_job,
+                        get_model_registry(),
+                        selected_model,
+                        eval_conf_threshold,
+                        eval_iou_threshold,
+                        COMPARE_BASE_DIR,
+                    )
+                    st.rerun()
+                else:
+                    st.error("Please select a model first")
+
+        render_job_panel("evaluate", unit="frames")
+        eval_job = job_utils.latest_job("evaluate")
+        if eval_job and eval_job["status"] == "succeeded" and eval_job["result"]:
+            if eval_job["result"].get("saved"):
+                st.success(eval_job["result"].get("message", "Comparison completed."))
+            elif eval_job["result"].get("total_frames", 0) == 0:
+                st.error(eval_job["result"].get("message", "No frames were processed. Metrics entry was not saved."))
+            else:
+                st.warning(eval_job["result"].get("message", "Metrics entry was not saved."))
+
+    st.divider()
+    
+    # Parsed metrics and derived tables are cached per metrics.csv signature.
+    metrics_views = metrics_view_utils.load_metrics_views(METRICS_CSV)
+    metrics_df = metrics_views["frame"] if not metrics_views["frame"].empty else None
+
+    # Display selected model with preview frames and metrics
+    if available_models:
+        st.markdown("### Model Insights")
+
+        view_model = st.selectbox(
+            "Choose version to inspect",
+            available_models,
+            index=0,
+            key="model_compare_view_select",
+            format_func=lambda name: f"Latest (new_model) • {latest_new_model['name']}" if (name == "Latest (new_model)" and latest_new_model) else name
+        )
+
+        latest_by_model = metrics_views["latest_by_model"]
+        if metrics_df is not None:
+            model_col, date_col, prec_col, rec_col = metrics_views["columns"]
+
+        with st.container(border=True):
+            col_title, col_metrics = st.columns([1, 3])
+
+            with col_title:
+                if view_model == "Latest (new_model)":
+                    label = "Latest (new_model)"
+                    if latest_new_model:
+                        st.markdown(f"**{label}**")
+                        st.caption(f"Active file: {latest_new_model['name']}.pt")
+                        st.caption(f"Updated: {latest_new_model['updated'].strftime('%Y-%m-%d %H:%M:%S')}")
+                    else:
+                        st.markdown(f"**{label}**")
+                        st.caption("No model file found in new_model folder.")
+                else:
+                    st.markdown(f"**{view_model}**")
+
+                if view_model in latest_by_model:
+                    latest = latest_by_model[view_model]
+                    overall_precision = float(latest.get(prec_col, 0.0))
+                    overall_recall = float(latest.get(rec_col, 0.0))
+                    overall_f1 = (2 * overall_precision * overall_recall / (overall_precision + overall_recall)) if (overall_precision + overall_recall) > 0 else 0.0
+
+                    st.metric("Overall Precision", f"{overall_precision:.2%}")
+                    st.metric("Overall Recall", f"{overall_recall:.2%}")
+                    st.metric("Overall F1", f"{overall_f1:.2%}")
+                else:
+                    st.info("No metrics run yet")
+
+            with col_metrics:
+                metric_tab, frames_tab = st.tabs(["Per-Class Metrics", "Comparison Frames"])
+
+                with metric_tab:
+                    if view_model in latest_by_model:
+                        per_class_df = metrics_views["per_class_tables"].get(view_model, pd.DataFrame())
+                        if not per_class_df.empty:
+                            chart_df = per_class_df.set_index('Class')[['Precision', 'Recall', 'F1']]
+                            st.bar_chart(chart_df)
+                            st.dataframe(
+                                per_class_df,
+                                use_container_width=True,
+                                hide_index=True,
+                                height=min(420, 70 + (len(per_class_df) * 36)),
+                                column_config={
+                                    "Class": st.column_config.TextColumn("Class", width="medium"),
+                                    "Precision": st.column_config.ProgressColumn("Precision", format="%.1f%%", min_value=0.0, max_value=1.0),
+                                    "Recall": st.column_config.ProgressColumn("Recall", format="%.1f%%", min_value=0.0, max_value=1.0),
+                                    "F1": st.column_config.ProgressColumn("F1", format="%.1f%%", min_value=0.0, max_value=1.0),
+                                }
+                            )
+                        else:
+                            st.info("No per-class metrics available for this model.")
+                    else:
+                        st.info("Run comparison to generate per-class metrics.")
+
+                with frames_tab:
+                    st.markdown("**Comparison Frames Preview**")
+                    frames = get_model_output_frames(view_model)
+
+                    if frames:
+                        cols = st.columns(3)
+                        for idx, frame_path in enumerate(frames):
+                            with cols[idx % 3]:
+                                try:
+                                    img = cv2.imread(str(frame_path))
+                                    if img is not None:
+                                        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+                                        st.image(img_rgb, caption=frame_path.name, use_container_width=True)
+                                except:
+                                    st.write(f"Could not load {frame_path.name}")
+                        st.caption("Showing up to 6 recent output frames.")
+                    else:
+                        st.info("No comparison frames yet. Run evaluation to generate.")
+    
+    st.divider()
+    
+    # Display metrics history
+    if metrics_df is not None and len(metrics_df) > 0:
+        st.markdown("### Metrics History")
+        model_col, date_col, prec_col, rec_col = metrics_views["columns"]
+        metrics_df_work = metrics_df.sort_values(date_col, ascending=False)
+
+        filter_models = sorted(metrics_df_work[model_col].dropna().unique().tolist())
+        selected_models = st.multiselect(
+            "Filter models",
+            options=filter_models,
+            default=filter_models,
+            key="history_model_filter"
+        )
+
+        if selected_models:
+            metrics_df_work = metrics_df_work[metrics_df_work[model_col].isin(selected_models)]
+        else:
+            st.info("Select at least one model to view history.")
+            metrics_df_work = metrics_df_work.iloc[0:0]
+        
+        if len(metrics_df_work) > 0:
+            trend_df = metrics_df_work[[date_col, model_col, prec_col, rec_col]].copy()
+            trend_df['f1_score'] = metrics_views["f1_series"].loc[metrics_df_work.index]
+            trend_df = trend_df.dropna(subset=[date_col]).sort_values(date_col)
+            if len(trend_df) > 0:
+                st.markdown("#### Precision / Recall Trend")
+                trend_metric = st.segmented_control(
+                    "Trend metric",
+                    ["Precision", "Recall", "F1"],
+                    key="history_trend_metric",
+                    default="Precision"
+                )
+                if trend_metric == "Precision":
+                    value_col = prec_col
+                elif trend_metric == "Recall":
+                    value_col = rec_col
+                else:
+                    value_col = 'f1_score'
+
+                pivot_data = trend_df.pivot_table(values=value_col, index=date_col, columns=model_col)
+                st.line_chart(pivot_data)
+
+                smooth_enabled = st.checkbox("Show smoothed trend", value=True, key="history_smooth_enabled")
+                if smooth_enabled:
+                    smooth_window = st.slider("Smoothing window (runs)", 2, 10, 3, key="history_smooth_window")
+                    smooth_data = pivot_data.rolling(window=smooth_window, min_periods=1).mean()
+                    st.area_chart(smooth_data)
+
+            st.markdown("#### Detailed Runs")
+            st.dataframe(
+                metrics_df_work,
+                use_container_width=True,
+                hide_index=True,
+                height=360,
+                column_config={
+                    model_col: st.column_config.TextColumn("Model", width="small"),
+                    date_col: st.column_config.DatetimeColumn("Run Time", format="YYYY-MM-DD HH:mm:ss"),
+                    prec_col: st.column_config.ProgressColumn("Overall Precision", format="%.1f%%", min_value=0.0, max_value=1.0),
+                    rec_col: st.column_config.ProgressColumn("Overall Recall", format="%.1f%%", min_value=0.0, max_value=1.0),
+                }
+            )
+
+        csv_data = metrics_views["raw"].to_csv(index=False)
+        st.download_button("Download Metrics CSV", csv_data, "metrics.csv", "text/csv")
+
+        st.divider()
+        st.markdown("### Advanced Analytics")
+
+        analytics_tab1, analytics_tab2, analytics_tab3, analytics_tab4 = st.tabs([
+            "Model Performance",
+            "Per-Class Metrics",
+            "Metrics History",
+            "Model Comparison",
+        ])
+
+        with analytics_tab1:
+            latest_metrics = metrics_views["latest_rows"]
+
+            if len(latest_metrics) > 0:
+                kpi_df = latest_metrics[[model_col, prec_col, rec_col, 'F1-Score']].copy()
+                kpi_df.rename(columns={model_col: 'Model', prec_col: 'Precision', rec_col: 'Recall'}, inplace=True)
+                kpi_df = kpi_df.sort_values('F1-Score', ascending=False)
+
+                c1, c2, c3 = st.columns(3)
+                with c1:
+                    st.metric("Best F1 Model", str(kpi_df.iloc[0]['Model']))
+                with c2:
+                    st.metric("Top F1", f"{float(kpi_df.iloc[0]['F1-Score']):.2%}")
+                with c3:
+                    st.metric("Models Tracked", f"{kpi_df['Model'].nunique()}")
+
+                st.bar_chart(kpi_df.set_index('Model')[['Precision', 'Recall', 'F1-Score']])
+                st.dataframe(
+                    kpi_df,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "Model": st.column_config.TextColumn("Model", width="small"),
+                        "Precision": st.column_config.ProgressColumn("Precision", format="%.1f%%", min_value=0.0, max_value=1.0),
+                        "Recall": st.column_config.ProgressColumn("Recall", format="%.1f%%", min_value=0.0, max_value=1.0),
+                        "F1-Score": st.column_config.ProgressColumn("F1", format="%.1f%%", min_value=0.0, max_value=1.0),
+                    }
+                )
+            else:
+                st.info("No metrics available yet. Run model comparison to generate metrics.")
+
+        with analytics_tab2:
+            per_class_cols = [col for col in metrics_df.columns if col.startswith('precision_') or col.startswith('recall_')]
+
+            if per_class_cols:
+                available_models_pc = sorted(metrics_df[model_col].dropna().unique().tolist())
+                selected_model_pc = st.selectbox("Select Model", available_models_pc, key="model_compare_per_class_model_select")
+
+                if selected_model_pc:
+                    class_df = metrics_views["per_class_tables"].get(selected_model_pc)
+                    if class_df is not None:
+                        if not class_df.empty:
+                            st.bar_chart(class_df.set_index('Class')[['Precision', 'Recall', 'F1']])
+                            st.dataframe(
+                                class_df,
+                                use_container_width=True,
+                                hide_index=True,
+                                height=min(500, 72 + (len(class_df) * 36)),
+                                column_config={
+                                    "Class": st.column_config.TextColumn("Class", width="medium"),
+                                    "Precision": st.column_config.ProgressColumn("Precision", format="%.1f%%", min_value=0.0, max_value=1.0),
+                                    "Recall": st.column_config.ProgressColumn("Recall", format="%.1f%%", min_value=0.0, max_value=1.0),
+                                    "F1": st.column_config.ProgressColumn("F1", format="%.1f%%", min_value=0.0, max_value=1.0),
+                                }
+                            )
+                        else:
+                            st.info("No per-class metrics available for this model.")
+            else:
+                st.info("No per-class metrics found in the data. Run model comparison to generate per-class metrics.")
+
+        with analytics_tab3:
+            history_df = metrics_df.dropna(subset=[date_col]).sort_values(date_col)
+            history_df = history_df.assign(f1_score=metrics_views["f1_series"].loc[history_df.index])
+
+            model_opts = sorted(history_df[model_col].dropna().unique().tolist())
+            selected_history_models = st.multiselect(
+                "Models",
+                options=model_opts,
+                default=model_opts,
+                key="model_compare_history_models"
+            )
+
+            if selected_history_models:
+                history_df = history_df[history_df[model_col].isin(selected_history_models)]
+
+            metric_choice = st.segmented_control(
+                "Metric",
+                ["Precision", "Recall", "F1"],
+                key="model_compare_history_metric",
+                default="Precision"
+            )
+
+            if metric_choice == "Precision":
+                metric_col = prec_col
+            elif metric_choice == "Recall":
+                metric_col = rec_col
+            else:
+                metric_col = 'f1_score'
+
+            chart_df = history_df.pivot_table(values=metric_col, index=date_col, columns=model_col)
+            if len(chart_df) > 0:
+                st.line_chart(chart_df)
+                smooth_window_adv = st.slider("Smoothing window (runs)", 2, 10, 3, key="model_compare_history_smooth_window")
+                st.area_chart(chart_df.rolling(window=smooth_window_adv, min_periods=1).mean())
+
+            st.dataframe(
+                history_df.sort_values(date_col, ascending=False),
+                use_container_width=True,
+                hide_index=True,
+                height=360,
+                column_config={
+                    model_col: st.column_config.TextColumn("Model", width="small"),
+                    date_col: st.column_config.DatetimeColumn("Run Time", format="YYYY-MM-DD HH:mm:ss"),
+                    prec_col: st.column_config.ProgressColumn("Overall Precision", format="%.1f%%", min_value=0.0, max_value=1.0),
+                    rec_col: st.column_config.ProgressColumn("Overall Recall", format="%.1f%%", min_value=0.0, max_value=1.0),
+                }
+            )
+
+        with analytics_tab4:
+            latest_metrics = metrics_views["latest_rows"]
+
+            if len(latest_metrics) > 0:
+                overview = latest_metrics[[model_col, prec_col, rec_col, 'F1-Score']].set_index(model_col)
+                overview.columns = ['Precision', 'Recall', 'F1-Score']
+                st.bar_chart(overview)
+
+                per_class_cols = [col for col in latest_metrics.columns if col.startswith('precision_') or col.startswith('recall_')]
+                if per_class_cols:
+                    classes = set()
+                    for col in per_class_cols:
+                        if col.startswith('precision_'):
+                            classes.add(col.replace('precision_', ''))
+                        elif col.startswith('recall_'):
+                            classes.add(col.replace('recall_', ''))
+
+                    classes = sorted(classes)
+                    if classes:
+                        selected_class = st.selectbox("Select Class", classes, key="model_compare_class_comparison_select")
+                        metric_type = st.segmented_control(
+                            "Compare",
+                            ["Precision", "Recall"],
+                            key="model_compare_class_comp_metric",
+                            default="Precision"
+                        )
+
+                        selected_col = f"precision_{selected_class}" if metric_type == "Precision" else f"recall_{selected_class}"
+                        if selected_col in latest_metrics.columns:
+                            class_comp_df = latest_metrics[[model_col, selected_col]].copy()
+                            class_comp_df.rename(columns={selected_col: metric_type, model_col: 'Model'}, inplace=True)
+                            st.bar_chart(class_comp_df.set_index('Model'))
+                            st.dataframe(
+                                class_comp_df,
+                                use_container_width=True,
+                                hide_index=True,
+                                column_config={
+                                    "Model": st.column_config.TextColumn("Model", width="small"),
+                                    metric_type: st.column_config.ProgressColumn(metric_type, format="%.1f%%", min_value=0.0, max_value=1.0)
+                                }
+                            )
+
+                display_cols = [model_col, prec_col, rec_col, 'F1-Score']
+                for col in ['matched_boxes', 'false_positives', 'false_negatives', 'total_frames']:
+                    if col in latest_metrics.columns:
+                        display_cols.append(col)
+
+                comparison_table = latest_metrics[display_cols].copy()
+                comparison_table.rename(columns={
+                    model_col: 'Model',
+                    prec_col: 'Overall Precision',
+                    rec_col: 'Overall Recall'
+                }, inplace=True)
+
+                st.dataframe(
+                    comparison_table.sort_values('F1-Score', ascending=False),
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "Model": st.column_config.TextColumn("Model", width="small"),
+                        "Overall Precision": st.column_config.ProgressColumn("Overall Precision", format="%.1f%%", min_value=0.0, max_value=1.0),
+                        "Overall Recall": st.column_config.ProgressColumn("Overall Recall", format="%.1f%%", min_value=0.0, max_value=1.0),
+                        "F1-Score": st.column_config.ProgressColumn("F1", format="%.1f%%", min_value=0.0, max_value=1.0),
+                    }
+                )
+            else:
+                st.info("No models compared yet.")
@@ -0,0 +1,204 @@
+"""Batch augmentation over stacked same-resolution frames.
+
+Frames extracted from one video share a resolution, so they can be stacked
+into an N x H x W x 3 array and augmented together. Each sample still gets
+its own variant choice and random parameters. Those are drawn from the
+sample's own seed, so results don't depend on how frames were batched.
+Variants are then grouped by transform and applied batch-wide:
+
+- brightness/contrast and fog: the per-sample uint8 lookup tables of
+  `core.fast_augmentation` (a float pass over the stack is slower);
+- Gaussian noise: one saturating `cv2.addWeighted` over the group with
+  per-sample slices of the cached noise bank;
+- colour shift: one BGR->HSV->BGR conversion for the whole group, with
+  per-sample lookup tables in between;
+- rotation, Gaussian blur and motion blur: per-sample OpenCV fast paths
+  (cached kernels), as a blur must not cross frame boundaries.
+
+Groups are processed `BATCH_CHUNK` samples at a time to bound temporaries.
+"""
+
+from collections import defaultdict
+import random
+
+import cv2
+import numpy as np
+
+from core.fast_augmentation import (
+    NOISE_BANK_EXTRA_ROWS,
+    add_fog,
+    brightness_contrast,
+    hsv_lut,
+    motion_blur_kernel,
+    noise_bank,
+)
+from data_augmentation import AUGMENTATIONS, DEFAULT_AUGMENTATION_OPTIONS, enabled_augmentations
+
+
+BATCH_CHUNK = 8
+
+
+# ---------------------------
+# Per-sample plans
+# ---------------------------
+
+def _draw_params(flag: str, rng: random.Random) -> dict:
+    """Draw one variant's parameters from the sample's generator (same ranges as the builders)."""
+    if flag == "use_gaussian_noise":
+        return {"sigma": rng.choice([10, 15, 25]), "offset": rng.randint(0, NOISE_BANK_EXTRA_ROWS)}
+    if flag == "use_salt_pepper":
+        return {"amount": rng.choice([0.005, 0.01, 0.02]), "seed": rng.getrandbits(32)}
+    if flag == "use_small_rotate":
+        return {"deg": rng.uniform(-8, 8)}
+    if flag == "use_brightness_contrast":
+        brightness = rng.uniform(-0.25, 0.25) * 255.0
+        return {"brightness": brightness, "contrast": 1.0 + rng.uniform(-0.25, 0.25)}
+    if flag == "use_gaussian_blur":
+        return {"ksize": rng.choice([3, 5])}
+    if flag == "use_motion_blur":
+        return {"ksize": rng.choice([5, 7, 9]), "angle": round(rng.uniform(-20, 20))}
+    if flag == "use_fog":
+        return {"intensity": rng.choice([0.1, 0.15, 0.2])}
+    if flag == "use_color_shift":
+        return {
+            "hue_shift": rng.randint(-5, 5),
+            "sat_scale": rng.uniform(0.9, 1.1),
+            "val_scale": rng.uniform(0.9, 1.1),
+        }
+    raise ValueError(f"Unknown augmentation: {flag}")
+
+
+def draw_plan(seed: int, variants_per_image: int, **options) -> list:
+    """Return the `(flag, params)` variants one sample gets for `seed`."""
+    enabled_augmentations(**options)  # validate option names
+    options.pop("engine", None)
+    flags = {**DEFAULT_AUGMENTATION_OPTIONS, **options}
+    rng = random.Random(seed)
+    chosen = [flag for flag, _ in AUGMENTATIONS if flags[flag]]
+    rng.shuffle(chosen)
+    return [(flag, _draw_params(flag, rng)) for flag in chosen[:max(0, int(variants_per_image))]]
+
+
+# ---------------------------
+# Batch kernels
+# ---------------------------
+
+def _chunks(count: int, size: int = BATCH_CHUNK):
+    for start in range(0, count, size):
+        yield slice(start, min(count, start + size))
+
+
+def _brightness_contrast(batch, index, params):
+    # A 256-entry table per sample beats whole-stack float arithmetic on uint8 frames.
+    return [(brightness_contrast(batch[i], p["contrast"], p["brightness"]), None) for i, p in zip(index, params)]
+
+
+def _fog(batch, index, params):
+    # Table blend plus per-frame blur, so nothing bleeds across frame boundaries.
+    return [(add_fog(batch[i], p["intensity"]), None) for i, p in zip(index, params)]
+
+
+def _gaussian_noise(batch, index, params):
+    n, height, width = len(index), batch.shape[1], batch.shape[2]
+    channels = batch.shape[3]
+    out = np.empty((n, height, width, channels), dtype=np.uint8)
+    for part in _chunks(n):
+        noise = np.stack([
+            noise_bank(height, width, channels, float(p["sigma"]))[p["offset"]:p["offset"] + height]
+            for p in params[part]
+        ])
+        k = noise.shape[0]
+        # img + (noise - 128) with saturation, as one call over the stacked frames.
+        cv2.addWeighted(
+            batch[index[part]].reshape(k * height, width, channels), 1.0,
+            noise.reshape(k * height, width, channels), 1.0, -128.0,
+            dst=out[part].reshape(k * height, width, channels),
+        )
+    return [(img, None) for img in out]
+
+
+def _salt_pepper(batch, index, params):
+    out = batch[index].copy()
+    height, width = batch.shape[1:3]
+    pixels = out.reshape(len(index), height * width, -1)
+    for j, p in enumerate(params):
+        rng = np.random.default_rng(p["seed"])
+        num = int(height * width * p["amount"] * 0.5)
+        flat = rng.integers(0, height * width, 2 * num)
+        pixels[j, flat[:num]] = 255
+        pixels[j, flat[num:]] = 0
+    return [(img, None) for img in out]
+
+
+def _color_shift(batch, index, params):
+    n, height, width = len(index), batch.shape[1], batch.shape[2]
+    out = np.empty((n, height, width, 3), dtype=np.uint8)
+    for part in _chunks(n):
+        k = part.stop - part.start
+        # Colour conversion is per pixel, so the stacked frames convert as one tall image.
+        hsv = cv2.cvtColor(batch[index[part]].reshape(k * height, width, 3), cv2.COLOR_BGR2HSV)
+        frames = hsv.reshape(k, height, width, 3)
+        for j, p in enumerate(params[part]):
+            cv2.LUT(frames[j], hsv_lut(p["hue_shift"], p["sat_scale"], p["val_scale"]), dst=frames[j])
+        cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR, dst=out[part].reshape(k * height, width, 3))
+    return [(img, None) for img in out]
+
+
+def _rotate(batch, index, params):
+    height, width = batch.shape[1:3]
+    results = []
+    for i, p in zip(index, params):
+        M = cv2.getRotationMatrix2D((width / 2, height / 2), p["deg"], 1.0)
+        results.append((cv2.warpAffine(batch[i], M, (width, height), borderMode=cv2.BORDER_REPLICATE), M))
+    return results
+
+
+def _gaussian_blur(batch, index, params):
+    return [(cv2.GaussianBlur(batch[i], (p["ksize"], p["ksize"]), 0), None) for i, p in zip(index, params)]
+
+
+def _motion_blur(batch, index, params):
+    return [(cv2.filter2D(batch[i], -1, motion_blur_kernel(p["ksize"], float(p["angle"]))), None) for i, p in zip(index, params)]
+
+
+BATCH_KERNELS = {
+    "use_gaussian_noise": _gaussian_noise,
+    "use_salt_pepper": _salt_pepper,
+    "use_small_rotate": _rotate,
+    "use_brightness_contrast": _brightness_contrast,
+    "use_gaussian_blur": _gaussian_blur,
+    "use_motion_blur": _motion_blur,
+    "use_fog": _fog,
+    "use_color_shift": _color_shift,
+}
+
+
+def augment_batch(batch: np.ndarray, variants_per_image: int = 2, seeds=None, **options) -> list:
+    """
+    Augment an N x H x W x 3 uint8 stack and return, per sample, a list of
+    `(variant, affine matrix or None)` pairs (the matrix is set for rotations).
+    - seeds: one seed per sample; a sample's variants depend only on its own seed.
+    - options: the `use_*` switches of `data_augmentation.apply_augmentations`.
+    """
+    batch = np.ascontiguousarray(batch)
+    if batch.ndim != 4 or batch.shape[3] != 3 or batch.dtype != np.uint8:
+        raise ValueError(f"Expected an N x H x W x 3 uint8 array, got {batch.dtype} {batch.shape}")
+    if seeds is None:
+        seeds = [random.randrange(2**32) for _ in range(len(batch))]
+    if len(seeds) != len(batch):
+        raise ValueError(f"Got {len(seeds)} seeds for {len(batch)} samples")
+
+    plans = [draw_plan(seed, variants_per_image, **options) for seed in seeds]
+    results = [[None] * len(plan) for plan in plans]
+
+    groups = defaultdict(list)
+    for sample, plan in enumerate(plans):
+        for slot, (flag, params) in enumerate(plan):
+            groups[flag].append((sample, slot, params))
+
+    for flag, items in groups.items():
+        index = np.asarray([sample for sample, _, _ in items], dtype=np.intp)
+        outputs = BATCH_KERNELS[flag](batch, index, [params for _, _, params in items])
+        for (sample, slot, _), output in zip(items, outputs):
+            results[sample][slot] = output
+    return results
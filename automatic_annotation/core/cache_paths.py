@@ -0,0 +1,16 @@
+"""Shared on-disk cache locations.
+
+Caches are derived data only; deleting the folder is always safe.
+"""
+
+from pathlib import Path
+
+
+APP_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache"
+
+
+def cache_subdir(name: str, base_dir: Path = APP_CACHE_DIR) -> Path:
+    """Return (and create) one named cache folder under the app cache root."""
+    path = Path(base_dir) / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
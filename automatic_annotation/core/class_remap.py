@@ -0,0 +1,285 @@
+"""Bulk relabeling of YOLO label files when `classes.txt` changes.
+
+Reordering, merging, deleting or renaming classes changes which id means
+which class, so every label file has to follow. A remap is a mapping
+`{old_id: new_id or None}`; None deletes those boxes. `build_mapping`
+derives it from the old and new class lists, plus optional aliases for renames
+and merges.
+
+`apply_remap` rewrites the files in parallel, each one atomically
+(temp file + `os.replace`). Before touching anything it writes a journal
+(`.class_remap.json` in the label folder) with the mapping, the new class
+list and each pending file's size and mtime. A file whose stat no longer
+matches the journal has already been rewritten. So an interrupted run
+resumes with `resume_remap` without remapping any file twice. `classes.txt`
+is replaced last and the journal is then removed.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import json
+import os
+import threading
+import time
+
+from core import file_index as file_index_utils
+
+
+LABEL_EXTENSIONS = (".txt",)
+CLASSES_FILE = "classes.txt"
+JOURNAL_FILE = ".class_remap.json"
+
+DEFAULT_REMAP_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Label files handled per worker task.
+REMAP_CHUNK = 256
+
+
+# ---------------------------
+# Mapping
+# ---------------------------
+
+def parse_aliases(lines) -> dict:
+    """Parse `old = new` lines (renames and merges) into `{old_name: new_name}`."""
+    aliases = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        old, sep, new = line.partition("=")
+        if not sep or not old.strip() or not new.strip():
+            raise ValueError(f"Expected 'old = new', got: {line.strip()}")
+        aliases[old.strip()] = new.strip()
+    return aliases
+
+
+def build_mapping(old_classes, new_classes, aliases: dict = None) -> dict:
+    """
+    Map old class ids to new ones by name.
+    - aliases: `{old_name: new_name}` for renamed classes, or several old names onto one (merge).
+    - old classes whose name (after aliases) is not in `new_classes` map to None (their boxes are deleted).
+    """
+    aliases = aliases or {}
+    new_ids = {name: index for index, name in enumerate(new_classes)}
+    if len(new_ids) != len(new_classes):
+        raise ValueError("The new class list contains duplicate names")
+    unknown = [old for old in aliases if old not in old_classes]
+    if unknown:
+        raise ValueError(f"Aliases refer to unknown classes: {', '.join(unknown)}")
+    missing = [new for new in aliases.values() if new not in new_ids]
+    if missing:
+        raise ValueError(f"Alias targets are not in the new class list: {', '.join(missing)}")
+    return {index: new_ids.get(aliases.get(name, name)) for index, name in enumerate(old_classes)}
+
+
+def describe_mapping(mapping: dict, old_classes, new_classes) -> list:
+    """Human-readable lines for every class id that changes."""
+    lines = []
+    for old_id, new_id in sorted(mapping.items()):
+        old_name = old_classes[old_id] if old_id < len(old_classes) else str(old_id)
+        if new_id is None:
+            lines.append(f"{old_id} {old_name}: deleted")
+        elif new_id != old_id or new_classes[new_id] != old_name:
+            lines.append(f"{old_id} {old_name} -> {new_id} {new_classes[new_id]}")
+    return lines
+
+
+def is_identity(mapping: dict) -> bool:
+    return all(old_id == new_id for old_id, new_id in mapping.items())
+
+
+# ---------------------------
+# Per-file rewrite
+# ---------------------------
+
+def remap_lines(data: bytes, mapping: dict) -> tuple:
+    """
+    Return `(new_data, moved, deleted)` for one label file's bytes.
+    Ids missing from `mapping` and unparsable lines are left untouched.
+    """
+    out, moved, deleted = [], 0, 0
+    for line in data.splitlines():
+        parts = line.split(None, 1)
+        if not parts:
+            continue
+        try:
+            old_id = int(float(parts[0]))
+        except ValueError:
+            out.append(line)
+            continue
+        if old_id not in mapping:
+            out.append(line)
+            continue
+        new_id = mapping[old_id]
+        if new_id is None:
+            deleted += 1
+            continue
+        if new_id != old_id:
+            moved += 1
+        rest = parts[1] if len(parts) > 1 else b""
+        out.append(str(new_id).encode("ascii") + b" " + rest)
+    return (b"\n".join(out) + b"\n" if out else b""), moved, deleted
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.remap.tmp")
+    try:
+        with open(tmp_path, "wb") as out:
+            out.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _signature(path: Path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _scan_chunk(paths, mapping: dict, write: bool, expected: dict = None) -> list:
+    """Per file: `(name, signature before, moved, deleted, error)`. Writes only when `write`."""
+    results = []
+    for path in paths:
+        signature = _signature(path)
+        if expected is not None and signature != expected.get(str(path)):
+            # Rewritten by the interrupted run already, or changed since: never remap twice.
+            continue
+        try:
+            with open(path, "rb") as label_file:
+                data = label_file.read()
+            new_data, moved, deleted = remap_lines(data, mapping)
+            if write and (moved or deleted):
+                _write_atomic(path, new_data)
+        except OSError as exc:
+            results.append((str(path), signature, 0, 0, str(exc)))
+            continue
+        results.append((str(path), signature, moved, deleted, None))
+    return results
+
+
+def _run_chunks(paths, mapping, write, workers, expected=None, progress_callback=None) -> list:
+    chunks = [paths[start:start + REMAP_CHUNK] for start in range(0, len(paths), REMAP_CHUNK)]
+    results, done = [], 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for chunk, chunk_results in zip(chunks, pool.map(lambda chunk: _scan_chunk(chunk, mapping, write, expected), chunks)):
+            results.extend(chunk_results)
+            done += len(chunk)
+            if progress_callback is not None:
+                progress_callback(done, len(paths), f"{done}/{len(paths)} label files")
+    return results
+
+
+def list_label_files(label_dir: Path) -> list:
+    return [
+        path for path in file_index_utils.list_indexed(label_dir, LABEL_EXTENSIONS)
+        if path.name != CLASSES_FILE
+    ]
+
+
+def _summary(results, seconds: float) -> dict:
+    affected = [result for result in results if result[2] or result[3]]
+    errors = [(name, error) for name, _, _, _, error in results if error]
+    return {
+        "files": len(results),
+        "files_affected": len(affected),
+        "boxes_moved": sum(result[2] for result in results),
+        "boxes_deleted": sum(result[3] for result in results),
+        "errors": errors[:20],
+        "error_count": len(errors),
+        "seconds": round(seconds, 3),
+    }
+
+
+# ---------------------------
+# Public operations
+# ---------------------------
+
+def dry_run(label_dir, mapping: dict, workers: int = DEFAULT_REMAP_WORKERS) -> dict:
+    """Count files and boxes a remap would change, without writing anything."""
+    started = time.perf_counter()
+    results = _run_chunks(list_label_files(Path(label_dir)), mapping, write=False, workers=workers)
+    return _summary(results, time.perf_counter() - started)
+
+
+def pending_remap(label_dir) -> dict:
+    """Return the journal of an interrupted remap in `label_dir`, or None."""
+    journal_path = Path(label_dir) / JOURNAL_FILE
+    try:
+        return json.loads(journal_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _finish(label_dir: Path, journal: dict, workers: int, progress_callback=None) -> list:
+    mapping = {int(old_id): new_id for old_id, new_id in journal["mapping"].items()}
+    expected = {str(label_dir / rel): signature for rel, signature in journal["files"].items()}
+    results = _run_chunks(
+        [Path(path) for path in expected], mapping, write=True, workers=workers,
+        expected=expected, progress_callback=progress_callback,
+    )
+    if any(result[4] for result in results):
+        # Keep the journal: the failed files still match it and are retried on resume.
+        return results
+    classes_txt = label_dir / CLASSES_FILE
+    classes = journal["new_classes"]
+    _write_atomic(classes_txt, ("\n".join(classes) + "\n").encode("utf-8") if classes else b"")
+    (label_dir / JOURNAL_FILE).unlink(missing_ok=True)
+    return results
+
+
+def apply_remap(
+    label_dir,
+    mapping: dict,
+    new_classes,
+    workers: int = DEFAULT_REMAP_WORKERS,
+    progress_callback=None,
+) -> dict:
+    """
+    Rewrite every label file in `label_dir` through `mapping`, then write `new_classes` to `classes.txt`.
+    Raises RuntimeError if an interrupted remap is pending (resume it first).
+    """
+    started = time.perf_counter()
+    label_dir = Path(label_dir)
+    if pending_remap(label_dir) is not None:
+        raise RuntimeError(f"An interrupted class remap is pending in {label_dir}; resume it first")
+
+    # Pass 1 (read-only) finds the files that change, so the journal lists only those.
+    scan = _run_chunks(list_label_files(label_dir), mapping, write=False, workers=workers)
+    errors = [result for result in scan if result[4]]
+    if errors:
+        raise OSError(f"Could not read {len(errors)} label files, e.g. {errors[0][0]}: {errors[0][4]}")
+    expected = {
+        str(Path(name).relative_to(label_dir)): signature
+        for name, signature, moved, deleted, _ in scan if moved or deleted
+    }
+
+    journal = {
+        "mapping": {str(old_id): new_id for old_id, new_id in mapping.items()},
+        "new_classes": list(new_classes),
+        "files": expected,
+        "created": time.time(),
+    }
+    _write_atomic(label_dir / JOURNAL_FILE, json.dumps(journal).encode("utf-8"))
+
+    results = _finish(label_dir, journal, workers, progress_callback)
+    summary = _summary(scan, time.perf_counter() - started)
+    summary["error_count"] = sum(1 for result in results if result[4])
+    summary["errors"] = [(result[0], result[4]) for result in results if result[4]][:20]
+    summary["completed"] = not summary["error_count"]
+    return summary
+
+
+def resume_remap(label_dir, workers: int = DEFAULT_REMAP_WORKERS, progress_callback=None) -> dict:
+    """Finish an interrupted remap from its journal; files already rewritten are skipped."""
+    started = time.perf_counter()
+    label_dir = Path(label_dir)
+    journal = pending_remap(label_dir)
+    if journal is None:
+        raise FileNotFoundError(f"No pending class remap in {label_dir}")
+    results = _finish(label_dir, journal, workers, progress_callback)
+    summary = _summary(results, time.perf_counter() - started)
+    summary["files_skipped"] = len(journal["files"]) - len(results)
+    summary["completed"] = not summary["error_count"]
+    return summary
@@ -7,6 +7,8 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from core import label_store as label_store_utils
+
 
 def metric_safe_label(label: str) -> str:
     """Normalize class labels for metric-column keys."""
@@ -14,26 +16,11 @@ def metric_safe_label(label: str) -> str:
 
 
 def parse_yolo_annotation(txt_path: Path):
-    """Parse YOLO annotation lines into tuples.
+    """Parse YOLO annotation lines into tuples (read through the packed label store).
 
     Output tuple: (class_id, x_center, y_center, width, height)
     """
-    boxes = []
-    if not txt_path.exists():
-        return boxes
-
-    try:
-        with open(txt_path, "r") as file_obj:
-            for line in file_obj:
-                if not line.strip():
-                    continue
-                parts = [float(value) for value in line.strip().split()]
-                if len(parts) >= 5:
-                    boxes.append((int(parts[0]), parts[1], parts[2], parts[3], parts[4]))
-    except Exception:
-        pass
-
-    return boxes
+    return label_store_utils.read_label_tuples(txt_path)
 
 
 def compare_annotations(gt_txt: Path, pred_txt: Path, img_shape, iou_threshold=0.5):
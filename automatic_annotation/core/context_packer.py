@@ -0,0 +1,132 @@
+"""Token-budgeted prompt packing for the Insights chat.
+
+Each Insights prompt used to carry every retrieved document, a raw CSV dump
+of recent runs and the last ten chat turns. Prompt size, and so provider
+latency and cost, grew with the width of `metrics.csv`. The helpers here keep
+prompts inside a fixed token budget:
+- documents are added in rank order until the context budget is spent;
+- CSV tables are compressed to short rows (rounded values, dates only);
+- an oversized document is cut at a sentence boundary;
+- chat history is trimmed newest-first to its own budget.
+
+Tokens are estimated from character counts (about four characters per token
+for English and numbers). This is close enough for budgeting and needs no
+tokenizer package.
+"""
+
+import math
+import re
+
+
+CHARS_PER_TOKEN = 4.0
+# Role and framing tokens added by the chat format for every message.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+CONTEXT_TOKEN_BUDGET = 900
+HISTORY_TOKEN_BUDGET = 700
+
+# Rows kept when a CSV table is compressed.
+TABLE_MAX_ROWS = 6
+# Smallest remainder worth filling with a truncated document.
+MIN_PARTIAL_DOC_TOKENS = 40
+
+_NUMBER_PATTERN = re.compile(r"-?\d+\.\d{4,}")
+_DATETIME_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})[ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of `text`."""
+    return math.ceil(len(str(text or "")) / CHARS_PER_TOKEN)
+
+
+def estimate_message_tokens(messages) -> int:
+    """Rough prompt token count of a chat payload."""
+    return sum(estimate_tokens(message.get("content", "")) + MESSAGE_OVERHEAD_TOKENS for message in messages)
+
+
+def compress_table(text: str, max_rows: int = TABLE_MAX_ROWS) -> str:
+    """Shorten CSV lines in `text`: keep the header and the last `max_rows` rows, round floats, drop times."""
+    lines = str(text).splitlines()
+    table_start = next((i for i, line in enumerate(lines) if line.count(",") >= 2), None)
+    if table_start is None:
+        return text
+    header, rows = lines[table_start], [line for line in lines[table_start + 1:] if line.strip()]
+    compact_rows = []
+    for line in rows[-max_rows:]:
+        line = _DATETIME_PATTERN.sub(r"\1", line)
+        line = _NUMBER_PATTERN.sub(lambda match: f"{float(match.group()):.3f}", line)
+        compact_rows.append(line)
+    dropped = len(rows) - len(compact_rows)
+    note = [f"({dropped} older rows omitted)"] if dropped > 0 else []
+    return "\n".join(lines[:table_start] + [header] + compact_rows + note)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to about `max_tokens`, preferring the last full sentence or line."""
+    limit = int(max_tokens * CHARS_PER_TOKEN)
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    boundary = max(cut.rfind(". "), cut.rfind("\n"))
+    if boundary > limit // 2:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + " …"
+
+
+def pack_documents(docs, budget: int = CONTEXT_TOKEN_BUDGET):
+    """
+    Fit ranked `docs` (dicts with `title` and `text`) into `budget` tokens.
+    Returns (packed docs, context text, stats with `tokens`, `dropped` and `compressed`).
+    """
+    packed = []
+    used = 0
+    stats = {"tokens": 0, "dropped": 0, "compressed": 0}
+    for doc in docs:
+        text = compress_table(doc["text"]) if "table" in doc["title"] else doc["text"]
+        cost = estimate_tokens(f"[{doc['title']}]\n{text}") + 1
+        remaining = budget - used
+        if cost > remaining:
+            if remaining < MIN_PARTIAL_DOC_TOKENS:
+                stats["dropped"] += 1
+                continue
+            text = truncate_to_tokens(text, remaining - estimate_tokens(doc["title"]) - 2)
+            cost = estimate_tokens(f"[{doc['title']}]\n{text}") + 1
+        if text != doc["text"]:
+            stats["compressed"] += 1
+        packed.append({**doc, "text": text})
+        used += cost
+
+    context = "\n\n".join(f"[{doc['title']}]\n{doc['text']}" for doc in packed)
+    stats["tokens"] = estimate_tokens(context)
+    return packed, context, stats
+
+
+def trim_history(chat_history, budget: int = HISTORY_TOKEN_BUDGET, max_messages: int = None) -> list:
+    """
+    Return the newest chat messages that fit in `budget` tokens, oldest first.
+    The latest message is always kept (truncated if it alone exceeds the budget).
+    """
+    messages = [
+        {"role": message.get("role", "user"), "content": str(message.get("content", "")).strip()}
+        for message in chat_history
+        if str(message.get("content", "")).strip()
+    ]
+    if max_messages:
+        messages = messages[-max_messages:]
+    if not messages:
+        return []
+
+    kept = []
+    used = 0
+    for message in reversed(messages):
+        cost = estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+        if used + cost > budget:
+            if not kept:
+                kept.append({**message, "content": truncate_to_tokens(message["content"], budget - MESSAGE_OVERHEAD_TOKENS)})
+            break
+        kept.append(message)
+        used += cost
+    # Don't open the history with an orphaned assistant reply.
+    while len(kept) > 1 and kept[-1]["role"] == "assistant":
+        kept.pop()
+    return list(reversed(kept))
@@ -0,0 +1,441 @@
+"""Build a YOLO train/val dataset from annotated folders.
+
+`annotated_data/<folder>/...` holds frames (`*.jpg`, ...) with a YOLO label
+next to each frame (same stem, `.txt`) and a `classes.txt`. The builder
+produces the layout the trainers expect:
+
+    <output>/images/{train,val}/<folder>__<stem>.jpg
+    <output>/labels/{train,val}/<folder>__<stem>.txt
+    <output>/labels/{train,val}/classes.txt
+    <output>/manifest.json
+
+Files are never decoded or re-encoded. They are materialized as hardlinks
+(default), copy-on-write clones (`reflink`, where the filesystem supports it)
+or plain copies, by a thread pool, since the work is all filesystem calls.
+The default split is a hash of the sample key (or of its group, e.g. the
+video folder) and the seed. The same sample therefore always lands in the same
+split, whatever the walk order or the folders added later. The `stratified`
+split (`core.dataset_split`) balances every class between train and val
+instead. On incremental rebuilds it stratifies the new folders among
+themselves, and samples already built keep their split.
+
+`manifest.json` records which source went to which split, plus a signature of
+every source folder (file names, sizes and mtimes). A rebuild with the same
+settings only processes folders that are new or whose signature changed. Files
+of removed folders, and samples that moved, are deleted from the output.
+
+Note that hardlinked outputs share content with the annotated sources. Edit
+labels in `annotated_data/` and rebuild, rather than editing the dataset copy.
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+import errno
+import hashlib
+import json
+import os
+import shutil
+import re
+import time
+import zlib
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+CLASSES_FILE = "classes.txt"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+SPLITS = ("train", "val")
+GROUP_MODES = ("none", "folder", "prefix")
+DEFAULT_VAL_RATIO = 0.125
+MATERIALIZE_MODES = ("hardlink", "reflink", "copy")
+DEFAULT_BUILD_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Files placed per worker task.
+BUILD_CHUNK = 256
+
+# Linux FICLONE ioctl (copy-on-write clone on btrfs, XFS, ...).
+_FICLONE = 0x40049409
+
+# `clip3_frame12` / `clip-3-000123` -> `clip3` / `clip-3`
+_FRAME_SUFFIX = re.compile(r"[_-]?(frame)?[_-]?\d+$", re.IGNORECASE)
+
+MANIFEST_COLUMNS = ["key", "split", "source_image", "source_label", "image", "label"]
+
+
+class Sample(NamedTuple):
+    """One annotated frame; paths are relative to the source root, `label` is "" when missing."""
+
+    key: str
+    folder: str
+    image: str
+    label: str
+
+
+# ---------------------------
+# Discovery
+# ---------------------------
+
+def list_folders(source_dir: Path) -> list:
+    """Return the annotated folder names (immediate subdirectories) in sorted order."""
+    with os.scandir(source_dir) as entries:
+        return sorted(entry.name for entry in entries if entry.is_dir() and not entry.name.startswith("."))
+
+
+def scan_folder(source_dir: Path, folder: str, extensions=IMAGE_EXTENSIONS):
+    """
+    Walk one annotated folder and return `(signature, samples, classes_file)`.
+    The signature covers every file's relative path, size and mtime, so any edit changes it.
+    """
+    source_dir = Path(source_dir)
+    digest = hashlib.sha1()
+    images, labels = {}, {}
+    classes_file = ""
+    stack = [folder]
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(source_dir / rel_dir) as entries:
+            for entry in sorted(entries, key=lambda item: item.name):
+                rel = f"{rel_dir}/{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(rel)
+                    continue
+                stat = entry.stat()
+                digest.update(f"{rel}|{stat.st_size}|{stat.st_mtime_ns}\n".encode("utf-8"))
+                stem, ext = os.path.splitext(rel)
+                ext = ext.lower()
+                if entry.name == CLASSES_FILE:
+                    if not classes_file or rel.count("/") < classes_file.count("/"):
+                        classes_file = rel
+                elif ext in extensions:
+                    images[stem] = rel
+                elif ext == ".txt":
+                    labels[stem] = rel
+
+    samples = [
+        Sample(key=stem, folder=folder, image=image, label=labels.get(stem, ""))
+        for stem, image in sorted(images.items())
+    ]
+    return digest.hexdigest(), samples, classes_file
+
+
+# ---------------------------
+# Splits
+# ---------------------------
+
+def group_key(key: str, mode: str = "none") -> str:
+    """
+    Return the group a sample key (`folder/sub/frame12`) belongs to; a group always lands in one split.
+    - none: every sample is its own group;
+    - folder: frames in the same directory (one extracted video per folder) share a group;
+    - prefix: frames whose names match apart from a trailing frame number (`clip3_frame12`) share a group.
+    """
+    if mode == "none":
+        return key
+    directory, _, name = str(key).rpartition("/")
+    if mode == "folder":
+        return directory
+    if mode == "prefix":
+        prefix = _FRAME_SUFFIX.sub("", name)
+        # Plain `frame12` names carry no video prefix: the folder is the video.
+        return f"{directory}/{prefix}" if prefix else directory
+    raise ValueError(f"Unknown group mode: {mode} (choose from {', '.join(GROUP_MODES)})")
+
+
+def hash_split(samples, val_ratio: float = DEFAULT_VAL_RATIO, seed: int = 0, group_by: str = "none", **_) -> dict:
+    """Assign each sample to train/val from a hash of its group, independent of order and of the other samples."""
+    threshold = int(float(val_ratio) * 2**32)
+    return {
+        sample.key: "val" if zlib.crc32(f"{seed}:{group_key(sample.key, group_by)}".encode("utf-8")) < threshold else "train"
+        for sample in samples
+    }
+
+
+def _stratified_split(samples, val_ratio: float = DEFAULT_VAL_RATIO, seed: int = 0, group_by: str = "none", source_dir=None, workers=None) -> dict:
+    # Imported here so hash splits don't need NumPy.
+    from core.dataset_split import DEFAULT_READ_WORKERS, stratified_split
+
+    return stratified_split(
+        samples, val_ratio, seed=seed, group_by=group_by, source_dir=source_dir, workers=workers or DEFAULT_READ_WORKERS
+    )
+
+
+SPLIT_METHODS = {
+    "hash": hash_split,
+    "stratified": _stratified_split,
+}
+
+
+def output_name(key: str) -> str:
+    """Flatten a sample key (`folder/sub/frame12`) into a unique output file stem."""
+    return key.replace("/", "__")
+
+
+# ---------------------------
+# Materialization
+# ---------------------------
+
+def _is_up_to_date(src: Path, dst: Path, mode: str) -> bool:
+    try:
+        dst_stat = dst.stat()
+    except FileNotFoundError:
+        return False
+    src_stat = src.stat()
+    same_file = (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino)
+    if mode == "hardlink":
+        return same_file
+    return not same_file and src_stat.st_size == dst_stat.st_size and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+
+
+def _clone(src: Path, tmp: Path) -> None:
+    import fcntl
+
+    with open(src, "rb") as src_file, open(tmp, "wb") as dst_file:
+        fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+    shutil.copystat(src, tmp)
+
+
+def materialize(src: Path, dst: Path, mode: str = "hardlink") -> str:
+    """
+    Place `src` at `dst` as a hardlink, copy-on-write clone or copy.
+    Returns "skipped" (already in place), `mode`, or "copy" when the faster mode isn't available.
+    """
+    if _is_up_to_date(src, dst, mode):
+        return "skipped"
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    tmp.unlink(missing_ok=True)
+    used = mode
+    try:
+        if mode == "hardlink":
+            os.link(src, tmp)
+        elif mode == "reflink":
+            _clone(src, tmp)
+        else:
+            shutil.copy2(src, tmp)
+    except (OSError, ImportError) as exc:
+        # Cross-device links, filesystems without links/clones: fall back to a copy.
+        if mode == "copy" or getattr(exc, "errno", errno.EXDEV) not in (
+            errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL,
+        ):
+            raise
+        tmp.unlink(missing_ok=True)
+        shutil.copy2(src, tmp)
+        used = "copy"
+    os.replace(tmp, dst)
+    return used
+
+
+# ---------------------------
+# Manifest
+# ---------------------------
+
+def load_manifest(output_dir: Path) -> dict:
+    """Return the manifest of a previous build, or an empty one."""
+    path = Path(output_dir) / MANIFEST_NAME
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": MANIFEST_VERSION, "settings": {}, "folders": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "settings": {}, "folders": {}}
+    return manifest
+
+
+def _write_manifest(output_dir: Path, manifest: dict) -> None:
+    path = Path(output_dir) / MANIFEST_NAME
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(manifest, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def manifest_rows(manifest: dict):
+    """Yield one dict per sample (`MANIFEST_COLUMNS`) across all folders."""
+    for folder in manifest.get("folders", {}).values():
+        for row in folder["samples"]:
+            yield dict(zip(MANIFEST_COLUMNS, row))
+
+
+# ---------------------------
+# Build
+# ---------------------------
+
+def _sample_row(sample: Sample, split: str) -> list:
+    name = output_name(sample.key)
+    ext = os.path.splitext(sample.image)[1]
+    image_out = f"images/{split}/{name}{ext}"
+    label_out = f"labels/{split}/{name}.txt" if sample.label else ""
+    return [sample.key, split, sample.image, sample.label, image_out, label_out]
+
+
+def _row_outputs(row: list) -> set:
+    return {path for path in row[4:6] if path}
+
+
+def untracked_outputs(output_dir: Path, tracked=()) -> list:
+    """Files in `images/<split>` and `labels/<split>` that are not in `tracked` (output-relative paths)."""
+    tracked = set(tracked)
+    found = []
+    for kind in ("images", "labels"):
+        for name in SPLITS:
+            try:
+                entries = list(os.scandir(Path(output_dir) / kind / name))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                rel = f"{kind}/{name}/{entry.name}"
+                if entry.is_file() and entry.name != CLASSES_FILE and not entry.name.startswith(".") and rel not in tracked:
+                    found.append(rel)
+    return sorted(found)
+
+
+def build_dataset(
+    source_dir,
+    output_dir,
+    val_ratio: float = DEFAULT_VAL_RATIO,
+    seed: int = 0,
+    split: str = "hash",
+    group_by: str = "none",
+    mode: str = "hardlink",
+    workers: int = None,
+    incremental: bool = True,
+    prune_untracked: bool = False,
+    progress_callback=None,
+) -> dict:
+    """
+    Build (or update) the dataset in `output_dir` from the annotated folders in `source_dir`.
+    - split: a `SPLIT_METHODS` name; group_by: a `GROUP_MODES` name (`folder` keeps each video's frames together).
+    - mode: one of `MATERIALIZE_MODES`.
+    - incremental: reuse the manifest and only process new or changed folders.
+    - prune_untracked: delete files in the split folders that no build placed (e.g. an old-style
+      `N.jpg`/`N.txt` dataset); without it they are only counted, and a first build refuses to mix with them.
+    - progress_callback(done, total, message) is called as files are placed.
+    Returns build statistics.
+    """
+    started = time.perf_counter()
+    source_dir = Path(source_dir).resolve()
+    output_dir = Path(output_dir).resolve()
+    if not source_dir.is_dir():
+        raise FileNotFoundError(f"Annotated data folder not found: {source_dir}")
+    if split not in SPLIT_METHODS:
+        raise ValueError(f"Unknown split method: {split} (choose from {', '.join(SPLIT_METHODS)})")
+    if group_by not in GROUP_MODES:
+        raise ValueError(f"Unknown group mode: {group_by} (choose from {', '.join(GROUP_MODES)})")
+    if mode not in MATERIALIZE_MODES:
+        raise ValueError(f"Unknown mode: {mode} (choose from {', '.join(MATERIALIZE_MODES)})")
+    if not 0.0 <= float(val_ratio) < 1.0:
+        raise ValueError(f"val_ratio must be in [0, 1), got {val_ratio}")
+    workers = max(1, int(workers or DEFAULT_BUILD_WORKERS))
+
+    if not (output_dir / MANIFEST_NAME).exists() and not prune_untracked:
+        foreign = untracked_outputs(output_dir)
+        if foreign:
+            raise ValueError(
+                f"{output_dir} already holds {len(foreign)} files not placed by this builder (e.g. {foreign[0]}); "
+                "they would be trained on next to the new samples. Use another output folder or prune them (--prune-untracked)."
+            )
+
+    for kind in ("images", "labels"):
+        for name in SPLITS:
+            (output_dir / kind / name).mkdir(parents=True, exist_ok=True)
+
+    settings = {"val_ratio": float(val_ratio), "seed": int(seed), "split": split, "group_by": group_by, "mode": mode}
+    previous = load_manifest(output_dir)
+    if not incremental or previous["settings"] != settings:
+        previous = {"version": MANIFEST_VERSION, "settings": settings, "folders": previous["folders"], "stale": True}
+
+    folders = list_folders(source_dir)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        scans = dict(zip(folders, pool.map(lambda folder: scan_folder(source_dir, folder), folders)))
+
+    # Folders to (re)build: new, changed, or everything when the settings changed.
+    old_folders = previous["folders"]
+    changed = [
+        folder for folder in folders
+        if previous.get("stale") or old_folders.get(folder, {}).get("signature") != scans[folder][0]
+    ]
+    removed_folders = [folder for folder in old_folders if folder not in scans]
+
+    new_samples = [sample for folder in changed for sample in scans[folder][1]]
+    assignments = SPLIT_METHODS[split](
+        new_samples, val_ratio=val_ratio, seed=seed, group_by=group_by, source_dir=source_dir, workers=workers
+    )
+
+    folders_out = {folder: old_folders[folder] for folder in folders if folder not in changed}
+    tasks = []
+    stale_outputs = set()
+    for folder in changed:
+        signature, samples, _ = scans[folder]
+        rows = [_sample_row(sample, assignments[sample.key]) for sample in samples]
+        folders_out[folder] = {"signature": signature, "samples": rows}
+        new_outputs = set()
+        for row in rows:
+            tasks.append((source_dir / row[2], output_dir / row[4]))
+            if row[3]:
+                tasks.append((source_dir / row[3], output_dir / row[5]))
+            new_outputs |= _row_outputs(row)
+        for row in old_folders.get(folder, {}).get("samples", []):
+            stale_outputs |= _row_outputs(row) - new_outputs
+    for folder in removed_folders:
+        for row in old_folders[folder]["samples"]:
+            stale_outputs |= _row_outputs(row)
+
+    def place_chunk(chunk):
+        return Counter(materialize(src, dst, mode) for src, dst in chunk)
+
+    outcomes = Counter()
+    done = 0
+    chunks = [tasks[start:start + BUILD_CHUNK] for start in range(0, len(tasks), BUILD_CHUNK)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for chunk, chunk_outcomes in zip(chunks, pool.map(place_chunk, chunks)):
+            outcomes.update(chunk_outcomes)
+            done += len(chunk)
+            if progress_callback is not None:
+                progress_callback(done, len(tasks), f"{done}/{len(tasks)} files")
+
+    removed = 0
+    for rel in stale_outputs:
+        try:
+            (output_dir / rel).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    tracked = {rel for folder in folders_out.values() for row in folder["samples"] for rel in _row_outputs(row)}
+    untracked = untracked_outputs(output_dir, tracked)
+    if prune_untracked:
+        for rel in untracked:
+            try:
+                (output_dir / rel).unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        untracked = []
+
+    # classes.txt from the first folder that has one, next to both label splits.
+    classes_file = next((scans[folder][2] for folder in folders if scans[folder][2]), "")
+    if classes_file:
+        for name in SPLITS:
+            shutil.copyfile(source_dir / classes_file, output_dir / "labels" / name / CLASSES_FILE)
+
+    manifest = {"version": MANIFEST_VERSION, "settings": settings, "source": str(source_dir), "folders": folders_out}
+    _write_manifest(output_dir, manifest)
+
+    split_counts = Counter(row[1] for folder in folders_out.values() for row in folder["samples"])
+    seconds = time.perf_counter() - started
+    return {
+        "output_dir": str(output_dir),
+        "folders": len(folders),
+        "folders_rebuilt": len(changed),
+        "folders_removed": len(removed_folders),
+        "samples": sum(split_counts.values()),
+        "train": split_counts.get("train", 0),
+        "val": split_counts.get("val", 0),
+        "files_placed": sum(count for outcome, count in outcomes.items() if outcome != "skipped"),
+        "files_unchanged": outcomes.get("skipped", 0),
+        "copy_fallbacks": outcomes.get("copy", 0) if mode != "copy" else 0,
+        "files_removed": removed,
+        "untracked_files": len(untracked),
+        "workers": workers,
+        "seconds": round(seconds, 3),
+    }
@@ -0,0 +1,201 @@
+"""Class-balanced train/val splits from YOLO label statistics.
+
+A hash split ignores class distribution, so a rare class can end up entirely
+in train or entirely in val. This module splits by the labels instead:
+
+1) every label file is read once, by a thread pool, into a compact
+   images x classes count matrix (`read_label_counts`);
+2) images can be grouped, e.g. all frames of one video, so that near-identical
+   frames never sit on both sides of the split (`group_ids`);
+3) iterative stratification (Sechidis et al., 2011) assigns groups one at a
+   time. The rarest class still to place goes first. Each group goes to the
+   split that still needs most of that class, so every class approaches the
+   target ratio, including images with several classes.
+
+The loop is per group and each step is a small NumPy update, so hundreds of
+thousands of label files split in seconds. Reading the files dominates.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import os
+import random
+
+import numpy as np
+
+from core.dataset_builder import GROUP_MODES, group_key
+
+
+DEFAULT_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Label files parsed per worker task.
+READ_CHUNK = 512
+
+
+# ---------------------------
+# Label statistics
+# ---------------------------
+
+def _parse_chunk(paths) -> tuple:
+    """Return (row offsets, class ids) for a chunk of label files; bad lines and missing files are skipped."""
+    rows, ids = [], []
+    for row, path in paths:
+        if not path:
+            continue
+        try:
+            with open(path, "rb") as label_file:
+                data = label_file.read()
+        except OSError:
+            continue
+        for line in data.splitlines():
+            head = line.split(None, 1)
+            if not head:
+                continue
+            try:
+                class_id = int(float(head[0]))
+            except ValueError:
+                continue
+            if class_id >= 0:
+                rows.append(row)
+                ids.append(class_id)
+    return rows, ids
+
+
+def read_label_counts(label_paths, num_classes: int = None, workers: int = DEFAULT_READ_WORKERS) -> np.ndarray:
+    """
+    Read YOLO label files into an (images, classes) int32 matrix of box counts.
+    Empty paths (images without labels) give all-zero rows. `num_classes` defaults to the largest id + 1.
+    """
+    indexed = list(enumerate(str(path) if path else "" for path in label_paths))
+    chunks = [indexed[start:start + READ_CHUNK] for start in range(0, len(indexed), READ_CHUNK)]
+    rows, ids = [], []
+    with ThreadPoolExecutor(max_workers=max(1, int(workers))) as pool:
+        for chunk_rows, chunk_ids in pool.map(_parse_chunk, chunks):
+            rows.extend(chunk_rows)
+            ids.extend(chunk_ids)
+
+    rows = np.asarray(rows, dtype=np.int64)
+    ids = np.asarray(ids, dtype=np.int64)
+    if num_classes is None:
+        num_classes = int(ids.max()) + 1 if ids.size else 0
+    keep = ids < num_classes
+    counts = np.zeros((len(indexed), num_classes), dtype=np.int32)
+    np.add.at(counts, (rows[keep], ids[keep]), 1)
+    return counts
+
+
+def group_ids(keys, mode: str = "folder") -> np.ndarray:
+    """Map sample keys to integer group ids (see `dataset_builder.group_key` for the modes)."""
+    if mode not in GROUP_MODES:
+        raise ValueError(f"Unknown group mode: {mode} (choose from {', '.join(GROUP_MODES)})")
+    if mode == "none":
+        return np.arange(len(keys), dtype=np.int64)
+    names = {}
+    out = np.empty(len(keys), dtype=np.int64)
+    for i, key in enumerate(keys):
+        out[i] = names.setdefault(group_key(key, mode), len(names))
+    return out
+
+
+# ---------------------------
+# Iterative stratification
+# ---------------------------
+
+def iterative_stratification(counts: np.ndarray, ratios, sizes: np.ndarray = None, seed: int = 0) -> np.ndarray:
+    """
+    Assign each row of `counts` (units x classes) to a split index so every class approaches `ratios`.
+    - sizes: images per unit (for groups), used to balance the overall split size and for unlabeled units.
+    Returns an int array of split indices.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    ratios = np.asarray(ratios, dtype=np.float64)
+    ratios = ratios / ratios.sum()
+    units, num_classes = counts.shape
+    sizes = np.ones(units) if sizes is None else np.asarray(sizes, dtype=np.float64)
+    rng = random.Random(seed)
+
+    desired = np.outer(ratios, counts.sum(axis=0))
+    desired_size = ratios * sizes.sum()
+    assignment = np.full(units, -1, dtype=np.int64)
+    remaining = counts.sum(axis=0)
+    has_class = counts > 0
+    # Random but reproducible order within each class's pool.
+    order = list(range(units))
+    rng.shuffle(order)
+    position = np.empty(units, dtype=np.int64)
+    position[order] = np.arange(units)
+
+    while True:
+        open_classes = np.flatnonzero(remaining > 0)
+        if not open_classes.size:
+            break
+        # The class with the fewest boxes left to place is the hardest to balance.
+        label = open_classes[np.argmin(remaining[open_classes])]
+        pool = np.flatnonzero(has_class[:, label] & (assignment < 0))
+        for unit in pool[np.argsort(position[pool])]:
+            need = desired[:, label]
+            candidates = np.flatnonzero(need == need.max())
+            if len(candidates) > 1:
+                by_size = desired_size[candidates]
+                candidates = candidates[by_size == by_size.max()]
+            split = int(candidates[0] if len(candidates) == 1 else rng.choice(list(candidates)))
+            assignment[unit] = split
+            desired[split] -= counts[unit]
+            desired_size[split] -= sizes[unit]
+            remaining -= counts[unit]
+
+    # Units without labels only balance the overall split sizes.
+    for unit in sorted(np.flatnonzero(assignment < 0), key=lambda item: position[item]):
+        split = int(np.argmax(desired_size))
+        assignment[unit] = split
+        desired_size[split] -= sizes[unit]
+    return assignment
+
+
+def stratified_assignment(counts: np.ndarray, val_ratio: float, groups: np.ndarray = None, seed: int = 0) -> np.ndarray:
+    """Return a boolean val mask over images, stratified by class and kept whole per group."""
+    if groups is None:
+        groups = np.arange(len(counts), dtype=np.int64)
+    num_groups = int(groups.max()) + 1 if len(groups) else 0
+    group_counts = np.zeros((num_groups, counts.shape[1]), dtype=np.int64)
+    np.add.at(group_counts, groups, counts)
+    group_sizes = np.bincount(groups, minlength=num_groups)
+    split = iterative_stratification(group_counts, [1.0 - val_ratio, val_ratio], sizes=group_sizes, seed=seed)
+    return split[groups] == 1
+
+
+def split_report(counts: np.ndarray, val_mask: np.ndarray) -> dict:
+    """Per-class val share and the overall share, for checking a split."""
+    totals = counts.sum(axis=0)
+    val = counts[val_mask].sum(axis=0)
+    per_class = np.divide(val, totals, out=np.zeros(len(totals)), where=totals > 0)
+    return {
+        "images": int(len(counts)),
+        "val_images": int(val_mask.sum()),
+        "val_share": float(val_mask.mean()) if len(val_mask) else 0.0,
+        "class_boxes": totals.tolist(),
+        "class_val_share": per_class.round(4).tolist(),
+        "classes_missing_from_val": [int(c) for c in np.flatnonzero((totals > 0) & (val == 0))],
+        "classes_missing_from_train": [int(c) for c in np.flatnonzero((totals > 0) & (val == totals))],
+    }
+
+
+def stratified_split(
+    samples,
+    val_ratio: float,
+    seed: int = 0,
+    group_by: str = "folder",
+    source_dir=None,
+    workers: int = DEFAULT_READ_WORKERS,
+) -> dict:
+    """
+    Split `dataset_builder.Sample`s into train/val, balancing every class and keeping groups whole.
+    Label paths are resolved against `source_dir`. Returns `{key: "train" | "val"}`.
+    """
+    samples = list(samples)
+    if not samples:
+        return {}
+    root = Path(source_dir) if source_dir is not None else Path(".")
+    counts = read_label_counts([root / sample.label if sample.label else "" for sample in samples], workers=workers)
+    groups = group_ids([sample.key for sample in samples], group_by)
+    val_mask = stratified_assignment(counts, val_ratio, groups=groups, seed=seed)
+    return {sample.key: "val" if is_val else "train" for sample, is_val in zip(samples, val_mask)}
@@ -0,0 +1,317 @@
+"""Statistics over a folder of YOLO label files.
+
+Label files are discovered through the directory index (`core.file_index`),
+so any naming scheme works, not only `frame<N>.txt`. They are parsed in
+parallel chunks into flat NumPy arrays (file row, class id, x, y, w, h).
+The report covers:
+- class counts (boxes and images per class);
+- box size and aspect-ratio histograms (in normalized image units);
+- boxes per image, empty label files and images without a label file;
+- malformed lines, out-of-range coordinates and class ids missing from `classes.txt`.
+
+Results are cached in memory and in SQLite per label folder. A signature of
+the path, size and mtime of every label file and image decides whether the
+cached report is still valid, so an unchanged folder reports instantly.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from core import file_index as file_index_utils
+from core.cache_paths import cache_subdir
+
+
+LABEL_EXTENSIONS = (".txt",)
+CLASSES_FILE = "classes.txt"
+
+DEFAULT_STATS_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+# Label files per parse task; folders smaller than PARALLEL_MIN_FILES are parsed in-process.
+STATS_CHUNK = 2000
+PARALLEL_MIN_FILES = 4000
+
+# Histogram edges: box size is sqrt(w * h), aspect is log2(w / h), both in normalized units.
+SIZE_BIN_EDGES = (0.0, 0.01, 0.02, 0.04, 0.08, 0.16, 0.32, 0.64, np.inf)
+ASPECT_BIN_EDGES = (-np.inf, -2.0, -1.0, -0.5, 0.5, 1.0, 2.0, np.inf)
+ASPECT_BIN_LABELS = ("< 1:4", "1:4-1:2", "1:2-1:1.4", "~1:1", "1.4:1-2:1", "2:1-4:1", "> 4:1")
+MAX_BOXES_BIN = 20
+
+# Example files listed per problem type.
+MAX_EXAMPLE_FILES = 20
+# Coordinates may overshoot [0, 1] by rounding this much before they count as out of range.
+RANGE_TOLERANCE = 1e-3
+
+DEFAULT_STATS_DB = cache_subdir("dataset_stats") / "stats.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats (
+    label_dir TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    result TEXT NOT NULL
+);
+"""
+
+_STATS: dict = {}
+_STATS_LOCK = threading.Lock()
+
+
+# ---------------------------
+# Parsing
+# ---------------------------
+
+def parse_label_chunk(chunk) -> dict:
+    """
+    Parse `(row, path)` pairs into flat arrays.
+    Lines need 5 values (`class x y w h`), or 6 with a trailing confidence; anything else is malformed.
+    """
+    rows, tokens, malformed_rows = [], [], []
+    for row, path in chunk:
+        try:
+            with open(path, "rb") as label_file:
+                lines = label_file.read().splitlines()
+        except OSError:
+            malformed_rows.append(row)
+            continue
+        bad = False
+        for line in lines:
+            parts = line.split()
+            if not parts:
+                continue
+            if len(parts) not in (5, 6):
+                bad = True
+                continue
+            rows.append(row)
+            tokens.extend(parts[:5])
+        if bad:
+            malformed_rows.append(row)
+
+    try:
+        values = np.asarray(tokens, dtype=np.bytes_).astype(np.float64).reshape(-1, 5)
+    except ValueError:
+        # Rare non-numeric tokens: fall back to converting line by line.
+        keep_rows, parsed = [], []
+        for i, row in enumerate(rows):
+            try:
+                parsed.append([float(token) for token in tokens[i * 5:i * 5 + 5]])
+                keep_rows.append(row)
+            except ValueError:
+                malformed_rows.append(row)
+        rows = keep_rows
+        values = np.asarray(parsed, dtype=np.float64).reshape(-1, 5)
+
+    return {
+        "rows": np.asarray(rows, dtype=np.int64),
+        "classes": values[:, 0].astype(np.int64),
+        "boxes": values[:, 1:].astype(np.float32),
+        "malformed_rows": sorted(set(malformed_rows)),
+    }
+
+
+def parse_labels(paths, workers: int = DEFAULT_STATS_WORKERS) -> dict:
+    """Parse every label file in `paths` (in parallel for large folders) and concatenate the arrays."""
+    indexed = [(row, str(path)) for row, path in enumerate(paths)]
+    chunks = [indexed[start:start + STATS_CHUNK] for start in range(0, len(indexed), STATS_CHUNK)]
+    if len(indexed) >= PARALLEL_MIN_FILES and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(parse_label_chunk, chunks))
+    else:
+        parts = [parse_label_chunk(chunk) for chunk in chunks]
+
+    if not parts:
+        return {
+            "rows": np.zeros(0, dtype=np.int64),
+            "classes": np.zeros(0, dtype=np.int64),
+            "boxes": np.zeros((0, 4), dtype=np.float32),
+            "malformed_rows": [],
+        }
+    return {
+        "rows": np.concatenate([part["rows"] for part in parts]),
+        "classes": np.concatenate([part["classes"] for part in parts]),
+        "boxes": np.concatenate([part["boxes"] for part in parts]),
+        "malformed_rows": [row for part in parts for row in part["malformed_rows"]],
+    }
+
+
+# ---------------------------
+# Statistics
+# ---------------------------
+
+def _histogram(values: np.ndarray, edges, labels) -> dict:
+    counts, _ = np.histogram(values, bins=np.asarray(edges, dtype=np.float64))
+    return {"labels": list(labels), "counts": counts.astype(int).tolist()}
+
+
+def _size_labels():
+    edges = SIZE_BIN_EDGES
+    return [f"{edges[i]:.2f}-{edges[i + 1]:.2f}" for i in range(len(edges) - 2)] + [f">= {edges[-2]:.2f}"]
+
+
+def summarize(parsed: dict, files: list, class_names=None) -> dict:
+    """Turn parsed label arrays into the report dict (JSON-serializable)."""
+    rows, classes, boxes = parsed["rows"], parsed["classes"], parsed["boxes"]
+    file_count = len(files)
+    per_file = np.bincount(rows, minlength=file_count) if file_count else np.zeros(0, dtype=np.int64)
+
+    class_ids, class_boxes = np.unique(classes, return_counts=True)
+    # Unique (file, class) pairs give the number of images each class appears in.
+    pairs = np.unique(np.stack([rows, classes], axis=1), axis=0) if classes.size else np.zeros((0, 2), dtype=np.int64)
+    image_classes, images_per_class = np.unique(pairs[:, 1], return_counts=True)
+    malformed = set(parsed["malformed_rows"])
+
+    x, y, w, h = (boxes[:, i].astype(np.float64) for i in range(4))
+    low, high = -RANGE_TOLERANCE, 1.0 + RANGE_TOLERANCE
+    out_of_range = (
+        (w <= 0) | (h <= 0)
+        | (x < low) | (x > high) | (y < low) | (y > high)
+        | (x - w / 2 < low) | (x + w / 2 > high) | (y - h / 2 < low) | (y + h / 2 > high)
+    )
+    unknown_class = (classes < 0) | (classes >= len(class_names)) if class_names else np.zeros(len(classes), dtype=bool)
+    valid = (w > 0) & (h > 0)
+
+    boxes_per_image = np.bincount(np.minimum(per_file, MAX_BOXES_BIN), minlength=MAX_BOXES_BIN + 1)
+
+    def examples(selected_rows) -> list:
+        return [str(files[row]) for row in sorted(set(int(row) for row in selected_rows))[:MAX_EXAMPLE_FILES]]
+
+    return {
+        "files": file_count,
+        "boxes": int(len(classes)),
+        "empty_label_files": sum(1 for row in np.flatnonzero(per_file == 0) if int(row) not in malformed),
+        "class_names": list(class_names or []),
+        "class_counts": {int(c): int(n) for c, n in zip(class_ids, class_boxes)},
+        "images_per_class": {int(c): int(n) for c, n in zip(image_classes, images_per_class)},
+        "boxes_per_image": {
+            (f"{i}+" if i == MAX_BOXES_BIN else str(i)): int(n) for i, n in enumerate(boxes_per_image)
+        },
+        "mean_boxes_per_image": float(per_file.mean()) if file_count else 0.0,
+        "box_size_hist": _histogram(np.sqrt(np.clip(w * h, 0, None))[valid], SIZE_BIN_EDGES, _size_labels()),
+        "aspect_hist": _histogram(np.log2(w[valid] / h[valid]), ASPECT_BIN_EDGES, ASPECT_BIN_LABELS),
+        "out_of_range_boxes": int(out_of_range.sum()),
+        "out_of_range_files": examples(rows[out_of_range]),
+        "unknown_class_boxes": int(unknown_class.sum()),
+        "unknown_class_files": examples(rows[unknown_class]),
+        "malformed_files_count": len(malformed),
+        "malformed_files": examples(malformed),
+    }
+
+
+# ---------------------------
+# Discovery, signature and cache
+# ---------------------------
+
+def list_label_files(label_dir: Path) -> list:
+    """Return the label files under `label_dir` from the directory index (without `classes.txt`)."""
+    return [path for path in file_index_utils.list_indexed(label_dir, LABEL_EXTENSIONS) if path.name != CLASSES_FILE]
+
+
+def directory_signature(label_dir: Path, files, images=()) -> str:
+    """Hash the relative path, size and mtime of every label file and image (stat calls run in threads)."""
+    label_dir = Path(label_dir)
+
+    def stat_line(path):
+        try:
+            stat = path.stat()
+        except OSError:
+            return f"{path}|missing"
+        return f"{path.relative_to(label_dir)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+    digest = hashlib.sha1()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        for line in pool.map(stat_line, files, chunksize=256):
+            digest.update(line.encode("utf-8") + b"\n")
+        digest.update(b"--images--\n")
+        for line in pool.map(stat_line, images, chunksize=256):
+            digest.update(line.encode("utf-8") + b"\n")
+    classes_txt = label_dir / CLASSES_FILE
+    if classes_txt.exists():
+        digest.update(classes_txt.read_bytes())
+    return digest.hexdigest()
+
+
+def _load_cached(db_path: Path, label_dir: str):
+    try:
+        with sqlite3.connect(str(db_path), timeout=5) as conn:
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT signature, result FROM stats WHERE label_dir = ?", (label_dir,)).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    result = json.loads(row[1])
+    # JSON turns the integer class ids into strings.
+    for field in ("class_counts", "images_per_class"):
+        result[field] = {int(class_id): count for class_id, count in result[field].items()}
+    return {**result, "signature": row[0]}
+
+
+def _store(db_path: Path, label_dir: str, result: dict) -> None:
+    try:
+        with sqlite3.connect(str(db_path), timeout=5) as conn:
+            conn.executescript(_SCHEMA)
+            conn.execute(
+                "INSERT OR REPLACE INTO stats (label_dir, signature, result) VALUES (?, ?, ?)",
+                (label_dir, result["signature"], json.dumps(result)),
+            )
+    except sqlite3.Error:
+        pass
+
+
+def compute_dataset_stats(label_dir, workers: int = DEFAULT_STATS_WORKERS, files=None, images=None) -> dict:
+    """Compute the report for `label_dir` without touching the cache."""
+    started = time.perf_counter()
+    label_dir = Path(label_dir).resolve()
+    files = list_label_files(label_dir) if files is None else list(files)
+    class_names = []
+    classes_txt = label_dir / CLASSES_FILE
+    if classes_txt.exists():
+        class_names = [line.strip() for line in classes_txt.read_text(encoding="utf-8", errors="ignore").splitlines() if line.strip()]
+
+    result = summarize(parse_labels(files, workers=workers), files, class_names)
+
+    label_stems = {path.with_suffix("") for path in files}
+    images = file_index_utils.list_indexed(label_dir) if images is None else images
+    result.update({
+        "label_dir": str(label_dir),
+        "images": len(images),
+        "images_without_labels": sum(1 for path in images if path.with_suffix("") not in label_stems),
+        "seconds": round(time.perf_counter() - started, 3),
+    })
+    return result
+
+
+def get_dataset_stats(label_dir, workers: int = DEFAULT_STATS_WORKERS, refresh: bool = False, db_path: Path = DEFAULT_STATS_DB) -> dict:
+    """
+    Return the report for `label_dir`, recomputed only when its signature changed (or `refresh`).
+    The result carries `cached` (True when nothing was re-parsed) and the `signature`.
+    """
+    label_dir = Path(label_dir).resolve()
+    if not label_dir.is_dir():
+        raise FileNotFoundError(f"Label folder not found: {label_dir}")
+    files = list_label_files(label_dir)
+    images = file_index_utils.list_indexed(label_dir)
+    signature = directory_signature(label_dir, files, images)
+    key = str(label_dir)
+
+    if not refresh:
+        with _STATS_LOCK:
+            cached = _STATS.get(key)
+        if cached is None:
+            cached = _load_cached(Path(db_path), key)
+        if cached is not None and cached["signature"] == signature:
+            with _STATS_LOCK:
+                _STATS[key] = cached
+            return {**cached, "cached": True}
+
+    result = compute_dataset_stats(label_dir, workers=workers, files=files, images=images)
+    result["signature"] = signature
+    with _STATS_LOCK:
+        _STATS[key] = result
+    _store(Path(db_path), key, result)
+    return {**result, "cached": False}
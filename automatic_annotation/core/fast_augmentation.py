@@ -0,0 +1,212 @@
+"""Single-pass augmentation kernels for the frame augmenter.
+
+The reference transforms in `data_augmentation` convert each frame to
+float32 and back, build full-size noise arrays and rebuild the motion-blur
+kernel on every call. The versions here produce the same kind of variants
+with one pass over the pixels and one output allocation:
+
+- brightness/contrast, gamma, fog and HSV shifts are 256-entry uint8 lookup
+  tables applied with `cv2.LUT`, so the arithmetic runs on 256 values
+  instead of every pixel;
+- motion-blur kernels are built once per size and (rounded) angle;
+- Gaussian noise comes from a per-resolution noise bank read at a random
+  row offset, so no random numbers are drawn per pixel.
+
+Random parameters are drawn in the same order as the reference builders.
+For the same seed, brightness/contrast, Gaussian blur, fog, colour shift
+and rotation are bit-identical to the reference. Motion blur (rounded
+angle) and the noise variants are visually equivalent but not identical.
+
+`FAST_AUGMENTATIONS` mirrors `data_augmentation.AUGMENTATIONS` and is used
+when augmenting with `engine="fast"`.
+"""
+
+from functools import lru_cache
+import random
+
+import cv2
+import numpy as np
+
+from data_augmentation import random_rotate_with_matrix
+
+
+# Extra noise rows beyond the image height; each row offset is a different noise pattern.
+NOISE_BANK_EXTRA_ROWS = 64
+NOISE_BANK_SEED = 1234
+NOISE_BANK_CACHE_SIZE = 3
+
+# Motion-blur angles are rounded to this step (degrees) so kernels can be reused.
+MOTION_ANGLE_STEP_DEG = 1.0
+
+
+# ---------------------------
+# Lookup tables
+# ---------------------------
+
+_LEVELS = np.arange(256, dtype=np.float32)
+
+
+@lru_cache(maxsize=512)
+def brightness_contrast_lut(contrast: float, brightness: float) -> np.ndarray:
+    """Return the uint8 table for `clip(x * contrast + brightness)` (truncating, as the reference does)."""
+    return np.clip(_LEVELS * np.float32(contrast) + np.float32(brightness), 0, 255).astype(np.uint8)
+
+
+@lru_cache(maxsize=64)
+def gamma_lut(gamma: float) -> np.ndarray:
+    """Return the uint8 table for `255 * (x / 255) ** (1 / gamma)`."""
+    return np.clip(np.round(255.0 * (_LEVELS / 255.0) ** (1.0 / float(gamma))), 0, 255).astype(np.uint8)
+
+
+@lru_cache(maxsize=64)
+def fog_lut(intensity: float) -> np.ndarray:
+    """Return the uint8 table for blending towards white with weight `intensity`."""
+    levels = np.arange(256, dtype=np.uint8).reshape(1, 256)
+    white = np.full_like(levels, 255)
+    return cv2.addWeighted(levels, 1.0 - intensity, white, intensity, 0).reshape(256)
+
+
+@lru_cache(maxsize=512)
+def hsv_lut(hue_shift: int, sat_scale: float, val_scale: float) -> np.ndarray:
+    """Return a (256, 1, 3) table shifting hue and scaling saturation/value of an HSV image."""
+    hue = (_LEVELS + hue_shift) % 180
+    sat = np.clip(_LEVELS * sat_scale, 0, 255)
+    val = np.clip(_LEVELS * val_scale, 0, 255)
+    return np.stack([hue, sat, val], axis=1).astype(np.uint8).reshape(256, 1, 3)
+
+
+# ---------------------------
+# Cached kernels and noise
+# ---------------------------
+
+@lru_cache(maxsize=128)
+def motion_blur_kernel(ksize: int, angle_deg: float) -> np.ndarray:
+    """Return the normalized line kernel used by `motion_blur`, rotated by `angle_deg`."""
+    kernel = np.zeros((ksize, ksize), dtype=np.float32)
+    kernel[ksize // 2, :] = 1.0
+    kernel /= kernel.sum()
+    M = cv2.getRotationMatrix2D((ksize / 2, ksize / 2), angle_deg, 1.0)
+    kernel = cv2.warpAffine(kernel, M, (ksize, ksize))
+    return kernel / (kernel.sum() + 1e-8)
+
+
+@lru_cache(maxsize=NOISE_BANK_CACHE_SIZE)
+def noise_bank(height: int, width: int, channels: int, sigma: float) -> np.ndarray:
+    """Return `128 + N(0, sigma)` uint8 noise with `NOISE_BANK_EXTRA_ROWS` spare rows."""
+    rng = np.random.default_rng(NOISE_BANK_SEED + int(sigma * 10))
+    noise = rng.normal(128.0, sigma, (height + NOISE_BANK_EXTRA_ROWS, width, channels))
+    return np.clip(noise, 0, 255).astype(np.uint8)
+
+
+# ---------------------------
+# Transforms
+# ---------------------------
+
+def brightness_contrast(img: np.ndarray, contrast: float, brightness: float) -> np.ndarray:
+    return cv2.LUT(img, brightness_contrast_lut(float(contrast), float(brightness)))
+
+
+def adjust_gamma(img: np.ndarray, gamma: float) -> np.ndarray:
+    return cv2.LUT(img, gamma_lut(round(float(gamma), 2)))
+
+
+def add_gaussian_noise(img: np.ndarray, sigma: float = 15.0) -> np.ndarray:
+    """Add zero-mean noise from the cached bank in one saturating pass."""
+    if sigma <= 0:
+        return img
+    h, w = img.shape[:2]
+    channels = img.shape[2] if img.ndim == 3 else 1
+    bank = noise_bank(h, w, channels, float(sigma))
+    offset = np.random.randint(0, NOISE_BANK_EXTRA_ROWS + 1)
+    noise = bank[offset:offset + h].reshape(img.shape)
+    # img + (noise - 128), computed and saturated by OpenCV without temporaries.
+    return cv2.addWeighted(img, 1.0, noise, 1.0, -128.0)
+
+
+def add_salt_pepper_noise(img: np.ndarray, amount: float = 0.01, salt_vs_pepper: float = 0.5) -> np.ndarray:
+    if amount <= 0:
+        return img
+    out = img.copy()
+    h, w = img.shape[:2]
+    num_salt = int(h * w * amount * salt_vs_pepper)
+    num_pepper = int(h * w * amount * (1.0 - salt_vs_pepper))
+    # One draw of flat pixel indices for both salt and pepper.
+    flat = np.random.randint(0, h * w, num_salt + num_pepper)
+    pixels = out.reshape(h * w, -1)
+    pixels[flat[:num_salt]] = 255
+    pixels[flat[num_salt:]] = 0
+    return out
+
+
+def motion_blur(img: np.ndarray, ksize: int = 7, angle_deg: float = None) -> np.ndarray:
+    ksize = max(3, int(ksize) // 2 * 2 + 1)  # make odd
+    if angle_deg is None:
+        angle_deg = random.uniform(-20, 20)
+    angle = round(angle_deg / MOTION_ANGLE_STEP_DEG) * MOTION_ANGLE_STEP_DEG
+    return cv2.filter2D(img, -1, motion_blur_kernel(ksize, angle))
+
+
+def gaussian_blur(img: np.ndarray, ksize: int = 5) -> np.ndarray:
+    # OpenCV already keeps fixed-point Gaussian kernels for small uint8 sizes.
+    return cv2.GaussianBlur(img, (int(ksize), int(ksize)), 0)
+
+
+def add_fog(img: np.ndarray, intensity: float = 0.15) -> np.ndarray:
+    intensity = max(0.0, min(0.5, float(intensity)))
+    return gaussian_blur(cv2.LUT(img, fog_lut(intensity)), 5)
+
+
+def hsv_color_shift(img: np.ndarray, hue_shift: int = 0, sat_scale: float = 1.0, val_scale: float = 1.0) -> np.ndarray:
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    cv2.LUT(hsv, hsv_lut(int(hue_shift), float(sat_scale), float(val_scale)), dst=hsv)
+    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+
+
+# ---------------------------
+# Variant builders (same random draws as data_augmentation)
+# ---------------------------
+
+def _gaussian_noise_variant(img):
+    return add_gaussian_noise(img, sigma=random.choice([10, 15, 25])), None
+
+
+def _salt_pepper_variant(img):
+    return add_salt_pepper_noise(img, amount=random.choice([0.005, 0.01, 0.02])), None
+
+
+def _rotate_variant(img):
+    return random_rotate_with_matrix(img, max_deg=8)
+
+
+def _brightness_contrast_variant(img):
+    b = random.uniform(-0.25, 0.25) * 255.0
+    c = 1.0 + random.uniform(-0.25, 0.25)
+    return brightness_contrast(img, c, b), None
+
+
+def _blur_variant(img):
+    return gaussian_blur(img, random.choice([3, 5])), None
+
+
+def _motion_blur_variant(img):
+    return motion_blur(img, ksize=random.choice([5, 7, 9])), None
+
+
+def _fog_variant(img):
+    return add_fog(img, intensity=random.choice([0.1, 0.15, 0.2])), None
+
+
+def _color_shift_variant(img):
+    return hsv_color_shift(img, hue_shift=random.randint(-5, 5), sat_scale=random.uniform(0.9, 1.1), val_scale=random.uniform(0.9, 1.1)), None
+
+
+FAST_AUGMENTATIONS = (
+    ("use_gaussian_noise", _gaussian_noise_variant),
+    ("use_salt_pepper", _salt_pepper_variant),
+    ("use_small_rotate", _rotate_variant),
+    ("use_brightness_contrast", _brightness_contrast_variant),
+    ("use_gaussian_blur", _blur_variant),
+    ("use_motion_blur", _motion_blur_variant),
+    ("use_fog", _fog_variant),
+    ("use_color_shift", _color_shift_variant),
+)
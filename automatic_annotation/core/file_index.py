@@ -0,0 +1,266 @@
+"""Persistent, incrementally refreshed file index for watched directories.
+
+Walking a 100k-frame tree and natural-sorting every path on each Streamlit
+rerun costs seconds. An index remembers every directory's mtime and the
+matching files it contained, so a refresh only stats directories and
+rescans the ones whose listing changed. The sorted order is kept in memory
+(and in SQLite between processes), making page slices O(1).
+"""
+
+from pathlib import Path
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from core.cache_paths import cache_subdir
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# Re-stat directories at most this often per index; deletes made through the
+# app call `forget_paths` so they show up immediately, and finished jobs call
+# `expire_indexes` so their output does.
+REFRESH_INTERVAL_S = 1.0
+
+# A directory modified this close to its scan may change again without its
+# mtime moving (coarse filesystem timestamps; FAT/exFAT tick in 2 s), so such
+# a listing is kept unsettled and rescanned on the next refresh.
+MTIME_TICK_NS = 2_000_000_000
+
+DEFAULT_INDEX_DIR = cache_subdir("file_index")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    rel TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    subdirs TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    rel_dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (rel_dir, name)
+);
+"""
+
+_INDEXES: dict = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def natural_sort_key(path: Path):
+    """Sort names with numeric awareness (frame2 before frame10)."""
+    name = path.name
+    return [int(token) if token.isdigit() else token.lower() for token in re.split(r"(\d+)", name)]
+
+
+def _join(rel_dir: str, name: str) -> str:
+    return f"{rel_dir}/{name}" if rel_dir else name
+
+
+class DirectoryIndex:
+    """Sorted listing of matching files under one root, refreshed by directory mtime."""
+
+    def __init__(self, root: Path, extensions=IMAGE_EXTENSIONS, index_dir: Path = DEFAULT_INDEX_DIR):
+        self.root = Path(root).resolve()
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        digest = hashlib.sha1(f"{self.root}|{','.join(self.extensions)}".encode("utf-8")).hexdigest()[:16]
+        self.db_path = Path(index_dir) / f"{digest}.sqlite3"
+
+        # rel_dir -> (mtime_ns, subdir names, matching file names)
+        self._dirs: dict[str, tuple] = {}
+        self._sorted: tuple = ()
+        self._top_level: tuple = ()
+        self._last_refresh = None
+        self._lock = threading.Lock()
+        self._load()
+
+    # ---- persistence ----
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _load(self):
+        try:
+            with self._connect() as conn:
+                files_by_dir: dict[str, list] = {}
+                for rel_dir, name in conn.execute("SELECT rel_dir, name FROM files"):
+                    files_by_dir.setdefault(rel_dir, []).append(name)
+                for rel, mtime_ns, subdirs in conn.execute("SELECT rel, mtime_ns, subdirs FROM dirs"):
+                    names = [item for item in subdirs.split("\n") if item]
+                    self._dirs[rel] = (mtime_ns, names, files_by_dir.get(rel, []))
+        except sqlite3.Error:
+            self._dirs = {}
+        self._rebuild_order()
+
+    def _persist(self, changed: dict, removed: set):
+        try:
+            with self._connect() as conn:
+                for rel in removed:
+                    conn.execute("DELETE FROM dirs WHERE rel = ?", (rel,))
+                    conn.execute("DELETE FROM files WHERE rel_dir = ?", (rel,))
+                for rel, (mtime_ns, subdirs, files) in changed.items():
+                    conn.execute(
+                        "INSERT OR REPLACE INTO dirs (rel, mtime_ns, subdirs) VALUES (?, ?, ?)",
+                        (rel, mtime_ns, "\n".join(subdirs)),
+                    )
+                    conn.execute("DELETE FROM files WHERE rel_dir = ?", (rel,))
+                    conn.executemany(
+                        "INSERT INTO files (rel_dir, name) VALUES (?, ?)",
+                        [(rel, name) for name in files],
+                    )
+        except sqlite3.Error:
+            pass
+
+    # ---- refresh ----
+
+    def _scan_dir(self, rel: str, mtime_ns: int):
+        if time.time_ns() - mtime_ns < MTIME_TICK_NS:
+            # Recorded as mtime 0 (here and in SQLite) so the next refresh rescans it.
+            mtime_ns = 0
+        subdirs = []
+        files = []
+        with os.scandir(self.root / rel if rel else self.root) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.name.lower().endswith(self.extensions) and entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+        return (mtime_ns, sorted(subdirs), files)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-stat indexed directories and rescan changed ones; return True on change."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._last_refresh is not None and now - self._last_refresh < REFRESH_INTERVAL_S:
+                return False
+            self._last_refresh = now
+
+            changed: dict[str, tuple] = {}
+            listing_changed = False
+            visited = set()
+            pending = [""]
+            while pending:
+                rel = pending.pop()
+                try:
+                    mtime_ns = os.stat(self.root / rel if rel else self.root).st_mtime_ns
+                except OSError:
+                    continue
+                visited.add(rel)
+
+                entry = self._dirs.get(rel)
+                if entry is None or entry[0] != mtime_ns:
+                    old = entry
+                    try:
+                        entry = self._scan_dir(rel, mtime_ns)
+                    except OSError:
+                        continue
+                    changed[rel] = entry
+                    self._dirs[rel] = entry
+                    listing_changed = listing_changed or old is None or old[1:] != entry[1:]
+                pending.extend(_join(rel, name) for name in entry[1])
+
+            removed = set(self._dirs) - visited
+            for rel in removed:
+                self._dirs.pop(rel, None)
+
+            if changed or removed:
+                self._persist(changed, removed)
+            if listing_changed or removed:
+                self._rebuild_order()
+                return True
+            return False
+
+    def expire(self) -> None:
+        """Let the next refresh run even inside `REFRESH_INTERVAL_S`."""
+        with self._lock:
+            self._last_refresh = None
+
+    def _rebuild_order(self):
+        paths = []
+        for rel, (_, _, files) in self._dirs.items():
+            base = self.root / rel if rel else self.root
+            paths.extend(base / name for name in files)
+        paths.sort(key=lambda path: (natural_sort_key(path), str(path)))
+        self._sorted = tuple(paths)
+        self._top_level = tuple(path for path in self._sorted if path.parent == self.root)
+
+    # ---- queries ----
+
+    def paths(self, recursive: bool = True) -> tuple:
+        """Return the pre-sorted paths (a shared, immutable tuple)."""
+        return self._sorted if recursive else self._top_level
+
+    def page(self, page: int, per_page: int) -> tuple:
+        """Return one 1-based page of paths."""
+        start = max(0, (int(page) - 1) * int(per_page))
+        return self._sorted[start:start + int(per_page)]
+
+    def __len__(self):
+        return len(self._sorted)
+
+    def forget_paths(self, paths) -> None:
+        """Drop deleted files from the index without rescanning the tree."""
+        with self._lock:
+            changed = {}
+            for path in paths:
+                path = Path(path).resolve()
+                try:
+                    rel = str(path.parent.relative_to(self.root))
+                except ValueError:
+                    continue
+                rel = "" if rel == "." else rel.replace(os.sep, "/")
+                entry = self._dirs.get(rel)
+                if entry is None or path.name not in entry[2]:
+                    continue
+                # Keep the old mtime so the next refresh still rescans this directory.
+                entry = (entry[0], entry[1], [name for name in entry[2] if name != path.name])
+                self._dirs[rel] = entry
+                changed[rel] = entry
+            if changed:
+                self._persist(changed, set())
+                self._rebuild_order()
+
+
+def get_index(dir_path: Path, extensions=IMAGE_EXTENSIONS, refresh: bool = True) -> DirectoryIndex:
+    """Return the shared index for `dir_path`, refreshed unless told otherwise."""
+    key = (str(Path(dir_path).resolve()), tuple(extensions))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = DirectoryIndex(Path(dir_path), extensions)
+            _INDEXES[key] = index
+            refresh = True
+    if refresh:
+        index.refresh(force=len(index) == 0)
+    return index
+
+
+def list_indexed(dir_path: Path, extensions=IMAGE_EXTENSIONS, recursive: bool = True) -> tuple:
+    """Return natural-sorted matching files under `dir_path` from the index."""
+    if not Path(dir_path).exists():
+        return ()
+    return get_index(dir_path, extensions).paths(recursive=recursive)
+
+
+def expire_indexes() -> None:
+    """Make every loaded index rescan on its next use, e.g. after a job wrote files."""
+    with _INDEXES_LOCK:
+        indexes = list(_INDEXES.values())
+    for index in indexes:
+        index.expire()
+
+
+def forget_paths(dir_path: Path, paths, extensions=IMAGE_EXTENSIONS) -> None:
+    """Remove deleted files from the index for `dir_path` if it is loaded."""
+    key = (str(Path(dir_path).resolve()), tuple(extensions))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+    if index is not None:
+        index.forget_paths(paths)
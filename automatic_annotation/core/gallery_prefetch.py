@@ -0,0 +1,177 @@
+"""Prefetching pager for the gallery tabs.
+
+Keeps encoded thumbnail tiles in a byte-bounded in-memory LRU and fills it
+for the previous and next pages in the background while the user reviews
+the current one, so a page flip is served from memory. Tiles are keyed by
+their thumbnail cache file, which already encodes the source (and label)
+signatures; deleting a frame drops exactly its tiles, thumbnails and index
+entry.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import threading
+
+from core import file_index as file_index_utils
+from core import thumbnail_cache as thumbnail_utils
+
+
+TILE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+PREFETCH_WORKERS = 2
+
+
+class TileCache:
+    """Thread-safe LRU of encoded tiles bounded by total byte size."""
+
+    def __init__(self, max_bytes: int = TILE_CACHE_MAX_BYTES):
+        self.max_bytes = int(max_bytes)
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._keys_by_source: dict[str, set] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, source: str, data: bytes) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            self._entries[key] = (source, data)
+            self._bytes += len(data)
+            self._keys_by_source.setdefault(source, set()).add(key)
+            while self._bytes > self.max_bytes and self._entries:
+                evicted_key, (evicted_source, evicted_data) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted_data)
+                source_keys = self._keys_by_source.get(evicted_source)
+                if source_keys is not None:
+                    source_keys.discard(evicted_key)
+                    if not source_keys:
+                        self._keys_by_source.pop(evicted_source, None)
+
+    def discard_source(self, source: str) -> int:
+        """Drop every tile rendered from `source`; return how many were removed."""
+        with self._lock:
+            removed = 0
+            for key in self._keys_by_source.pop(source, set()):
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self._bytes -= len(entry[1])
+                    removed += 1
+            return removed
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+_TILES = TileCache()
+# Visible pages and background prefetch use separate pools so a page load
+# never waits behind queued neighbour pages.
+_PAGE_EXECUTOR = ThreadPoolExecutor(max_workers=thumbnail_utils.THUMBNAIL_WORKERS, thread_name_prefix="gallery-page")
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="gallery-prefetch")
+_PENDING: set = set()
+_PENDING_LOCK = threading.Lock()
+
+
+def _tile_target(path: Path, annotated: bool):
+    if annotated:
+        return thumbnail_utils.overlay_path(path, path.with_suffix(".txt"))
+    return thumbnail_utils.thumbnail_path(path)
+
+
+def _build_tile(path: Path, annotated: bool):
+    if annotated:
+        return thumbnail_utils.ensure_annotated_thumbnail(path, path.with_suffix(".txt"))
+    return thumbnail_utils.ensure_thumbnail(path)
+
+
+def load_tile(path: Path, annotated: bool = False):
+    """Return encoded tile bytes for one frame, or None when it cannot be decoded."""
+    path = Path(path)
+    target = _tile_target(path, annotated)
+    if target is None:
+        return None
+
+    data = _TILES.get(str(target))
+    if data is not None:
+        return data
+
+    tile_file = _build_tile(path, annotated)
+    if tile_file is None:
+        return None
+    try:
+        data = tile_file.read_bytes()
+    except OSError:
+        return None
+    _TILES.put(str(target), str(path.resolve()), data)
+    return data
+
+
+def load_page_tiles(paths, annotated: bool = False) -> list:
+    """Return tile bytes for one page, decoding any misses in parallel."""
+    paths = [Path(path) for path in paths]
+    if not paths:
+        return []
+    return list(_PAGE_EXECUTOR.map(lambda path: load_tile(path, annotated), paths))
+
+
+def _prefetch_one(key: str, path: Path, annotated: bool) -> None:
+    try:
+        load_tile(path, annotated)
+    finally:
+        with _PENDING_LOCK:
+            _PENDING.discard(key)
+
+
+def prefetch_neighbor_pages(all_paths, page: int, per_page: int, annotated: bool = False) -> int:
+    """Queue background loading of the pages around `page` (1-based); return queued count."""
+    total = len(all_paths)
+    page_starts = [page * per_page, (page - 2) * per_page]
+    queued = 0
+    for start in page_starts:
+        if start < 0 or start >= total:
+            continue
+        for path in all_paths[start:start + per_page]:
+            target = _tile_target(Path(path), annotated)
+            if target is None:
+                continue
+            key = str(target)
+            if _TILES.get(key) is not None:
+                continue
+            with _PENDING_LOCK:
+                if key in _PENDING:
+                    continue
+                _PENDING.add(key)
+            _PREFETCH_EXECUTOR.submit(_prefetch_one, key, Path(path), annotated)
+            queued += 1
+    return queued
+
+
+def delete_frame(dir_path: Path, path: Path, with_label: bool = False) -> None:
+    """Delete a frame and forget it precisely: tiles, cached thumbnails and index entry."""
+    path = Path(path)
+    label_path = path.with_suffix(".txt")
+    # Cache files are addressed by source signatures, so resolve them before unlinking.
+    cache_files = [
+        thumbnail_utils.thumbnail_path(path),
+        thumbnail_utils.overlay_path(path, label_path),
+    ]
+    source = str(path.resolve())
+
+    path.unlink()
+    if with_label and label_path.exists():
+        label_path.unlink()
+
+    for cache_file in cache_files:
+        if cache_file is not None:
+            cache_file.unlink(missing_ok=True)
+    _TILES.discard_source(source)
+    file_index_utils.forget_paths(dir_path, [path])
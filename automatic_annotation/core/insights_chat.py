@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+from collections import deque
+import hashlib
+import itertools
 import json
 import re
+import threading
+import time
 from pathlib import Path
 
 import pandas as pd
-from openai import OpenAI
+
+from core import context_packer
 
 
 PROVIDER_CONFIG = {
@@ -23,6 +29,21 @@ PROVIDER_CONFIG = {
     },
 }
 
+# Provider requests: read timeout for a whole answer, connect timeout, pooled connections per client.
+REQUEST_TIMEOUT_S = 90.0
+CONNECT_TIMEOUT_S = 10.0
+MAX_POOL_CONNECTIONS = 4
+
+# Recent request latencies and prompt sizes (see `latency_summary`).
+LATENCY_LOG_SIZE = 50
+LATENCY_LOG = deque(maxlen=LATENCY_LOG_SIZE)
+
+_CLIENTS: dict = {}
+_CLIENTS_LOCK = threading.Lock()
+
+# Most chat messages sent to the provider with each question (see `context_packer.trim_history`).
+HISTORY_MESSAGES = 10
+
 # Keep Insights answers short and actionable.
 MAX_RESPONSE_WORDS = 140
 MAX_RESPONSE_CHARS = 900
@@ -81,6 +102,11 @@ def load_metrics_csv(metrics_source) -> pd.DataFrame:
     except Exception:
         return pd.DataFrame()
 
+    return prepare_metrics_frame(df)
+
+
+def prepare_metrics_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce dates and metric columns, and fill a usable `f1_score` column."""
     if df.empty:
         return df
 
@@ -106,7 +132,7 @@ def detect_metrics_signature(metrics_source) -> str:
     if hasattr(metrics_source, "getvalue"):
         payload = metrics_source.getvalue()
         name = getattr(metrics_source, "name", "uploaded_metrics.csv")
-        return f"upload:{name}:{len(payload)}"
+        return f"upload:{name}:{len(payload)}:{hashlib.sha1(payload).hexdigest()}"
 
     path = Path(metrics_source)
     if not path.exists():
@@ -238,8 +264,8 @@ def build_workspace_snapshot(df: pd.DataFrame):
     }
 
 
-def _build_documents(df: pd.DataFrame):
-    """Build small retrievable metric documents from the CSV."""
+def _build_documents(df: pd.DataFrame, class_rows=None):
+    """Build small retrievable metric documents from the CSV (`class_rows` reuses a precomputed class analysis)."""
     if df.empty:
         return []
 
@@ -249,7 +275,8 @@ def _build_documents(df: pd.DataFrame):
 
     latest_row = work_df.tail(1).iloc[0]
     best_row = work_df.sort_values("f1_score", ascending=False).iloc[0]
-    class_rows = build_class_analysis(work_df)
+    if class_rows is None:
+        class_rows = build_class_analysis(work_df)
     models = sorted(work_df[model_col].dropna().astype(str).unique().tolist())
     date_min = work_df[date_col].min()
     date_max = work_df[date_col].max()
@@ -325,49 +352,68 @@ def _build_documents(df: pd.DataFrame):
         }
     )
 
-    for doc in docs:
-        doc["tokens"] = set(_tokenize(doc["title"] + " " + doc["text"]))
-
     return docs
 
 
-def retrieve_context(df: pd.DataFrame, query: str, max_docs: int = 6):
-    """Retrieve the most relevant metric documents for a user question."""
-    docs = _build_documents(df)
-    if not docs:
-        return [], ""
+def get_retrieval_index(df: pd.DataFrame, signature: str, class_rows=None):
+    """Return the persistent BM25 index for metrics version `signature`, building documents only when it changed."""
+    from core import retrieval_index
+
+    return retrieval_index.get_index(signature, lambda: _build_documents(df, class_rows), _tokenize)
+
+
+def retrieve_context(
+    df: pd.DataFrame,
+    query: str,
+    max_docs: int = 6,
+    index=None,
+    token_budget: int = context_packer.CONTEXT_TOKEN_BUDGET,
+):
+    """Retrieve the most relevant metric documents for a user question.
+
+    Pass `index` (see `get_retrieval_index`) to skip rebuilding and re-tokenizing documents.
+    Documents are packed in rank order into `token_budget` tokens (tables compressed, overflow cut).
+    """
+    if index is None:
+        from core.retrieval_index import BM25Index
+
+        index = BM25Index(_tokenize)
+        index.update(_build_documents(df))
 
     query_tokens = set(_tokenize(query))
-    class_tokens = {row["class_key"] for row in build_class_analysis(df)}
-
-    ranked = []
-    for index, doc in enumerate(docs):
-        score = len(query_tokens & doc["tokens"])
-        if any(class_token in query_tokens for class_token in class_tokens):
-            for class_token in class_tokens:
-                if class_token in query_tokens and class_token in doc["title"]:
+    # `apply` mutates the index in place; rank against a consistent state.
+    with index.lock:
+        if not len(index):
+            return [], ""
+        class_tokens = {title[len("class_"):] for title in index.order if title.startswith("class_")}
+        asked_classes = [class_token for class_token in class_tokens if class_token in query_tokens]
+        asks_improvement = any(term in query_tokens for term in {"improve", "better", "worse", "weak", "improvement"})
+        bm25 = index.scores(query_tokens)
+
+        ranked = []
+        for position, title in enumerate(index.order):
+            terms = index.doc_terms[title]
+            score = bm25.get(title, 0.0)
+            for class_token in asked_classes:
+                if class_token in title:
                     score += 5
-        if "f1" in query_tokens and ("f1" in doc["tokens"] or "best_run" == doc["title"]):
-            score += 2
-        if "precision" in query_tokens and "precision" in doc["tokens"]:
-            score += 2
-        if "recall" in query_tokens and "recall" in doc["tokens"]:
-            score += 2
-        if any(term in query_tokens for term in {"improve", "better", "worse", "weak", "improvement"}):
-            if doc["title"].startswith("class_") or doc["title"] in {"latest_run", "best_run"}:
+            if "f1" in query_tokens and ("f1" in terms or "best_run" == title):
+                score += 2
+            if "precision" in query_tokens and "precision" in terms:
+                score += 2
+            if "recall" in query_tokens and "recall" in terms:
+                score += 2
+            if asks_improvement and (title.startswith("class_") or title in {"latest_run", "best_run"}):
                 score += 1
-        ranked.append((score, index, doc))
-
-    ranked.sort(key=lambda item: (item[0], -item[1]), reverse=True)
-    selected = [item[2] for item in ranked[:max_docs] if item[0] > 0]
-    if not selected:
-        selected = docs[:max_docs]
+            ranked.append((score, position, index.docs[title]))
 
-    context_parts = []
-    for doc in selected:
-        context_parts.append(f"[{doc['title']}]\n{doc['text']}")
+        ranked.sort(key=lambda item: (item[0], -item[1]), reverse=True)
+        selected = [item[2] for item in ranked[:max_docs] if item[0] > 0]
+        if not selected:
+            selected = [index.docs[title] for title in index.order[:max_docs]]
 
-    return selected, "\n\n".join(context_parts)
+    packed, context, _ = context_packer.pack_documents(selected, budget=token_budget)
+    return packed, context
 
 
 def build_system_prompt() -> str:
@@ -400,16 +446,16 @@ def _limit_response_size(content: str) -> str:
         paragraphs = paragraphs[:MAX_RESPONSE_PARAGRAPHS]
     text = "\n\n".join(paragraphs)
 
-    # Final word cap to keep responses tight.
-    words = text.split()
+    # Final word cap to keep responses tight; cut at a character offset so line breaks survive.
+    words = list(itertools.islice(re.finditer(r"\S+", text), MAX_RESPONSE_WORDS + 1))
     if len(words) > MAX_RESPONSE_WORDS:
-        text = " ".join(words[:MAX_RESPONSE_WORDS]).rstrip(" ,;:") + "..."
+        text = text[:words[MAX_RESPONSE_WORDS - 1].end()].rstrip(" ,;:") + "..."
 
     return text
 
 
-def build_messages(chat_history, metrics_context: str):
-    """Compose the provider chat payload messages."""
+def build_messages(chat_history, metrics_context: str, history_budget: int = context_packer.HISTORY_TOKEN_BUDGET):
+    """Compose the provider chat payload messages (history trimmed to `history_budget` tokens)."""
     messages = [
         {"role": "system", "content": build_system_prompt()},
         {
@@ -422,18 +468,56 @@ def build_messages(chat_history, metrics_context: str):
         },
     ]
 
-    for message in chat_history[-10:]:
-        role = message.get("role", "user")
-        content = str(message.get("content", "")).strip()
-        if not content:
-            continue
-        messages.append({"role": role, "content": content})
-
+    messages.extend(context_packer.trim_history(chat_history, budget=history_budget, max_messages=HISTORY_MESSAGES))
     return messages
 
 
-def request_chat_completion(provider: str, api_key: str, model_name: str, messages, timeout: int = 90) -> str:
-    """Call the selected provider with an OpenAI-compatible chat payload."""
+def conversation_prompt(chat_history) -> str:
+    """
+    Return the user turns the provider sees for the latest question, one per line.
+    Used as the response-cache prompt so a follow-up like "why?" is not answered from another conversation.
+    """
+    turns = [
+        str(message.get("content", "")).strip()
+        for message in chat_history[-HISTORY_MESSAGES:]
+        if message.get("role", "user") == "user"
+    ]
+    return "\n".join(turn for turn in turns if turn)
+
+
+def provider_base_url(provider: str) -> str:
+    """Return the OpenAI-compatible base URL (ending in `/v1`) for a configured provider."""
+    if provider not in PROVIDER_CONFIG:
+        raise ValueError(f"Unsupported provider: {provider}")
+    # Strip the /chat/completions endpoint (and any /v1) and re-append /v1.
+    base_url = PROVIDER_CONFIG[provider]["endpoint"].replace("/chat/completions", "").replace("/v1", "")
+    return base_url.rstrip("/") + "/v1"
+
+
+def get_client(api_key: str, base_url: str, timeout: float = REQUEST_TIMEOUT_S):
+    """Return a shared OpenAI client per base URL, key and timeout; its HTTP connections are pooled and kept alive."""
+    key = (base_url, hashlib.sha256(api_key.encode("utf-8")).hexdigest(), float(timeout))
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            # Imported here so pages that never chat don't load the OpenAI SDK.
+            import httpx
+            from openai import OpenAI
+
+            client = OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT_S),
+                max_retries=1,
+                http_client=httpx.Client(
+                    limits=httpx.Limits(max_connections=MAX_POOL_CONNECTIONS, max_keepalive_connections=MAX_POOL_CONNECTIONS),
+                ),
+            )
+            _CLIENTS[key] = client
+        return client
+
+
+def _check_request(provider: str, api_key: str, model_name: str) -> None:
     if provider not in PROVIDER_CONFIG:
         raise ValueError(f"Unsupported provider: {provider}")
     if not api_key:
@@ -441,15 +525,126 @@ def request_chat_completion(provider: str, api_key: str, model_name: str, messag
     if not model_name:
         raise ValueError("Missing model name.")
 
-    provider_config = PROVIDER_CONFIG[provider]
-    
-    # Get the base URL (remove /chat/completions endpoint)
-    base_url = provider_config["endpoint"].replace("/chat/completions", "").replace("/v1", "")
-    if not base_url.endswith("/v1"):
-        base_url = base_url.rstrip("/") + "/v1"
-    
-    client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout)
-    
+
+def _record_latency(provider: str, model_name: str, stats: dict) -> None:
+    with _CLIENTS_LOCK:
+        LATENCY_LOG.append({"provider": provider, "model": model_name, **stats})
+
+
+def latency_summary() -> dict:
+    """Median time-to-first-token, total latency and estimated prompt size over the recent requests."""
+    with _CLIENTS_LOCK:
+        entries = list(LATENCY_LOG)
+    ttfts = sorted(entry["ttft_s"] for entry in entries if entry.get("ttft_s") is not None)
+    totals = sorted(entry["total_s"] for entry in entries)
+    prompt_tokens = sorted(entry["prompt_tokens"] for entry in entries if entry.get("prompt_tokens") is not None)
+    return {
+        "requests": len(entries),
+        "median_ttft_s": ttfts[len(ttfts) // 2] if ttfts else None,
+        "median_total_s": totals[len(totals) // 2] if totals else None,
+        "median_prompt_tokens": prompt_tokens[len(prompt_tokens) // 2] if prompt_tokens else None,
+    }
+
+
+def _response_is_capped(text: str) -> bool:
+    stripped = text.strip()
+    paragraphs = [para for para in stripped.split("\n\n") if para.strip()]
+    return (
+        len(stripped) > MAX_RESPONSE_CHARS
+        or len(stripped.split()) > MAX_RESPONSE_WORDS
+        or len(paragraphs) > MAX_RESPONSE_PARAGRAPHS
+    )
+
+
+def stream_chat_completion(
+    provider: str,
+    api_key: str,
+    model_name: str,
+    messages,
+    timeout: float = REQUEST_TIMEOUT_S,
+    stats: dict = None,
+    base_url: str = None,
+):
+    """
+    Yield the answer text in pieces as the provider streams it (for `st.write_stream`).
+    The output is trimmed like `request_chat_completion`, and the stream is closed once the cap is hit.
+    `stats` (a dict) receives `ttft_s`, `total_s`, `chunks`, the estimated `prompt_tokens` and the final `text`.
+    """
+    _check_request(provider, api_key, model_name)
+    client = get_client(api_key, base_url or provider_base_url(provider), timeout)
+    stats = stats if stats is not None else {}
+    started = time.perf_counter()
+    stats.update({
+        "ttft_s": None,
+        "total_s": None,
+        "chunks": 0,
+        "streamed": True,
+        "prompt_tokens": context_packer.estimate_message_tokens(messages),
+        "text": "",
+    })
+
+    try:
+        stream = client.chat.completions.create(
+            model=model_name,
+            temperature=0.25,
+            messages=messages,
+            max_tokens=220,
+            stream=True,
+        )
+    except Exception as exc:
+        raise RuntimeError(f"Provider request failed: {exc}") from exc
+
+    full = ""
+    shown = ""
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            piece = chunk.choices[0].delta.content or ""
+            if not piece:
+                continue
+            if stats["ttft_s"] is None:
+                stats["ttft_s"] = round(time.perf_counter() - started, 4)
+            stats["chunks"] += 1
+            full += piece
+            limited = _limit_response_size(full)
+            # Only emit text that extends what is already on screen.
+            if limited.startswith(shown) and len(limited) > len(shown):
+                yield limited[len(shown):]
+                shown = limited
+            if _response_is_capped(full):
+                break
+    except Exception as exc:
+        raise RuntimeError(f"Provider request failed: {exc}") from exc
+    finally:
+        stream.close()
+
+    final = _limit_response_size(full)
+    if not final.startswith(shown):
+        # Text already on screen can't be taken back: keep it, marked as cut when the cap was hit.
+        final = shown + ("..." if _response_is_capped(full) and not shown.endswith("...") else "")
+    if len(final) > len(shown):
+        yield final[len(shown):]
+    stats["text"] = final
+    stats["total_s"] = round(time.perf_counter() - started, 4)
+    _record_latency(
+        provider, model_name, {key: stats[key] for key in ("ttft_s", "total_s", "chunks", "streamed", "prompt_tokens")}
+    )
+
+
+def request_chat_completion(
+    provider: str,
+    api_key: str,
+    model_name: str,
+    messages,
+    timeout: float = REQUEST_TIMEOUT_S,
+    base_url: str = None,
+) -> str:
+    """Call the selected provider with an OpenAI-compatible chat payload."""
+    _check_request(provider, api_key, model_name)
+    client = get_client(api_key, base_url or provider_base_url(provider), timeout)
+    started = time.perf_counter()
+
     try:
         response = client.chat.completions.create(
             model=model_name,
@@ -457,6 +652,17 @@ def request_chat_completion(provider: str, api_key: str, model_name: str, messag
             messages=messages,
             max_tokens=220,
         )
-        return _limit_response_size(str(response.choices[0].message.content).strip())
+        text = _limit_response_size(str(response.choices[0].message.content).strip())
     except Exception as exc:
         raise RuntimeError(f"Provider request failed: {exc}") from exc
+
+    total = round(time.perf_counter() - started, 4)
+    # Without streaming the first token arrives with the last one.
+    _record_latency(provider, model_name, {
+        "ttft_s": total,
+        "total_s": total,
+        "chunks": 1,
+        "streamed": False,
+        "prompt_tokens": context_packer.estimate_message_tokens(messages),
+    })
+    return text
@@ -0,0 +1,213 @@
+"""Local answers for common Insights questions.
+
+Questions such as "which model is best?", "weakest class?" or "how is the
+person class trending?" can be fully answered from the precomputed metrics
+views (`build_workspace_snapshot`, `build_class_analysis` and the prepared
+frame). This router matches those templated intents with a few keyword rules
+and answers them in milliseconds without a provider call. That also keeps the
+page useful without an API key.
+
+Anything open-ended returns None, so the page falls back to the language
+model. Open-ended here means asking why, how to improve, for advice, or no
+rule matching.
+"""
+
+import re
+
+import pandas as pd
+
+
+# Questions asking for reasoning or advice always go to the language model.
+OPEN_ENDED_PATTERN = re.compile(
+    r"\b(why|explain|improve|improving|fix|should|recommend|suggest|advice|cause|reason|compare|versus|vs)\b"
+)
+
+TREND_PATTERN = re.compile(r"\b(trend|trending|over time|history|progress|changed?|evolv\w*|improved|regress\w*|getting)\b")
+BEST_PATTERN = re.compile(r"\b(best|top|strongest|highest|leading)\b")
+WORST_PATTERN = re.compile(r"\b(worst|weakest|lowest|poorest|struggl\w*|hardest)\b")
+MODEL_PATTERN = re.compile(r"\b(model|models|run)\b")
+CLASS_PATTERN = re.compile(r"\b(class|classes|category|categories|label|labels)\b")
+LATEST_PATTERN = re.compile(r"\b(latest|last|most recent|newest|current)\b")
+OVERVIEW_PATTERN = re.compile(r"\b(how many|overview|summary|summarize|summarise)\b")
+METRIC_PATTERN = re.compile(r"\b(precision|recall|f1|score|performance|doing|perform\w*)\b")
+
+# Classes listed for "weakest/strongest class" answers.
+RANKED_CLASSES = 3
+
+
+def _pct(value) -> str:
+    try:
+        return f"{float(value):.1%}"
+    except (TypeError, ValueError):
+        return "n/a"
+
+
+def _date(value) -> str:
+    if value is None or pd.isna(value):
+        return "an unknown date"
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d %H:%M")
+    return str(value)
+
+
+def normalize_question(question: str) -> str:
+    """Lower-case and collapse punctuation/whitespace so the patterns match word boundaries."""
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9_ ]+", " ", str(question or "").lower())).strip()
+
+
+def match_classes(text: str, class_rows) -> list:
+    """Return the class rows named in `text` (by key or display name, singular or plural)."""
+    matched = []
+    for row in class_rows:
+        names = {row["class_key"].lower(), row["class_key"].lower().replace("_", " "), row["class_name"].lower()}
+        if any(re.search(rf"\b{re.escape(name)}(s|es)?\b", text) for name in names if name):
+            matched.append(row)
+    return matched
+
+
+# ---------------------------
+# Answers
+# ---------------------------
+
+def _run_line(run: dict) -> str:
+    return f"precision {_pct(run['precision'])}, recall {_pct(run['recall'])}, F1 {_pct(run['f1'])}"
+
+
+def _answer_best_model(views) -> str:
+    best = views["snapshot"]["best_run"]
+    lines = [f"**{best['model']}** has the best overall F1: {_run_line(best)} (run on {_date(best['date'])})."]
+    latest_rows = views["latest_rows"]
+    if views["columns"] and len(latest_rows) > 1:
+        model_col = views["columns"][0]
+        ranked = latest_rows.sort_values("f1_score", ascending=False)
+        ranking = ", ".join(f"{row[model_col]} {_pct(row['f1_score'])}" for _, row in ranked.head(5).iterrows())
+        lines.append(f"Latest-run F1 by model: {ranking}.")
+    return "\n\n".join(lines)
+
+
+def _answer_latest_run(views) -> str:
+    latest = views["snapshot"]["latest_run"]
+    best = views["snapshot"]["best_run"]
+    text = f"The latest run is **{latest['model']}** on {_date(latest['date'])}: {_run_line(latest)}."
+    gap = latest["f1"] - best["f1"]
+    if abs(gap) > 1e-9:
+        text += f"\n\nThat is {gap:+.1%} F1 against the best run ({best['model']}, {_pct(best['f1'])})."
+    else:
+        text += "\n\nIt is also the best run so far."
+    return text
+
+
+def _answer_ranked_classes(views, weakest: bool) -> str:
+    class_rows = views["class_analysis"]
+    if not class_rows:
+        return "The metrics file has no per-class precision/recall columns."
+    ordered = class_rows if weakest else list(reversed(class_rows))
+    label = "Weakest" if weakest else "Strongest"
+    lines = [f"{label} classes by average F1:"]
+    for row in ordered[:RANKED_CLASSES]:
+        lines.append(
+            f"- **{row['class_name']}**: F1 {_pct(row['avg_f1'])} "
+            f"(precision {_pct(row['avg_precision'])}, recall {_pct(row['avg_recall'])}, {row['runs']} runs)"
+        )
+    return "\n".join(lines)
+
+
+def _answer_class_summary(row: dict) -> str:
+    return (
+        f"**{row['class_name']}** over {row['runs']} runs: average precision {_pct(row['avg_precision'])}, "
+        f"recall {_pct(row['avg_recall'])}, F1 {_pct(row['avg_f1'])}.\n\n"
+        f"Latest ({row['latest_model']}, {_date(row['latest_date'])}): precision {_pct(row['latest_precision'])}, "
+        f"recall {_pct(row['latest_recall'])}, F1 {_pct(row['latest_f1'])}. "
+        f"Best F1 {_pct(row['best_f1'])} from {row['best_model']}."
+    )
+
+
+def class_f1_history(frame: pd.DataFrame, columns, class_key: str) -> pd.DataFrame:
+    """Per-run precision, recall and F1 of one class in date order (runs without the class are dropped)."""
+    model_col, date_col = columns[0], columns[1]
+    zeros = pd.Series(0.0, index=frame.index)
+    precision = pd.to_numeric(frame.get(f"precision_{class_key}", zeros), errors="coerce").fillna(0.0)
+    recall = pd.to_numeric(frame.get(f"recall_{class_key}", zeros), errors="coerce").fillna(0.0)
+    denom = precision + recall
+    history = pd.DataFrame({
+        "model": frame[model_col].astype(str),
+        "date": frame[date_col],
+        "precision": precision,
+        "recall": recall,
+        "f1": (2 * precision * recall / denom.where(denom != 0, 1)).fillna(0.0),
+    })
+    history = history[(history["precision"] > 0) | (history["recall"] > 0)]
+    return history.sort_values("date", na_position="last")
+
+
+def _answer_class_trend(views, row: dict) -> str:
+    history = class_f1_history(views["frame"], views["columns"], row["class_key"])
+    if len(history) < 2:
+        return _answer_class_summary(row) + "\n\nThere is only one measured run, so no trend yet."
+    first, latest = history.iloc[0], history.iloc[-1]
+    delta = latest["f1"] - first["f1"]
+    direction = "improved" if delta > 0.005 else "dropped" if delta < -0.005 else "held steady"
+    recent = " → ".join(_pct(value) for value in history["f1"].tail(5))
+    return (
+        f"**{row['class_name']}** F1 has {direction} ({delta:+.1%}) across {len(history)} runs: "
+        f"{_pct(first['f1'])} on {_date(first['date'])} ({first['model']}) to {_pct(latest['f1'])} "
+        f"on {_date(latest['date'])} ({latest['model']}).\n\n"
+        f"Recent F1: {recent}. Latest precision {_pct(latest['precision'])}, recall {_pct(latest['recall'])}."
+    )
+
+
+def _answer_overview(views) -> str:
+    snapshot = views["snapshot"]
+    text = (
+        f"The metrics file has **{snapshot['run_count']} runs** across **{snapshot['model_count']} models** "
+        f"and {len(views['class_analysis'])} classes with per-class metrics.\n\n"
+        f"Best run: {snapshot['best_run']['model']} (F1 {_pct(snapshot['best_run']['f1'])}). "
+        f"Latest run: {snapshot['latest_run']['model']} (F1 {_pct(snapshot['latest_run']['f1'])})."
+    )
+    weakest = snapshot["weakest_classes"]
+    if weakest:
+        text += f" Weakest class: {weakest[0]['class_name']} (F1 {_pct(weakest[0]['avg_f1'])})."
+    return text
+
+
+# ---------------------------
+# Routing
+# ---------------------------
+
+def route_question(question: str, views) -> dict:
+    """
+    Answer `question` from the metrics views of `metrics_views.load_metrics_views`.
+    Returns `{"intent", "text"}`, or None when the question needs the language model.
+    """
+    if views["frame"].empty or views["snapshot"]["best_run"] is None:
+        return None
+    text = normalize_question(question)
+    if not text or OPEN_ENDED_PATTERN.search(text):
+        return None
+
+    classes = match_classes(text, views["class_analysis"])
+    if len(classes) > 1:
+        return None
+    if classes:
+        if TREND_PATTERN.search(text):
+            return {"intent": "class_trend", "text": _answer_class_trend(views, classes[0])}
+        if METRIC_PATTERN.search(text) or len(text.split()) <= 3:
+            return {"intent": "class_summary", "text": _answer_class_summary(classes[0])}
+        return None
+
+    if CLASS_PATTERN.search(text):
+        if WORST_PATTERN.search(text):
+            return {"intent": "weakest_class", "text": _answer_ranked_classes(views, weakest=True)}
+        if BEST_PATTERN.search(text):
+            return {"intent": "strongest_class", "text": _answer_ranked_classes(views, weakest=False)}
+        return None
+
+    if MODEL_PATTERN.search(text):
+        if LATEST_PATTERN.search(text):
+            return {"intent": "latest_run", "text": _answer_latest_run(views)}
+        if BEST_PATTERN.search(text):
+            return {"intent": "best_model", "text": _answer_best_model(views)}
+
+    if OVERVIEW_PATTERN.search(text):
+        return {"intent": "overview", "text": _answer_overview(views)}
+    return None
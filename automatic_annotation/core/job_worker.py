@@ -0,0 +1,85 @@
+"""Worker entry point for background jobs started from the Streamlit app.
+
+Run from the app directory as:
+
+    python -m core.job_worker <task> '<json params>'
+
+Each task reports progress as JSON lines on stdout (see `core.progress_events`).
+"""
+
+from pathlib import Path
+import json
+import sys
+
+from core.progress_events import ProgressReporter
+
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def run_extract_frames(params: dict, reporter: ProgressReporter) -> dict:
+    """Extract frames from one uploaded video, replacing previous frames."""
+    from data_augmentation import extract_frames_every
+
+    out_dir = Path(params["output_dir"])
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if params.get("clear_existing", True):
+        for item in out_dir.iterdir():
+            if item.is_file() and item.suffix.lower() in IMAGE_SUFFIXES:
+                item.unlink()
+
+    count = extract_frames_every(
+        params["video_path"],
+        str(out_dir),
+        interval_seconds=int(params.get("interval_seconds", 3)),
+        progress_callback=reporter.callback(),
+    )
+    return {"frames_written": count, "output_dir": str(out_dir)}
+
+
+def run_augment(params: dict, reporter: ProgressReporter) -> dict:
+    """Augment a folder into `output_dir` (default: in place)."""
+    from data_augmentation import DEFAULT_AUGMENT_WORKERS, augment_images_with_stats
+
+    source_dir = Path(params["input_dir"])
+    output_dir = params.get("output_dir", str(source_dir))
+    stats = augment_images_with_stats(
+        str(source_dir),
+        output_dir=output_dir,
+        variants_per_image=int(params.get("variants_per_image", 2)),
+        workers=int(params.get("workers", DEFAULT_AUGMENT_WORKERS)),
+        seed=params.get("seed"),
+        with_labels=bool(params.get("with_labels", False)),
+        batch_size=int(params.get("batch_size", 0)),
+        progress_callback=reporter.callback(),
+        **params.get("options", {}),
+    )
+    reporter.timing("augment", stats["seconds"])
+    return {**stats, "output_dir": output_dir}
+
+
+TASKS = {
+    "extract_frames": run_extract_frames,
+    "augment": run_augment,
+}
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in TASKS:
+        ProgressReporter("job_worker").error(f"Unknown task. Expected one of: {', '.join(TASKS)}")
+        return 2
+
+    params = json.loads(argv[1]) if len(argv) > 1 else {}
+    reporter = ProgressReporter(argv[0])
+    reporter.start()
+    try:
+        result = TASKS[argv[0]](params, reporter)
+    except Exception as exc:
+        reporter.error(str(exc))
+        return 1
+    reporter.summary(result, message=result.get("message", "Completed."))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
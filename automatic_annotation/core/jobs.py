@@ -0,0 +1,404 @@
+"""Persistent background jobs for long-running page actions.
+
+Extract and Augment (`core.job_worker` tasks), Filter and Auto-Annotate
+(their runner scripts) run as worker processes instead of blocking the
+Streamlit script; Evaluate runs in-process as a callable job. Every job is
+a row in a SQLite table, so its progress and result survive reruns and
+browser refreshes, and jobs submitted while another one is running simply
+queue.
+
+Workers report progress with the JSON-lines protocol in
+`core.progress_events`; every other stdout line only goes to the log.
+Work that benefits from in-process caches (loaded models) can instead run
+as a callable on the same queue and report through a `ProgressReporter`.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import json
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+import traceback
+import uuid
+
+from core import file_index as file_index_utils
+from core.cache_paths import cache_subdir
+from core.progress_events import ProgressReporter, parse_event
+
+
+JOB_STATES = ("queued", "running", "succeeded", "failed", "cancelled", "interrupted")
+ACTIVE_STATES = ("queued", "running")
+
+# Jobs compete for the same GPU/CPU, so they run one at a time in FIFO order.
+MAX_CONCURRENT_JOBS = 1
+
+# Progress rows are written at most this often per job.
+PROGRESS_WRITE_INTERVAL_S = 0.25
+
+DEFAULT_JOBS_DIR = cache_subdir("jobs")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    progress_done INTEGER NOT NULL DEFAULT 0,
+    progress_total INTEGER NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    error TEXT,
+    log_path TEXT NOT NULL,
+    owner_pid INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_kind_created ON jobs (kind, created_at);
+"""
+
+_MANAGER = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def _row_to_job(row) -> dict:
+    job = dict(row)
+    job["result"] = json.loads(job["result"]) if job.get("result") else None
+    return job
+
+
+class JobStore:
+    """SQLite-backed job table shared by every Streamlit session and process."""
+
+    def __init__(self, jobs_dir: Path = DEFAULT_JOBS_DIR):
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.jobs_dir / "jobs.sqlite3"
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create(self, kind: str, label: str) -> dict:
+        job_id = uuid.uuid4().hex[:12]
+        log_path = self.jobs_dir / f"{job_id}.log"
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, label, status, created_at, log_path, owner_pid) VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, label, time.time(), str(log_path), os.getpid()),
+            )
+        return self.get(job_id)
+
+    def update(self, job_id: str, **fields) -> None:
+        if "result" in fields and fields["result"] is not None:
+            fields["result"] = json.dumps(fields["result"], default=str)
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row is not None else None
+
+    def list(self, kind: str = None, limit: int = 20) -> list:
+        query = "SELECT * FROM jobs"
+        params = []
+        if kind is not None:
+            query += " WHERE kind = ?"
+            params.append(kind)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(int(limit))
+        with self._connect() as conn:
+            return [_row_to_job(row) for row in conn.execute(query, params)]
+
+    def mark_orphans_interrupted(self, owner_pid: int) -> int:
+        """Flag active jobs left behind by another (dead) server process."""
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'interrupted', finished_at = ?, message = 'Server restarted before the job finished.' "
+                "WHERE status IN ('queued', 'running') AND owner_pid != ?",
+                (time.time(), owner_pid),
+            )
+            return cursor.rowcount
+
+
+class JobCancelled(Exception):
+    """Raised inside an in-process job when it has been cancelled."""
+
+
+class _EventSink:
+    """File-like target for a `ProgressReporter` running inside a job thread."""
+
+    def __init__(self, manager, job_id: str, state: dict, log_file):
+        self.manager = manager
+        self.job_id = job_id
+        self.state = state
+        self.log_file = log_file
+
+    def write(self, text: str) -> None:
+        for line in text.splitlines():
+            self.manager._handle_line(self.job_id, self.state, line + "\n", self.log_file)
+        if self.manager._is_cancelled(self.job_id):
+            raise JobCancelled()
+
+    def flush(self) -> None:
+        self.log_file.flush()
+
+
+class JobManager:
+    """Runs queued jobs on a FIFO worker pool and records their progress."""
+
+    def __init__(self, store: JobStore = None, max_workers: int = MAX_CONCURRENT_JOBS):
+        self.store = store or JobStore()
+        self.store.mark_orphans_interrupted(os.getpid())
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._processes: dict[str, subprocess.Popen] = {}
+        self._cancelled: set = set()
+        self._lock = threading.Lock()
+
+    def submit_command(self, kind: str, label: str, command: list, cwd: Path = None) -> dict:
+        """Queue `command` as a job of `kind`; return the new job row."""
+        job = self.store.create(kind, label)
+        self._executor.submit(self._run_command, job["id"], [str(part) for part in command], cwd, job["log_path"])
+        return job
+
+    def submit_callable(self, kind: str, label: str, func, *args, **kwargs) -> dict:
+        """Queue `func(reporter, *args, **kwargs)` to run in this process.
+
+        Use this when the work benefits from in-process caches (loaded models).
+        `reporter` is a `ProgressReporter` whose events update the job row; its
+        return value becomes the job result. Cancelling takes effect at the
+        next reported event.
+        """
+        job = self.store.create(kind, label)
+        self._executor.submit(self._run_callable, job["id"], kind, job["log_path"], func, args, kwargs)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job or terminate a running one."""
+        job = self.store.get(job_id)
+        if job is None or job["status"] not in ACTIVE_STATES:
+            return False
+        with self._lock:
+            self._cancelled.add(job_id)
+            process = self._processes.get(job_id)
+        if process is not None:
+            process.terminate()
+        elif job["status"] == "queued":
+            self.store.update(job_id, status="cancelled", finished_at=time.time(), message="Cancelled before start.")
+        return True
+
+    def _is_cancelled(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancelled
+
+    def _begin(self, job_id: str) -> bool:
+        with self._lock:
+            if job_id in self._cancelled:
+                self._cancelled.discard(job_id)
+                return False
+        self.store.update(job_id, status="running", started_at=time.time(), message="Starting...")
+        return True
+
+    def _handle_line(self, job_id: str, state: dict, line: str, log_file) -> None:
+        log_file.write(line)
+        if not _apply_event(state, line.strip()):
+            return
+        now = time.monotonic()
+        if now - state["last_write"] >= PROGRESS_WRITE_INTERVAL_S:
+            state["last_write"] = now
+            log_file.flush()
+            self.store.update(
+                job_id,
+                progress_done=state["done"],
+                progress_total=state["total"],
+                message=state["message"],
+            )
+
+    def _run_command(self, job_id: str, command: list, cwd, log_path: str) -> None:
+        if not self._begin(job_id):
+            return
+
+        state = _new_state()
+        returncode = None
+        try:
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                process = subprocess.Popen(
+                    command,
+                    cwd=str(cwd) if cwd else None,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    bufsize=1,
+                    env={**os.environ, "PYTHONUNBUFFERED": "1"},
+                )
+                with self._lock:
+                    self._processes[job_id] = process
+                    if job_id in self._cancelled:
+                        process.terminate()
+
+                for line in process.stdout:
+                    self._handle_line(job_id, state, line, log_file)
+                returncode = process.wait()
+        except Exception as exc:
+            state["error"] = str(exc)
+        finally:
+            with self._lock:
+                self._processes.pop(job_id, None)
+
+        if returncode not in (0, None) and state["error"] is None:
+            state["error"] = f"Exited with code {returncode}."
+        self._finish(job_id, state)
+
+    def _run_callable(self, job_id: str, kind: str, log_path: str, func, args, kwargs) -> None:
+        if not self._begin(job_id):
+            return
+
+        state = _new_state()
+        try:
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                reporter = ProgressReporter(kind, stream=_EventSink(self, job_id, state, log_file))
+                reporter.start()
+                result = func(reporter, *args, **kwargs)
+                if state["result"] is None and state["error"] is None:
+                    reporter.summary(result if result is not None else {}, message=(result or {}).get("message", ""))
+        except JobCancelled:
+            pass
+        except Exception as exc:
+            state["error"] = str(exc)
+            try:
+                with open(log_path, "a", encoding="utf-8") as log_file:
+                    log_file.write(traceback.format_exc())
+            except OSError:
+                pass
+        self._finish(job_id, state)
+
+    def _finish(self, job_id: str, state: dict) -> None:
+        with self._lock:
+            cancelled = job_id in self._cancelled
+            self._cancelled.discard(job_id)
+
+        if cancelled:
+            status = "cancelled"
+            message = "Cancelled."
+        elif state["error"] is None:
+            status = "succeeded"
+            message = state["message"] or "Completed."
+        else:
+            status = "failed"
+            message = state["error"]
+        # The job may have written frames inside the index throttle window; pages must see them.
+        file_index_utils.expire_indexes()
+        result = state["result"]
+        if isinstance(result, dict):
+            if state["timings"]:
+                result.setdefault("timings", state["timings"])
+            if state["warnings"]:
+                result.setdefault("warnings", state["warnings"])
+        self.store.update(
+            job_id,
+            status=status,
+            finished_at=time.time(),
+            progress_done=state["done"],
+            progress_total=state["total"],
+            message=message,
+            result=result,
+            error=state["error"] if status == "failed" else None,
+        )
+
+
+def _new_state() -> dict:
+    return {
+        "done": 0,
+        "total": 0,
+        "message": "",
+        "result": None,
+        "error": None,
+        "timings": {},
+        "warnings": [],
+        "last_write": 0.0,
+    }
+
+
+def _apply_event(state: dict, line: str) -> bool:
+    """Fold one stdout line into `state`; return True when it was an event."""
+    event = parse_event(line)
+    if event is None:
+        return False
+
+    kind = event["event"]
+    if kind in ("start", "progress"):
+        state["total"] = int(event.get("total", state["total"]) or 0)
+        state["done"] = int(event.get("done", state["done"]) or 0)
+        state["message"] = str(event.get("message", state["message"]))
+    elif kind == "timing":
+        state["timings"][str(event.get("stage", "stage"))] = event.get("seconds")
+    elif kind == "warning":
+        state["warnings"].append(str(event.get("message", "")))
+        state["message"] = f"Warning: {event.get('message', '')}"
+    elif kind == "summary":
+        state["result"] = event.get("result", {})
+        state["message"] = str(event.get("message", "Completed."))
+    elif kind == "error":
+        state["error"] = str(event.get("message", "Job failed."))
+    return True
+
+
+def get_manager() -> JobManager:
+    """Return the process-wide job manager (created on first use)."""
+    global _MANAGER
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            _MANAGER = JobManager()
+        return _MANAGER
+
+
+def list_jobs(kind: str = None, limit: int = 20) -> list:
+    """Return recent jobs, newest first."""
+    return get_manager().store.list(kind, limit)
+
+
+def get_job(job_id: str):
+    """Return one job row, or None."""
+    return get_manager().store.get(job_id)
+
+
+def latest_job(kind: str, status: str = None):
+    """Return the newest job of `kind`, optionally restricted to one status."""
+    for job in list_jobs(kind, limit=50):
+        if status is None or job["status"] == status:
+            return job
+    return None
+
+
+def job_rate_and_eta(job: dict):
+    """Return `(items_per_second, eta_seconds)` for a job; either may be None."""
+    started = job.get("started_at")
+    done = int(job.get("progress_done") or 0)
+    total = int(job.get("progress_total") or 0)
+    if not started or done <= 0:
+        return None, None
+    elapsed = (job.get("finished_at") or time.time()) - started
+    if elapsed <= 0:
+        return None, None
+    rate = done / elapsed
+    eta = (total - done) / rate if total > done and job["status"] == "running" else None
+    return rate, eta
+
+
+def read_log_tail(job: dict, max_lines: int = 20) -> str:
+    """Return the last `max_lines` lines of a job's log."""
+    try:
+        with open(job["log_path"], "r", encoding="utf-8", errors="replace") as file_obj:
+            lines = file_obj.readlines()
+    except OSError:
+        return ""
+    return "".join(lines[-max_lines:])
@@ -0,0 +1,290 @@
+"""Packed, memory-mappable YOLO labels per annotation folder.
+
+The `.txt` files stay the interchange format. Next to them, in the app cache,
+each folder gets:
+- `boxes.npy`: one contiguous float32 array of `(class_id, cx, cy, w, h)` rows for every label file;
+- `offsets.npy`: int64 start offsets, so file `i` owns `boxes[offsets[i]:offsets[i + 1]]`;
+- `files.json`: the file names with the size and mtime they had when packed.
+
+Opening a store stats every label file (in threads) and re-parses only the
+ones that changed. After that a lookup is a dict hit plus one `stat` of the
+requested file. A file edited since the last sync is parsed on its own and
+kept in memory. The store repacks once `MAX_OVERRIDES` such files pile up, or
+when the folder's mtime shows files were added, removed or replaced.
+One-shot scripts read files with `parse_label_file` and never pack a store.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from core import file_index as file_index_utils
+from core.cache_paths import cache_subdir
+
+
+LABEL_EXTENSIONS = (".txt",)
+CLASSES_FILE = "classes.txt"
+BOX_COLUMNS = 5
+
+DEFAULT_STORE_DIR = cache_subdir("label_store")
+SYNC_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Label files parsed per worker task when (re)packing.
+PARSE_CHUNK = 512
+# Files parsed outside the packed arrays before the store repacks itself.
+MAX_OVERRIDES = 256
+# Stores kept open (memory-mapped) at once; the least recently used is dropped.
+MAX_OPEN_STORES = 16
+
+_EMPTY = np.zeros((0, BOX_COLUMNS), dtype=np.float32)
+_EMPTY.setflags(write=False)
+
+_STORES: OrderedDict = OrderedDict()
+_STORES_LOCK = threading.Lock()
+
+
+# ---------------------------
+# Parsing
+# ---------------------------
+
+def parse_label_bytes(data: bytes) -> np.ndarray:
+    """
+    Parse YOLO label text into a `(boxes, 5)` float32 array.
+    Lines need 5 values, or 6 with a trailing confidence; other lines are skipped.
+    """
+    tokens = []
+    for line in data.splitlines():
+        parts = line.split()
+        if len(parts) in (5, 6):
+            tokens.extend(parts[:BOX_COLUMNS])
+    if not tokens:
+        return _EMPTY
+    try:
+        return np.asarray(tokens, dtype=np.bytes_).astype(np.float32).reshape(-1, BOX_COLUMNS)
+    except ValueError:
+        rows = []
+        for start in range(0, len(tokens), BOX_COLUMNS):
+            try:
+                rows.append([float(token) for token in tokens[start:start + BOX_COLUMNS]])
+            except ValueError:
+                continue
+        return np.asarray(rows, dtype=np.float32).reshape(-1, BOX_COLUMNS)
+
+
+def parse_label_file(path: Path) -> np.ndarray:
+    """Parse one label file; missing or unreadable files have no boxes."""
+    try:
+        with open(path, "rb") as label_file:
+            return parse_label_bytes(label_file.read())
+    except OSError:
+        return _EMPTY
+
+
+def _file_signature(path: Path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _parse_chunk(paths) -> list:
+    return [parse_label_file(path) for path in paths]
+
+
+# ---------------------------
+# Store
+# ---------------------------
+
+class LabelStore:
+    """Packed labels of the `.txt` files directly inside one folder."""
+
+    def __init__(self, folder: Path, store_dir: Path = DEFAULT_STORE_DIR):
+        self.folder = Path(folder).resolve()
+        digest = hashlib.sha1(str(self.folder).encode("utf-8")).hexdigest()[:16]
+        self.store_dir = Path(store_dir) / digest
+        self._lock = threading.RLock()
+        self._names: list = []
+        self._signatures: list = []
+        self._rows: dict = {}
+        self._boxes = _EMPTY
+        self._offsets = np.zeros(1, dtype=np.int64)
+        # Files parsed since the last sync: name -> (signature, boxes).
+        self._overrides: dict = {}
+        # Folder mtime at the last sync; files added, removed or replaced change it.
+        self.synced_mtime_ns = None
+        self._load()
+
+    def _load(self):
+        manifest_path = self.store_dir / "files.json"
+        try:
+            manifest = json.loads(manifest_path.read_text())
+            boxes = np.load(self.store_dir / "boxes.npy", mmap_mode="r")
+            offsets = np.load(self.store_dir / "offsets.npy", mmap_mode="r")
+        except (OSError, ValueError):
+            return
+        files = manifest.get("files", [])
+        if (
+            manifest.get("folder") != str(self.folder)
+            or len(offsets) != len(files) + 1
+            or int(offsets[-1]) != len(boxes)
+            or boxes.ndim != 2
+            or boxes.shape[1] != BOX_COLUMNS
+        ):
+            return
+        self._names = [name for name, _, _ in files]
+        self._signatures = [(size, mtime_ns) for _, size, mtime_ns in files]
+        self._rows = {name: row for row, name in enumerate(self._names)}
+        self._boxes = boxes
+        self._offsets = offsets
+
+    def _persist(self):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        token = f"{os.getpid()}.{threading.get_ident()}"
+        # Arrays first, the manifest last: a reader never sees a manifest for arrays that are not there.
+        for name, array in (("boxes.npy", self._boxes), ("offsets.npy", self._offsets)):
+            tmp_path = self.store_dir / f"{name}.{token}.tmp"
+            with open(tmp_path, "wb") as out:
+                np.save(out, np.ascontiguousarray(array))
+            os.replace(tmp_path, self.store_dir / name)
+        manifest = {
+            "folder": str(self.folder),
+            "files": [[name, size, mtime_ns] for name, (size, mtime_ns) in zip(self._names, self._signatures)],
+        }
+        tmp_path = self.store_dir / f"files.json.{token}.tmp"
+        tmp_path.write_text(json.dumps(manifest))
+        os.replace(tmp_path, self.store_dir / "files.json")
+
+    def sync(self, workers: int = SYNC_WORKERS) -> bool:
+        """Bring the packed arrays in line with the `.txt` files; return True if anything changed."""
+        with self._lock:
+            self.synced_mtime_ns = _folder_mtime(self.folder)
+            paths = [
+                path for path in file_index_utils.list_indexed(self.folder, LABEL_EXTENSIONS, recursive=False)
+                if path.name != CLASSES_FILE
+            ]
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                signatures = list(pool.map(_file_signature, paths, chunksize=256))
+
+            names = [path.name for path in paths]
+            reuse, stale = {}, []
+            for name, path, signature in zip(names, paths, signatures):
+                row = self._rows.get(name)
+                override = self._overrides.get(name)
+                if override is not None and override[0] == signature:
+                    reuse[name] = override[1]
+                elif row is not None and self._signatures[row] == signature:
+                    reuse[name] = self._boxes[self._offsets[row]:self._offsets[row + 1]]
+                else:
+                    stale.append(path)
+
+            if not stale and names == self._names and not self._overrides:
+                return False
+
+            chunks = [stale[start:start + PARSE_CHUNK] for start in range(0, len(stale), PARSE_CHUNK)]
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                for chunk, parsed in zip(chunks, pool.map(_parse_chunk, chunks)):
+                    for path, boxes in zip(chunk, parsed):
+                        reuse[path.name] = boxes
+
+            parts = [reuse[name] for name in names]
+            counts = np.fromiter((len(part) for part in parts), dtype=np.int64, count=len(parts))
+            offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+            np.cumsum(counts, out=offsets[1:])
+            boxes = np.concatenate(parts).astype(np.float32, copy=False) if parts else _EMPTY
+
+            self._names = names
+            self._signatures = [signature or (0, 0) for signature in signatures]
+            self._rows = {name: row for row, name in enumerate(names)}
+            self._boxes = boxes
+            self._offsets = offsets
+            self._overrides = {}
+            self._persist()
+            return True
+
+    def boxes(self, label_path) -> np.ndarray:
+        """
+        Return the `(k, 5)` float32 rows of one label file (read-only; empty when it has no labels).
+        One `stat` confirms the packed copy is current, otherwise the file is parsed on its own.
+        """
+        label_path = Path(label_path)
+        name = label_path.name
+        signature = _file_signature(label_path)
+        if signature is None:
+            return _EMPTY
+        with self._lock:
+            override = self._overrides.get(name)
+            if override is not None and override[0] == signature:
+                return override[1]
+            row = self._rows.get(name)
+            if row is not None and self._signatures[row] == signature:
+                return self._boxes[self._offsets[row]:self._offsets[row + 1]]
+        boxes = parse_label_file(label_path)
+        boxes.setflags(write=False)
+        with self._lock:
+            self._overrides[name] = (signature, boxes)
+            repack = len(self._overrides) > MAX_OVERRIDES
+        if repack:
+            self.sync()
+        return boxes
+
+    def is_stale(self) -> bool:
+        """True when files were added, removed or replaced in the folder since the last sync."""
+        return self.synced_mtime_ns != _folder_mtime(self.folder)
+
+    def __len__(self):
+        return len(self._names)
+
+    @property
+    def arrays(self) -> tuple:
+        """`(names, boxes, offsets)` as packed at the last sync."""
+        with self._lock:
+            return list(self._names), self._boxes, self._offsets
+
+
+def _folder_mtime(folder: Path):
+    try:
+        return os.stat(folder).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_store(folder: Path, sync: bool = True) -> LabelStore:
+    """
+    Return the shared store for `folder`, synced when it is opened and whenever the folder's mtime changed.
+    At most `MAX_OPEN_STORES` stores stay open.
+    """
+    key = str(Path(folder).resolve())
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = LabelStore(Path(folder))
+            _STORES[key] = store
+            while len(_STORES) > MAX_OPEN_STORES:
+                _STORES.popitem(last=False)
+        else:
+            _STORES.move_to_end(key)
+    if sync and store.is_stale():
+        store.sync()
+    return store
+
+
+def read_labels(label_path) -> np.ndarray:
+    """
+    Return the `(k, 5)` float32 `(class_id, cx, cy, w, h)` rows of a label file through its folder's store.
+    One-shot scripts should call `parse_label_file` instead, which reads the file without packing the folder.
+    """
+    label_path = Path(label_path)
+    if not label_path.parent.is_dir():
+        return _EMPTY
+    return get_store(label_path.parent).boxes(label_path)
+
+
+def read_label_tuples(label_path) -> list:
+    """Like `read_labels`, as `(class_id, cx, cy, w, h)` tuples with an int class id."""
+    return [(int(row[0]), *row[1:]) for row in read_labels(label_path).tolist()]
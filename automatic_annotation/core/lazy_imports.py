@@ -0,0 +1,63 @@
+"""Deferred imports for heavy optional dependencies.
+
+`lazy_module("cv2")` returns a stand-in module that performs the real import
+on first attribute access, so pages that never touch OpenCV, pandas or the
+gallery/metrics modules don't pay for loading them at startup.
+
+A plain `importlib.import_module` proxy is used instead of
+`importlib.util.LazyLoader` because some packages (OpenCV among them)
+replace their own `sys.modules` entry while importing, which LazyLoader does
+not support.
+"""
+
+import importlib
+import sys
+import threading
+import types
+
+
+_LOAD_LOCK = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that imports `name` on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self):
+        target = self.__dict__["_lazy_target"]
+        if target is None:
+            with _LOAD_LOCK:
+                target = self.__dict__["_lazy_target"]
+                if target is None:
+                    target = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_target"] = target
+        return target
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._load(), attr)
+        # Cache on the stand-in so later lookups skip __getattr__.
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_target"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_module(name: str):
+    """Return `name` if already imported, else a stand-in that imports it on first use."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """Return True when `name` has really been imported in this process."""
+    return name in sys.modules
@@ -0,0 +1,174 @@
+"""Cached, precomputed views over the comparison metrics CSV.
+
+Model Comparison and Insights read the same `metrics.csv` on every Streamlit
+rerun. This module parses it once per file signature (see
+`insights_chat.detect_metrics_signature`) and keeps the derived tables the
+pages render, so widget interactions only pay for drawing.
+
+Returned views are shared between reruns: treat every frame as read-only and
+`.copy()` before mutating.
+"""
+
+from __future__ import annotations
+
+import io
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from core import comparison_metrics as cmp_utils
+from core import insights_chat as insights_chat_utils
+
+
+# Number of distinct metrics sources (signatures) kept in memory.
+MAX_CACHED_VIEWS = 4
+
+# Bytes compared before the previous end of file to detect in-place rewrites.
+APPEND_CHECK_BYTES = 256
+
+_VIEW_CACHE: dict[str, dict] = {}
+_RAW_STATE: dict[str, dict] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _read_head_line(path: Path) -> bytes:
+    with open(path, "rb") as file_obj:
+        return file_obj.readline()
+
+
+def _read_tail_bytes(path: Path, end: int) -> bytes:
+    start = max(0, end - APPEND_CHECK_BYTES)
+    with open(path, "rb") as file_obj:
+        file_obj.seek(start)
+        return file_obj.read(end - start)
+
+
+def _load_raw_from_path(path: Path) -> pd.DataFrame:
+    """Parse a metrics CSV, reusing the previous parse when rows were only appended."""
+    key = str(path.resolve())
+    stat = path.stat()
+    previous = _RAW_STATE.get(key)
+
+    raw_df = None
+    if previous is not None and stat.st_size > previous["size"] and previous["tail"].endswith(b"\n"):
+        try:
+            unchanged = (
+                _read_head_line(path) == previous["header"]
+                and _read_tail_bytes(path, previous["size"]) == previous["tail"]
+            )
+            if unchanged:
+                with open(path, "rb") as file_obj:
+                    file_obj.seek(previous["size"])
+                    appended = file_obj.read(stat.st_size - previous["size"])
+                new_rows = pd.read_csv(io.BytesIO(appended), header=None)
+                if len(new_rows.columns) == len(previous["raw"].columns):
+                    new_rows.columns = previous["raw"].columns
+                    raw_df = pd.concat([previous["raw"], new_rows], ignore_index=True)
+        except Exception:
+            raw_df = None
+
+    if raw_df is None:
+        raw_df = pd.read_csv(path)
+
+    _RAW_STATE[key] = {
+        "size": stat.st_size,
+        "header": _read_head_line(path),
+        "tail": _read_tail_bytes(path, stat.st_size),
+        "raw": raw_df,
+    }
+    return raw_df
+
+
+def _load_raw(metrics_source) -> pd.DataFrame:
+    if metrics_source is None:
+        return pd.DataFrame()
+
+    try:
+        if hasattr(metrics_source, "getvalue"):
+            if hasattr(metrics_source, "seek"):
+                metrics_source.seek(0)
+            return pd.read_csv(metrics_source)
+
+        path = Path(metrics_source)
+        if not path.exists():
+            return pd.DataFrame()
+        return _load_raw_from_path(path)
+    except Exception:
+        return pd.DataFrame()
+
+
+def build_metrics_views(raw_df: pd.DataFrame, signature: str = "") -> dict:
+    """Compute every derived table the metrics pages render from one raw frame."""
+    views = {
+        "signature": signature,
+        "raw": raw_df,
+        "frame": raw_df,
+        "columns": None,
+        "f1_series": pd.Series(dtype=float),
+        "latest_rows": pd.DataFrame(),
+        "latest_by_model": {},
+        "per_class_tables": {},
+        "class_keys": [],
+        "class_analysis": [],
+        "snapshot": insights_chat_utils.build_workspace_snapshot(pd.DataFrame()),
+    }
+    if raw_df.empty:
+        return views
+
+    frame = insights_chat_utils.prepare_metrics_frame(raw_df)
+    model_col, date_col, prec_col, rec_col = insights_chat_utils.resolve_metric_columns(frame)
+
+    latest_rows = frame.sort_values(date_col).groupby(model_col, as_index=False).tail(1).copy()
+    latest_rows["F1-Score"] = latest_rows.apply(lambda row: cmp_utils.row_f1_value(row, prec_col, rec_col), axis=1)
+
+    latest_by_model = {}
+    per_class_tables = {}
+    for _, row in latest_rows.iterrows():
+        latest_by_model[row[model_col]] = row
+        per_class_tables[row[model_col]] = cmp_utils.build_per_class_table(row)
+
+    views.update(
+        {
+            "frame": frame,
+            "columns": (model_col, date_col, prec_col, rec_col),
+            "f1_series": cmp_utils.build_f1_series(frame, prec_col, rec_col),
+            "latest_rows": latest_rows,
+            "latest_by_model": latest_by_model,
+            "per_class_tables": per_class_tables,
+            "class_keys": insights_chat_utils.extract_class_keys(frame),
+            "class_analysis": insights_chat_utils.build_class_analysis(frame),
+            "snapshot": insights_chat_utils.build_workspace_snapshot(frame),
+        }
+    )
+    return views
+
+
+def load_metrics_views(metrics_source) -> dict:
+    """Return cached metrics views, rebuilding only when the source signature changes."""
+    signature = insights_chat_utils.detect_metrics_signature(metrics_source)
+
+    with _CACHE_LOCK:
+        cached = _VIEW_CACHE.get(signature)
+        if cached is not None:
+            return cached
+
+        views = build_metrics_views(_load_raw(metrics_source), signature=signature)
+        _VIEW_CACHE[signature] = views
+        while len(_VIEW_CACHE) > MAX_CACHED_VIEWS:
+            _VIEW_CACHE.pop(next(iter(_VIEW_CACHE)))
+        return views
+
+
+def invalidate_metrics_views(metrics_source=None) -> None:
+    """Drop cached views for one source, or everything when no source is given."""
+    with _CACHE_LOCK:
+        if metrics_source is None:
+            _VIEW_CACHE.clear()
+            _RAW_STATE.clear()
+            return
+
+        signature = insights_chat_utils.detect_metrics_signature(metrics_source)
+        _VIEW_CACHE.pop(signature, None)
+        if not hasattr(metrics_source, "getvalue"):
+            _RAW_STATE.pop(str(Path(metrics_source).resolve()), None)
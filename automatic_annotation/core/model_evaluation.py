@@ -0,0 +1,251 @@
+"""Model-vs-ground-truth evaluation used by the Model Comparison page.
+
+Lives outside the page script so evaluations can run in a background job
+worker while the page keeps rendering.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import pandas as pd
+
+from core import comparison_metrics as cmp_utils
+from core import model_registry as model_registry_utils
+
+
+COMPARE_BASE_DIR = Path(__file__).resolve().parent.parent / "Model_Compare"
+
+
+def compare_paths(compare_base_dir: Path = COMPARE_BASE_DIR) -> dict:
+    """Return the standard comparison folder layout under `compare_base_dir`."""
+    base = Path(compare_base_dir)
+    return {
+        "model": base / "model",
+        "new_model": base / "new_model",
+        "ground_truth": base / "ground_truth",
+        "output": base / "output",
+        "metrics_csv": base / "metrics.csv",
+    }
+
+
+def get_class_label_map(ground_truth_dir: Path):
+    """Load class id -> label map from comparison ground-truth classes file."""
+    class_file = ground_truth_dir / "class" / "classes.txt"
+    class_map = {}
+    if class_file.exists():
+        try:
+            with open(class_file, "r") as f:
+                for idx, line in enumerate(f):
+                    label = line.strip()
+                    if label:
+                        class_map[idx] = label
+        except Exception:
+            pass
+    return class_map
+
+
+def run_model_comparison(model_name, conf_threshold=0.5, iou_threshold=0.5, compare_base_dir: Path = COMPARE_BASE_DIR, progress_callback=None, model_loader=None):
+    """Run full model evaluation against comparison ground-truth dataset.
+
+    `progress_callback(done, total, message)` is called after every frame when given.
+    `model_loader(path)` returns a model (defaults to a fresh YOLO instance).
+    Model load failures are reported in `results['error']`.
+    """
+    if model_loader is None:
+        from ultralytics import YOLO
+
+        model_loader = YOLO
+
+    paths = compare_paths(compare_base_dir)
+
+    results = {
+        'model': model_name,
+        'precision': 0.0,
+        'recall': 0.0,
+        'f1_score': 0.0,
+        'total_frames': 0,
+        'matched_boxes': 0,
+        'false_positives': 0,
+        'false_negatives': 0,
+        'eval_conf_threshold': float(conf_threshold),
+        'eval_iou_threshold': float(iou_threshold),
+        'timestamp': datetime.now().isoformat()
+    }
+    
+    # Get model path
+    if model_name == "Latest (new_model)":
+        model_path = model_registry_utils.latest_model(paths["new_model"])
+        if model_path is None:
+            return results
+        output_model_name = "new_model"
+    else:
+        model_path = paths["model"] / f"{model_name}.pt"
+        output_model_name = model_name
+    
+    if not model_path.exists():
+        return results
+    
+    # Load model
+    try:
+        model = model_loader(str(model_path))
+    except Exception as e:
+        results['error'] = f"Failed to load model: {e}"
+        return results
+    
+    # Get ground truth images
+    gt_imgs = sorted(list(paths["ground_truth"].glob("*.jpg")) + list(paths["ground_truth"].glob("*.png")))
+    
+    # Create output directory for predictions
+    pred_output_dir = paths["output"] / output_model_name
+    pred_output_dir.mkdir(parents=True, exist_ok=True)
+    
+    total_matches = 0
+    total_fp = 0
+    total_fn = 0
+    class_label_map = get_class_label_map(paths["ground_truth"])
+    per_class_totals = {}
+    frame_errors = 0
+    
+    for frame_idx, gt_img in enumerate(gt_imgs, start=1):
+        gt_txt = gt_img.with_suffix(".txt")
+        if progress_callback is not None:
+            progress_callback(frame_idx - 1, len(gt_imgs), gt_img.name)
+        
+        if not gt_txt.exists():
+            continue
+        
+        # Run inference on image
+        try:
+            results_yolo = model(str(gt_img), conf=float(conf_threshold), verbose=False)
+            
+            # Save predictions to txt file
+            pred_txt = pred_output_dir / f"{gt_img.stem}.txt"
+            pred_txt.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Extract predictions from YOLO results
+            predictions = []
+            if len(results_yolo) > 0 and results_yolo[0].boxes is not None:
+                boxes = results_yolo[0].boxes
+                h, w = results_yolo[0].orig_shape
+                
+                for box in boxes:
+                    # Convert to YOLO format (normalized center coordinates)
+                    x_center = (box.xywh[0][0] / w).item()
+                    y_center = (box.xywh[0][1] / h).item()
+                    box_width = (box.xywh[0][2] / w).item()
+                    box_height = (box.xywh[0][3] / h).item()
+                    class_id = int(box.cls[0].item())
+                    predictions.append(f"{class_id} {x_center:.6f} {y_center:.6f} {box_width:.6f} {box_height:.6f}\n")
+            
+            # Write predictions
+            with open(pred_txt, 'w') as f:
+                f.writelines(predictions)
+            
+            # Compare annotations
+            h, w = results_yolo[0].orig_shape if len(results_yolo) > 0 else (0, 0)
+            metrics = cmp_utils.compare_annotations(gt_txt, pred_txt, (w, h), iou_threshold=float(iou_threshold))
+            total_matches += metrics['matches']
+            total_fp += metrics['false_positives']
+            total_fn += metrics['false_negatives']
+            results['total_frames'] += 1
+
+            for class_id, class_stats in metrics.get('per_class', {}).items():
+                per_class_totals.setdefault(class_id, {'tp': 0, 'fp': 0, 'fn': 0})
+                per_class_totals[class_id]['tp'] += class_stats.get('tp', 0)
+                per_class_totals[class_id]['fp'] += class_stats.get('fp', 0)
+                per_class_totals[class_id]['fn'] += class_stats.get('fn', 0)
+
+            preview_img = cv2.imread(str(gt_img))
+            if preview_img is not None:
+                gt_boxes = cmp_utils.parse_yolo_annotation(gt_txt)
+                for class_id, x_c, y_c, bw, bh in gt_boxes:
+                    x1 = int(max(0, (x_c - bw / 2) * w))
+                    y1 = int(max(0, (y_c - bh / 2) * h))
+                    x2 = int(min(w, (x_c + bw / 2) * w))
+                    y2 = int(min(h, (y_c + bh / 2) * h))
+                    label = class_label_map.get(class_id, f"class_{class_id}")
+                    cv2.rectangle(preview_img, (x1, y1), (x2, y2), (0, 255, 0), 2)
+                    cv2.putText(preview_img, f"GT:{label}", (x1, max(20, y1 - 6)), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 0), 1)
+
+                if len(results_yolo) > 0 and results_yolo[0].boxes is not None:
+                    for box in results_yolo[0].boxes:
+                        x1, y1, x2, y2 = box.xyxy[0].tolist()
+                        class_id = int(box.cls[0].item())
+                        conf = float(box.conf[0].item())
+                        label = class_label_map.get(class_id, f"class_{class_id}")
+                        cv2.rectangle(preview_img, (int(x1), int(y1)), (int(x2), int(y2)), (32, 64, 255), 2)
+                        cv2.putText(preview_img, f"P:{label} {conf:.2f}", (int(x1), min(h - 8, int(y2) + 14)), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (32, 64, 255), 1)
+
+                cv2.imwrite(str(pred_output_dir / gt_img.name), preview_img)
+            
+        except Exception as e:
+            frame_errors += 1
+            continue
+    
+    if progress_callback is not None:
+        progress_callback(len(gt_imgs), len(gt_imgs), "done")
+
+    # Calculate metrics
+    results['matched_boxes'] = total_matches
+    results['false_positives'] = total_fp
+    results['false_negatives'] = total_fn
+    results['frame_errors'] = frame_errors
+    
+    if total_matches + total_fp > 0:
+        results['precision'] = total_matches / (total_matches + total_fp)
+    if total_matches + total_fn > 0:
+        results['recall'] = total_matches / (total_matches + total_fn)
+    if results['precision'] + results['recall'] > 0:
+        results['f1_score'] = 2 * (results['precision'] * results['recall']) / (results['precision'] + results['recall'])
+
+    for class_id, stats in per_class_totals.items():
+        tp = stats.get('tp', 0)
+        fp = stats.get('fp', 0)
+        fn = stats.get('fn', 0)
+        class_precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
+        class_recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
+        class_name = cmp_utils.metric_safe_label(class_label_map.get(class_id, f"class_{class_id}"))
+        results[f'precision_{class_name}'] = class_precision
+        results[f'recall_{class_name}'] = class_recall
+    
+    return results
+
+
+def save_metrics_to_csv(metrics_dict, metrics_csv: Path):
+    """Append one metrics row to the comparison metrics CSV."""
+    df_new = pd.DataFrame([metrics_dict])
+    if metrics_csv.exists():
+        df_existing = pd.read_csv(metrics_csv)
+        df_combined = pd.concat([df_existing, df_new], ignore_index=True)
+    else:
+        df_combined = df_new
+    df_combined.to_csv(metrics_csv, index=False)
+
+
+def evaluate_and_log(model_name, conf_threshold=0.5, iou_threshold=0.5, compare_base_dir: Path = COMPARE_BASE_DIR, progress_callback=None, model_loader=None) -> dict:
+    """Evaluate one model and append its metrics row when the run produced evidence.
+
+    Returns the metrics plus `saved` (bool) and a user-facing `message`.
+    """
+    results = run_model_comparison(
+        model_name,
+        conf_threshold=conf_threshold,
+        iou_threshold=iou_threshold,
+        compare_base_dir=compare_base_dir,
+        progress_callback=progress_callback,
+        model_loader=model_loader,
+    )
+    total_activity = results['matched_boxes'] + results['false_positives'] + results['false_negatives']
+    results['saved'] = False
+    if results.get('error'):
+        results['message'] = results['error']
+    elif results.get('total_frames', 0) == 0:
+        results['message'] = "No frames were processed. Metrics entry was not saved."
+    elif total_activity == 0:
+        results['message'] = "Evaluation found no GT/prediction boxes. Metrics entry was not saved."
+    else:
+        save_metrics_to_csv({key: value for key, value in results.items() if key not in {'saved', 'message'}}, compare_paths(compare_base_dir)["metrics_csv"])
+        results['saved'] = True
+        results['message'] = f"Comparison completed.\nPrecision: {results['precision']:.2%} | Recall: {results['recall']:.2%} | F1: {results['f1_score']:.2%}"
+    return results
@@ -0,0 +1,198 @@
+"""Process-wide registry of loaded detection models and model-folder listings.
+
+Constructing a YOLO model costs seconds (weights from disk, fusing, device
+transfer). The registry keeps recently used models in memory keyed by path,
+mtime and size, so a repeat evaluation starts inference immediately and a
+retrained checkpoint saved over the old file is picked up automatically.
+Entries are evicted least-recently-used past an entry count or an estimated
+memory budget.
+
+Folder listings (`list_models`, `latest_model`) are cached per directory
+mtime and only re-stat known files after `LISTING_TTL_S`, so reruns don't
+re-glob model folders.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+import threading
+import time
+
+
+MODEL_CACHE_MAX_ENTRIES = 3
+
+# Loaded weights (plus fused layers and device copies) take a small multiple
+# of the checkpoint size; this is only an estimate for the budget below.
+MODEL_MEMORY_FACTOR = 3
+MODEL_CACHE_MAX_BYTES = 3 * 1024 * 1024 * 1024
+
+LISTING_TTL_S = 2.0
+
+_REGISTRY = None
+_REGISTRY_LOCK = threading.Lock()
+_LISTINGS: dict = {}
+_LISTINGS_LOCK = threading.Lock()
+
+
+def model_key(path: Path):
+    """Return `(resolved path, mtime_ns, size)` for a model file."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _default_loader(path: str):
+    from ultralytics import YOLO
+
+    return YOLO(path)
+
+
+class ModelRegistry:
+    """Thread-safe LRU of loaded models bounded by count and estimated memory."""
+
+    def __init__(
+        self,
+        max_entries: int = MODEL_CACHE_MAX_ENTRIES,
+        max_bytes: int = MODEL_CACHE_MAX_BYTES,
+        loader=_default_loader,
+    ):
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self.loader = loader
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._load_locks: dict[tuple, threading.Lock] = {}
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "load_seconds": 0.0}
+
+    def get(self, path: Path):
+        """Return the loaded model for `path`, loading it at most once per file version."""
+        key = model_key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Concurrent requests for the same file wait for one load instead of racing.
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry[0]
+
+            started = time.perf_counter()
+            model = self.loader(key[0])
+            elapsed = time.perf_counter() - started
+
+            with self._lock:
+                self.stats["misses"] += 1
+                self.stats["load_seconds"] += elapsed
+                self._drop_stale_versions(key[0])
+                estimate = key[2] * MODEL_MEMORY_FACTOR
+                self._entries[key] = (model, estimate)
+                self._bytes += estimate
+                self._evict()
+                self._load_locks.pop(key, None)
+            return model
+
+    def _drop_stale_versions(self, path_str: str) -> None:
+        for key in [key for key in self._entries if key[0] == path_str]:
+            _, estimate = self._entries.pop(key)
+            self._bytes -= estimate
+
+    def _evict(self) -> None:
+        # Always keep the newest entry, even when it alone exceeds the budget.
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, estimate) = self._entries.popitem(last=False)
+            self._bytes -= estimate
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+def get_registry() -> ModelRegistry:
+    """Return the process-wide model registry."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = ModelRegistry()
+        return _REGISTRY
+
+
+def load_model(path: Path):
+    """Return a cached model for `path` from the shared registry."""
+    return get_registry().get(path)
+
+
+def list_models(model_dir: Path, pattern: str = "*.pt") -> tuple:
+    """Return `(path, mtime)` pairs for models in `model_dir`, sorted by name."""
+    model_dir = Path(model_dir)
+    try:
+        dir_mtime = model_dir.stat().st_mtime_ns
+    except OSError:
+        return ()
+
+    cache_key = (str(model_dir.resolve()), pattern)
+    now = time.monotonic()
+    with _LISTINGS_LOCK:
+        cached = _LISTINGS.get(cache_key)
+    if cached is not None and cached[0] == dir_mtime:
+        if now - cached[1] < LISTING_TTL_S:
+            return cached[2]
+        # Same set of files; only re-stat them to catch checkpoints overwritten in place.
+        entries = []
+        for path, _ in cached[2]:
+            try:
+                entries.append((path, path.stat().st_mtime))
+            except OSError:
+                entries = None
+                break
+        if entries is not None:
+            entries = tuple(entries)
+            with _LISTINGS_LOCK:
+                _LISTINGS[cache_key] = (dir_mtime, now, entries)
+            return entries
+
+    entries = []
+    for path in sorted(model_dir.glob(pattern)):
+        try:
+            entries.append((path, path.stat().st_mtime))
+        except OSError:
+            continue
+    entries = tuple(entries)
+    with _LISTINGS_LOCK:
+        _LISTINGS[cache_key] = (dir_mtime, now, entries)
+    return entries
+
+
+def latest_model(model_dir: Path, pattern: str = "*.pt"):
+    """Return the most recently modified model path in `model_dir`, or None."""
+    entries = list_models(model_dir, pattern)
+    if not entries:
+        return None
+    return max(entries, key=lambda entry: entry[1])[0]
+
+
+def invalidate_listings(model_dir: Path = None) -> None:
+    """Forget cached listings for one folder, or all of them."""
+    with _LISTINGS_LOCK:
+        if model_dir is None:
+            _LISTINGS.clear()
+            return
+        resolved = str(Path(model_dir).resolve())
+        for key in [key for key in _LISTINGS if key[0] == resolved]:
+            _LISTINGS.pop(key, None)
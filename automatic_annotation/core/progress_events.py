@@ -0,0 +1,130 @@
+"""JSON-lines progress protocol shared by the CLI runners and the job runner.
+
+Runners started with `--json-progress` print one JSON object per line on
+stdout, next to (not instead of) their human-readable output:
+
+    {"event": "start", "v": 1, "task": "filter", "total": 120}
+    {"event": "progress", "done": 12, "total": 120, "elapsed_s": 3.1, "rate": 3.9, "message": "frame12.jpg"}
+    {"event": "timing", "stage": "model_load", "seconds": 1.84}
+    {"event": "warning", "message": "Could not read frame7.jpg"}
+    {"event": "summary", "result": {...}, "elapsed_s": 30.2, "message": "..."}
+    {"event": "error", "message": "..."}
+
+Consumers should ignore any line that `parse_event` rejects.
+"""
+
+from contextlib import contextmanager
+import json
+import sys
+import time
+
+
+PROTOCOL_VERSION = 1
+EVENT_TYPES = ("start", "progress", "timing", "warning", "summary", "error")
+JSON_PROGRESS_FLAG = "--json-progress"
+
+# Progress lines are throttled to this interval; the final item always emits.
+MIN_PROGRESS_INTERVAL_S = 0.2
+
+
+class ProgressReporter:
+    """Emit protocol events for one task; a disabled reporter is a no-op."""
+
+    def __init__(self, task: str, enabled: bool = True, stream=None, min_interval_s: float = MIN_PROGRESS_INTERVAL_S):
+        self.task = task
+        self.enabled = bool(enabled)
+        self.stream = stream
+        self.min_interval_s = float(min_interval_s)
+        self.total = 0
+        self._started = time.perf_counter()
+        self._last_progress = 0.0
+
+    def _emit(self, event: str, **fields) -> None:
+        if not self.enabled:
+            return
+        stream = self.stream or sys.stdout
+        stream.write(json.dumps({"event": event, **fields}, default=str) + "\n")
+        stream.flush()
+
+    @property
+    def elapsed_s(self) -> float:
+        return time.perf_counter() - self._started
+
+    def start(self, total: int = 0, **fields) -> None:
+        self.total = int(total)
+        self._started = time.perf_counter()
+        self._emit("start", v=PROTOCOL_VERSION, task=self.task, total=self.total, **fields)
+
+    def progress(self, done: int, total: int = None, message: str = "", force: bool = False) -> None:
+        if total is not None:
+            self.total = int(total)
+        now = time.perf_counter()
+        finished = self.total and int(done) >= self.total
+        if not (force or finished) and now - self._last_progress < self.min_interval_s:
+            return
+        self._last_progress = now
+        elapsed = now - self._started
+        self._emit(
+            "progress",
+            done=int(done),
+            total=self.total,
+            elapsed_s=round(elapsed, 3),
+            rate=round(int(done) / elapsed, 3) if elapsed > 0 else None,
+            message=str(message),
+        )
+
+    def timing(self, stage: str, seconds: float) -> None:
+        self._emit("timing", stage=stage, seconds=round(float(seconds), 4))
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block and report it as a `timing` event."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timing(name, time.perf_counter() - started)
+
+    def warning(self, message: str) -> None:
+        self._emit("warning", message=str(message))
+
+    def summary(self, result: dict, message: str = "") -> None:
+        self._emit("summary", result=result, elapsed_s=round(self.elapsed_s, 3), message=message or "Completed.")
+
+    def error(self, message: str) -> None:
+        self._emit("error", message=str(message))
+
+    def callback(self):
+        """Return a `progress_callback(done, total, message)` bound to this reporter."""
+        return lambda done, total, message="": self.progress(done, total, message)
+
+
+def parse_event(line: str):
+    """Return the event dict encoded on `line`, or None for ordinary output.
+
+    A bare JSON object without an `event` key (what runners printed before
+    this protocol) is returned as a `summary` event.
+    """
+    line = line.strip()
+    if not line.startswith("{"):
+        return None
+    try:
+        payload = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    if "event" not in payload:
+        return {"event": "summary", "result": payload}
+    if payload["event"] not in EVENT_TYPES:
+        return None
+    return payload
+
+
+def add_json_progress_argument(parser) -> None:
+    """Register the shared `--json-progress` flag on an argparse parser."""
+    parser.add_argument(
+        JSON_PROGRESS_FLAG,
+        action="store_true",
+        help="Also print machine-readable JSON-lines progress events on stdout",
+    )
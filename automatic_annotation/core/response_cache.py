@@ -0,0 +1,141 @@
+"""Persistent cache of Insights chat answers.
+
+The same questions get asked again and again against the same `metrics.csv`,
+and each provider round trip is paid and takes seconds. Answers are stored in
+SQLite, keyed by:
+- the metrics signature,
+- the normalized prompt,
+- a hash of the retrieved context,
+- the provider and the model.
+
+A new metrics version, or a different retrieval, therefore never returns a
+stale answer. Entries expire after `RESPONSE_TTL_S`. Beyond
+`MAX_CACHED_RESPONSES`, the least recently used entries are dropped.
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+from core.cache_paths import cache_subdir
+
+
+DEFAULT_CACHE_PATH = cache_subdir("insights") / "responses.sqlite"
+
+RESPONSE_TTL_S = 7 * 24 * 3600
+MAX_CACHED_RESPONSES = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    text TEXT NOT NULL,
+    meta TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at);
+"""
+
+_CACHES: dict = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lower-case, collapse whitespace and drop trailing punctuation so trivially different phrasings share a key."""
+    text = re.sub(r"\s+", " ", str(prompt or "")).strip().lower()
+    return text.rstrip(" ?!.")
+
+
+def response_key(signature: str, prompt: str, context: str, provider: str, model: str) -> str:
+    """Return the cache key of one question against one metrics version, retrieval and model."""
+    context_hash = hashlib.sha256(str(context or "").encode("utf-8")).hexdigest()
+    parts = [signature, normalize_prompt(prompt), context_hash, provider, model]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed answer store with TTL and least-recently-used eviction."""
+
+    def __init__(self, db_path: Path = DEFAULT_CACHE_PATH, ttl_s: float = RESPONSE_TTL_S, max_entries: int = MAX_CACHED_RESPONSES):
+        self.db_path = Path(db_path)
+        self.ttl_s = float(ttl_s)
+        self.max_entries = int(max_entries)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def get(self, key: str):
+        """Return `{"text", "meta", "created_at", "hits"}` for a live entry, or None."""
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT text, meta, created_at, hits FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if now - row[2] > self.ttl_s:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                conn.execute("UPDATE responses SET used_at = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        except sqlite3.Error:
+            return None
+        return {"text": row[0], "meta": json.loads(row[1]), "created_at": row[2], "hits": row[3] + 1}
+
+    def put(self, key: str, text: str, signature: str, prompt: str, provider: str, model: str, meta: dict = None) -> None:
+        """Store an answer, then drop expired entries and trim to `max_entries`."""
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, signature, provider, model, prompt, text, meta, created_at, used_at, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                    (key, signature, provider, model, normalize_prompt(prompt), text, json.dumps(meta or {}), now, now),
+                )
+                conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_s,))
+                conn.execute(
+                    "DELETE FROM responses WHERE key NOT IN "
+                    "(SELECT key FROM responses ORDER BY used_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM responses")
+        except sqlite3.Error:
+            pass
+
+    def __len__(self):
+        try:
+            with self._connect() as conn:
+                return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+
+def get_cache(db_path: Path = DEFAULT_CACHE_PATH) -> ResponseCache:
+    """Return the shared cache for `db_path`."""
+    db_path = Path(db_path)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(db_path)
+        if cache is None:
+            cache = ResponseCache(db_path)
+            _CACHES[db_path] = cache
+        return cache
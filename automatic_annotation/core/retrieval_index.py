@@ -0,0 +1,239 @@
+"""Persistent BM25 index over the Insights metric documents.
+
+Answering a question used to rebuild every metric document, re-run the class
+analysis and re-tokenize every text before scoring. The index here keeps
+documents pre-tokenized, with an inverted index (term -> document term
+frequencies), so a query only touches the postings of its own terms.
+
+One index is kept per metrics source. When the source's signature changes
+(rows appended to `metrics.csv`), the caller's documents are diffed by title
+and text. Only new or changed documents are re-tokenized and re-posted.
+Indexes are stored in SQLite so a restarted app starts warm.
+"""
+
+from collections import Counter
+from pathlib import Path
+import json
+import math
+import sqlite3
+import threading
+
+from core.cache_paths import cache_subdir
+
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+DEFAULT_INDEX_PATH = cache_subdir("insights") / "retrieval.sqlite"
+
+# Metrics sources whose index stays in memory.
+MAX_CACHED_INDEXES = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS docs (
+    source TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    text TEXT NOT NULL,
+    tokens TEXT NOT NULL,
+    PRIMARY KEY (source, title)
+);
+"""
+
+_INDEXES: dict = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+class BM25Index:
+    """Inverted index with BM25 scoring over small titled documents."""
+
+    def __init__(self, tokenizer, k1: float = BM25_K1, b: float = BM25_B):
+        self.tokenizer = tokenizer
+        self.k1 = float(k1)
+        self.b = float(b)
+        self.signature = ""
+        self.docs: dict[str, dict] = {}
+        self.order: list[str] = []
+        self.postings: dict[str, dict[str, int]] = {}
+        self.doc_terms: dict[str, frozenset] = {}
+        self._doc_len: dict[str, int] = {}
+        self._total_len = 0
+        # Held by updates and by readers ranking against this index; other sources are not blocked.
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def _add(self, title: str, text: str, tokens: list) -> None:
+        counts = Counter(tokens)
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[title] = tf
+        self.docs[title] = {"title": title, "text": text, "tokens": tokens}
+        self.doc_terms[title] = frozenset(counts)
+        self._doc_len[title] = len(tokens)
+        self._total_len += len(tokens)
+
+    def _remove(self, title: str) -> None:
+        for term in self.doc_terms.pop(title, ()):
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(title, None)
+                if not posting:
+                    del self.postings[term]
+        self._total_len -= self._doc_len.pop(title, 0)
+        self.docs.pop(title, None)
+
+    def diff(self, docs) -> tuple:
+        """
+        Compare `docs` (dicts with `title` and `text`) with the index without changing it.
+        Returns `(changed, removed, order)`: new or changed documents, titles to drop, and the new title order.
+        """
+        incoming = {doc["title"]: doc["text"] for doc in docs}
+        changed = [
+            {"title": title, "text": text}
+            for title, text in incoming.items()
+            if title not in self.docs or self.docs[title]["text"] != text
+        ]
+        removed = [title for title in self.docs if title not in incoming]
+        return changed, removed, list(incoming)
+
+    def apply(self, changed, removed, order, tokens_by_title: dict = None) -> dict:
+        """
+        Post only `changed` documents and drop `removed` titles (see `diff`).
+        Returns counts of added, changed, removed and unchanged documents.
+        """
+        tokens_by_title = tokens_by_title or {}
+        stats = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+        for title in removed:
+            if title in self.docs:
+                self._remove(title)
+                stats["removed"] += 1
+        for doc in changed:
+            title = doc["title"]
+            if title in self.docs:
+                self._remove(title)
+                stats["changed"] += 1
+            else:
+                stats["added"] += 1
+            tokens = tokens_by_title.get(title)
+            if tokens is None:
+                tokens = self.tokenizer(title + " " + doc["text"])
+            self._add(title, doc["text"], list(tokens))
+        self.order = list(order)
+        stats["unchanged"] = len(self.order) - stats["added"] - stats["changed"]
+        return stats
+
+    def update(self, docs, tokens_by_title: dict = None) -> dict:
+        """Make the index match `docs`, re-indexing only what changed (`diff` + `apply`)."""
+        changed, removed, order = self.diff(docs)
+        return self.apply(changed, removed, order, tokens_by_title)
+
+    def scores(self, query_terms) -> dict:
+        """Return BM25 scores for documents sharing at least one term with the query."""
+        count = len(self.docs)
+        if not count:
+            return {}
+        avg_len = self._total_len / count or 1.0
+        scores: dict[str, float] = {}
+        for term in set(query_terms):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1.0 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for title, tf in posting.items():
+                norm = self.k1 * (1.0 - self.b + self.b * self._doc_len[title] / avg_len)
+                scores[title] = scores.get(title, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+        return scores
+
+
+def source_key(signature: str) -> str:
+    """Identify a metrics source independent of its version (`path:<file>` or the upload signature)."""
+    if signature.startswith("path:"):
+        return signature.rsplit(":", 2)[0]
+    return signature
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path), timeout=5)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _load_persisted(db_path: Path, source: str, tokenizer):
+    try:
+        with _connect(db_path) as conn:
+            row = conn.execute("SELECT signature FROM sources WHERE source = ?", (source,)).fetchone()
+            if row is None:
+                return None
+            docs = conn.execute(
+                "SELECT title, text, tokens FROM docs WHERE source = ? ORDER BY position", (source,)
+            ).fetchall()
+    except sqlite3.Error:
+        return None
+    index = BM25Index(tokenizer)
+    index.update(
+        [{"title": title, "text": text} for title, text, _ in docs],
+        tokens_by_title={title: json.loads(tokens) for title, _, tokens in docs},
+    )
+    index.signature = row[0]
+    return index
+
+
+def _persist(db_path: Path, source: str, index: BM25Index) -> None:
+    try:
+        with _connect(db_path) as conn:
+            conn.execute("DELETE FROM docs WHERE source = ?", (source,))
+            conn.executemany(
+                "INSERT INTO docs (source, position, title, text, tokens) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (source, position, title, index.docs[title]["text"], json.dumps(index.docs[title]["tokens"]))
+                    for position, title in enumerate(index.order)
+                ],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO sources (source, signature) VALUES (?, ?)", (source, index.signature)
+            )
+    except sqlite3.Error:
+        pass
+
+
+def get_index(signature: str, build_docs, tokenizer, db_path: Path = DEFAULT_INDEX_PATH) -> BM25Index:
+    """
+    Return the index for the metrics version `signature`.
+    `build_docs()` is only called when the signature differs from the indexed one. It runs outside
+    the shared lock; only new or changed documents are then tokenized, posted and persisted.
+    """
+    source = source_key(signature)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(source)
+    if index is None:
+        loaded = _load_persisted(Path(db_path), source, tokenizer) or BM25Index(tokenizer)
+        with _INDEXES_LOCK:
+            index = _INDEXES.setdefault(source, loaded)
+            while len(_INDEXES) > MAX_CACHED_INDEXES:
+                _INDEXES.pop(next(iter(_INDEXES)))
+    if index.signature == signature:
+        return index
+
+    docs = build_docs()
+    with index.lock:
+        if index.signature == signature:
+            return index
+        changed, removed, order = index.diff(docs)
+        tokens_by_title = {doc["title"]: tokenizer(doc["title"] + " " + doc["text"]) for doc in changed}
+        index.apply(changed, removed, order, tokens_by_title)
+        index.signature = signature
+        # Uploads are one-off; only file-backed sources are worth keeping on disk.
+        if signature.startswith("path:"):
+            _persist(Path(db_path), source, index)
+    return index
+
+
+def clear_indexes() -> None:
+    """Forget in-memory indexes (the SQLite copy is refreshed on next use)."""
+    with _INDEXES_LOCK:
+        _INDEXES.clear()
@@ -0,0 +1,245 @@
+"""Persistent thumbnail cache for the gallery tabs.
+
+Gallery tiles are rendered from small WebP/JPEG thumbnails stored on disk and
+keyed by source path, mtime and size, so a frame is decoded at full
+resolution at most once per change. Thumbnails for upcoming pages are built
+in a background thread pool while the current page is on screen.
+
+Annotated tiles additionally get their YOLO boxes drawn once at thumbnail
+resolution; the rendered overlay is keyed by both the image and the label
+file signatures, so paging costs a cache lookup per tile.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import hashlib
+import os
+import threading
+
+from PIL import Image, ImageDraw, ImageOps, features
+
+from core import label_store as label_store_utils
+from core.cache_paths import cache_subdir
+
+
+THUMBNAIL_MAX_SIDE = 384
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_WORKERS = max(2, min(8, (os.cpu_count() or 2)))
+THUMBNAIL_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+THUMBNAIL_SUFFIX = ".webp" if THUMBNAIL_FORMAT == "WEBP" else ".jpg"
+
+OVERLAY_BOX_COLOR = (0, 255, 0)
+OVERLAY_BOX_WIDTH = 2
+
+DEFAULT_THUMBNAIL_DIR = cache_subdir("thumbnails")
+DEFAULT_OVERLAY_DIR = cache_subdir("overlays")
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+_PENDING: dict[str, object] = {}
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS, thread_name_prefix="thumbnail")
+        return _EXECUTOR
+
+
+def thumbnail_key(path: Path, max_side: int = THUMBNAIL_MAX_SIDE):
+    """Return the cache key for `path`, or None when the file is missing."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    raw = f"{path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}|{int(max_side)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _file_signature(path: Path) -> str:
+    try:
+        stat = path.stat()
+    except OSError:
+        return "missing"
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def thumbnail_path(path: Path, cache_dir: Path = DEFAULT_THUMBNAIL_DIR, max_side: int = THUMBNAIL_MAX_SIDE):
+    """Return where the thumbnail for `path` lives (it may not exist yet)."""
+    key = thumbnail_key(Path(path), max_side)
+    if key is None:
+        return None
+    return Path(cache_dir) / key[:2] / f"{key}{THUMBNAIL_SUFFIX}"
+
+
+def make_thumbnail(path: Path, max_side: int = THUMBNAIL_MAX_SIDE):
+    """Decode `path` at reduced size and return an RGB PIL thumbnail, or None."""
+    try:
+        with Image.open(path) as img:
+            # JPEG can decode directly at 1/2, 1/4 or 1/8 scale.
+            img.draft("RGB", (max_side, max_side))
+            img = ImageOps.exif_transpose(img)
+            img = img.convert("RGB")
+            img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            return img
+    except Exception:
+        return None
+
+
+def ensure_thumbnail(path: Path, cache_dir: Path = DEFAULT_THUMBNAIL_DIR, max_side: int = THUMBNAIL_MAX_SIDE):
+    """Return the cached thumbnail path for `path`, generating it when needed."""
+    target = thumbnail_path(Path(path), cache_dir, max_side)
+    if target is None:
+        return None
+    if target.exists():
+        return target
+
+    thumb = make_thumbnail(Path(path), max_side)
+    if thumb is None:
+        return None
+    return target if _save_atomic(thumb, target) else None
+
+
+def _save_atomic(img: Image.Image, target: Path) -> bool:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f"{target.name}.{threading.get_ident()}.tmp")
+    try:
+        img.save(tmp_path, format=THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY)
+        os.replace(tmp_path, target)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def read_yolo_boxes(txt_path: Path) -> list:
+    """Return `(class_id, cx, cy, w, h)` rows from a YOLO label file (via the packed label store)."""
+    return label_store_utils.read_label_tuples(txt_path)
+
+
+def draw_yolo_boxes(img: Image.Image, boxes) -> Image.Image:
+    """Draw normalized YOLO boxes onto a copy of `img` at its own resolution."""
+    out = img.copy()
+    w, h = out.size
+    draw = ImageDraw.Draw(out)
+    for _, cx, cy, bw, bh in boxes:
+        x1 = int((cx - bw / 2) * w)
+        y1 = int((cy - bh / 2) * h)
+        x2 = int((cx + bw / 2) * w)
+        y2 = int((cy + bh / 2) * h)
+        draw.rectangle((x1, y1, x2, y2), outline=OVERLAY_BOX_COLOR, width=OVERLAY_BOX_WIDTH)
+    return out
+
+
+def overlay_path(path: Path, txt_path: Path, cache_dir: Path = DEFAULT_OVERLAY_DIR, max_side: int = THUMBNAIL_MAX_SIDE):
+    """Return where the boxed thumbnail for an image/label pair lives."""
+    key = thumbnail_key(Path(path), max_side)
+    if key is None:
+        return None
+    raw = f"{key}|{Path(txt_path).resolve()}|{_file_signature(Path(txt_path))}"
+    overlay_key = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return Path(cache_dir) / overlay_key[:2] / f"{overlay_key}{THUMBNAIL_SUFFIX}"
+
+
+def ensure_annotated_thumbnail(
+    path: Path,
+    txt_path: Path,
+    cache_dir: Path = DEFAULT_OVERLAY_DIR,
+    thumbnail_dir: Path = DEFAULT_THUMBNAIL_DIR,
+    max_side: int = THUMBNAIL_MAX_SIDE,
+):
+    """Return a cached thumbnail with YOLO boxes drawn, rendering it when needed."""
+    target = overlay_path(Path(path), Path(txt_path), cache_dir, max_side)
+    if target is None:
+        return None
+    if target.exists():
+        return target
+
+    thumb_file = ensure_thumbnail(Path(path), thumbnail_dir, max_side)
+    if thumb_file is None:
+        return None
+    try:
+        with Image.open(thumb_file) as thumb:
+            drawn = draw_yolo_boxes(thumb.convert("RGB"), read_yolo_boxes(Path(txt_path)))
+    except Exception:
+        return None
+    return target if _save_atomic(drawn, target) else None
+
+
+def ensure_annotated_thumbnails(paths, cache_dir: Path = DEFAULT_OVERLAY_DIR, max_side: int = THUMBNAIL_MAX_SIDE):
+    """Render boxed thumbnails for images and their same-stem labels in parallel."""
+    paths = list(paths)
+    if not paths:
+        return []
+    return list(
+        _executor().map(
+            lambda item: ensure_annotated_thumbnail(item, Path(item).with_suffix(".txt"), cache_dir, max_side=max_side),
+            paths,
+        )
+    )
+
+
+def ensure_thumbnails(paths, cache_dir: Path = DEFAULT_THUMBNAIL_DIR, max_side: int = THUMBNAIL_MAX_SIDE):
+    """Generate thumbnails for `paths` in parallel; results keep input order."""
+    paths = list(paths)
+    if not paths:
+        return []
+    return list(_executor().map(lambda item: ensure_thumbnail(item, cache_dir, max_side), paths))
+
+
+def _queue_background(target, func, *args) -> bool:
+    """Submit `func(*args)` unless `target` exists or is already being built."""
+    if target is None or target.exists():
+        return False
+    key = str(target)
+    with _EXECUTOR_LOCK:
+        if key in _PENDING:
+            return False
+        _PENDING[key] = True
+    future = _executor().submit(func, *args)
+    future.add_done_callback(lambda _future, key=key: _PENDING.pop(key, None))
+    return True
+
+
+def pregenerate_thumbnails(paths, cache_dir: Path = DEFAULT_THUMBNAIL_DIR, max_side: int = THUMBNAIL_MAX_SIDE) -> int:
+    """Queue background thumbnail generation for `paths`; return how many were queued."""
+    queued = 0
+    for path in paths:
+        target = thumbnail_path(Path(path), cache_dir, max_side)
+        queued += _queue_background(target, ensure_thumbnail, Path(path), cache_dir, max_side)
+    return queued
+
+
+def pregenerate_annotated_thumbnails(paths, cache_dir: Path = DEFAULT_OVERLAY_DIR, max_side: int = THUMBNAIL_MAX_SIDE) -> int:
+    """Queue background rendering of boxed thumbnails for `paths` and their labels."""
+    queued = 0
+    for path in paths:
+        txt_path = Path(path).with_suffix(".txt")
+        target = overlay_path(Path(path), txt_path, cache_dir, max_side)
+        queued += _queue_background(target, ensure_annotated_thumbnail, Path(path), txt_path, cache_dir, DEFAULT_THUMBNAIL_DIR, max_side)
+    return queued
+
+
+def prune_thumbnail_cache(cache_dir: Path = DEFAULT_THUMBNAIL_DIR, max_bytes: int = 512 * 1024 * 1024) -> int:
+    """Delete least-recently-modified thumbnails until the cache fits `max_bytes`."""
+    entries = []
+    total = 0
+    for root, _, files in os.walk(cache_dir):
+        for file_name in files:
+            file_path = Path(root) / file_name
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file_path))
+            total += stat.st_size
+
+    removed = 0
+    for _, size, file_path in sorted(entries):
+        if total <= max_bytes:
+            break
+        file_path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
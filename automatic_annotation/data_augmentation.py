@@ -1,9 +1,19 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import os
 import random
-from typing import Tuple, Optional, List
+import shutil
+import time
+import zlib
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from core.lazy_imports import lazy_module
 
-import cv2
-import numpy as np
+# OpenCV/NumPy load on first use so `ensure_dirs` stays cheap at app startup.
+cv2 = lazy_module("cv2")
+np = lazy_module("numpy")
 
 
 # ---------------------------
@@ -77,13 +87,18 @@ def hsv_color_shift(img: np.ndarray, hue_shift: int = 0, sat_scale: float = 1.0,
     return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
 
 
-def random_rotate(img: np.ndarray, max_deg: int = 10) -> np.ndarray:
+def random_rotate_with_matrix(img: np.ndarray, max_deg: int = 10) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Rotate by a random angle; also return the 2x3 affine matrix used (None when unchanged)."""
     if max_deg <= 0:
-        return img
+        return img, None
     h, w = img.shape[:2]
     deg = random.uniform(-max_deg, max_deg)
     M = cv2.getRotationMatrix2D((w / 2, h / 2), deg, 1.0)
-    return cv2.warpAffine(img, M, (w, h), borderMode=cv2.BORDER_REPLICATE)
+    return cv2.warpAffine(img, M, (w, h), borderMode=cv2.BORDER_REPLICATE), M
+
+
+def random_rotate(img: np.ndarray, max_deg: int = 10) -> np.ndarray:
+    return random_rotate_with_matrix(img, max_deg)[0]
 
 
 def random_brightness_contrast(img: np.ndarray, brightness: float = 0.2, contrast: float = 0.2) -> np.ndarray:
@@ -101,6 +116,88 @@ def random_blur(img: np.ndarray, max_ksize: int = 5) -> np.ndarray:
     return cv2.GaussianBlur(img, (k, k), 0)
 
 
+# Variant builders return (image, 2x3 affine matrix applied to the geometry or None).
+Variant = Tuple["np.ndarray", Optional["np.ndarray"]]
+
+
+def _gaussian_noise_variant(img: np.ndarray) -> Variant:
+    return add_gaussian_noise(img, sigma=random.choice([10, 15, 25])), None
+
+
+def _salt_pepper_variant(img: np.ndarray) -> Variant:
+    return add_salt_pepper_noise(img, amount=random.choice([0.005, 0.01, 0.02])), None
+
+
+def _rotate_variant(img: np.ndarray) -> Variant:
+    return random_rotate_with_matrix(img, max_deg=8)
+
+
+def _brightness_contrast_variant(img: np.ndarray) -> Variant:
+    return random_brightness_contrast(img, brightness=0.25, contrast=0.25), None
+
+
+def _blur_variant(img: np.ndarray) -> Variant:
+    return random_blur(img, max_ksize=5), None
+
+
+def _motion_blur_variant(img: np.ndarray) -> Variant:
+    return motion_blur(img, ksize=random.choice([5, 7, 9])), None
+
+
+def _fog_variant(img: np.ndarray) -> Variant:
+    return add_fog(img, intensity=random.choice([0.1, 0.15, 0.2])), None
+
+
+def _color_shift_variant(img: np.ndarray) -> Variant:
+    return hsv_color_shift(img, hue_shift=random.randint(-5, 5), sat_scale=random.uniform(0.9, 1.1), val_scale=random.uniform(0.9, 1.1)), None
+
+
+# (option flag, variant builder) in the order variants are listed.
+AUGMENTATIONS = (
+    ("use_gaussian_noise", _gaussian_noise_variant),
+    ("use_salt_pepper", _salt_pepper_variant),
+    ("use_small_rotate", _rotate_variant),
+    ("use_brightness_contrast", _brightness_contrast_variant),
+    ("use_gaussian_blur", _blur_variant),
+    ("use_motion_blur", _motion_blur_variant),
+    ("use_fog", _fog_variant),
+    ("use_color_shift", _color_shift_variant),
+)
+
+DEFAULT_AUGMENTATION_OPTIONS = {
+    "use_gaussian_noise": True,
+    "use_salt_pepper": False,
+    "use_small_rotate": True,
+    "use_brightness_contrast": True,
+    "use_gaussian_blur": True,
+    "use_motion_blur": True,
+    "use_fog": False,
+    "use_color_shift": False,
+}
+
+
+AUGMENTATION_ENGINES = ("reference", "fast")
+
+
+def enabled_augmentations(engine: str = "reference", **options) -> List:
+    """
+    Return the variant builders switched on by `use_*` options (defaults for missing ones).
+    - engine: "reference" for the functions above, "fast" for the LUT/cached-kernel
+      versions in `core.fast_augmentation`.
+    """
+    flags = {**DEFAULT_AUGMENTATION_OPTIONS, **options}
+    unknown = set(flags) - set(DEFAULT_AUGMENTATION_OPTIONS)
+    if unknown:
+        raise TypeError(f"Unknown augmentation option(s): {', '.join(sorted(unknown))}")
+    if engine == "fast":
+        from core.fast_augmentation import FAST_AUGMENTATIONS as table
+    elif engine == "reference":
+        table = AUGMENTATIONS
+    else:
+        raise ValueError(f"Unknown augmentation engine: {engine!r} (expected one of {AUGMENTATION_ENGINES})")
+    return [builder for flag, builder in table if flags[flag]]
+
+
 def apply_augmentations(
     img: np.ndarray,
     *,
@@ -114,26 +211,121 @@ def apply_augmentations(
     use_color_shift: bool = False,
 ) -> List[np.ndarray]:
     """Create augmented variants tailored for ARAS; no flips (left/right semantics matter)."""
-    variants: List[np.ndarray] = []
-
-    if use_gaussian_noise:
-        variants.append(add_gaussian_noise(img, sigma=random.choice([10, 15, 25])))
-    if use_salt_pepper:
-        variants.append(add_salt_pepper_noise(img, amount=random.choice([0.005, 0.01, 0.02])))
-    if use_small_rotate:
-        variants.append(random_rotate(img, max_deg=8))
-    if use_brightness_contrast:
-        variants.append(random_brightness_contrast(img, brightness=0.25, contrast=0.25))
-    if use_gaussian_blur:
-        variants.append(random_blur(img, max_ksize=5))
-    if use_motion_blur:
-        variants.append(motion_blur(img, ksize=random.choice([5, 7, 9])))
-    if use_fog:
-        variants.append(add_fog(img, intensity=random.choice([0.1, 0.15, 0.2])))
-    if use_color_shift:
-        variants.append(hsv_color_shift(img, hue_shift=random.randint(-5, 5), sat_scale=random.uniform(0.9, 1.1), val_scale=random.uniform(0.9, 1.1)))
-
-    return variants
+    builders = enabled_augmentations(
+        use_gaussian_noise=use_gaussian_noise,
+        use_salt_pepper=use_salt_pepper,
+        use_small_rotate=use_small_rotate,
+        use_brightness_contrast=use_brightness_contrast,
+        use_gaussian_blur=use_gaussian_blur,
+        use_motion_blur=use_motion_blur,
+        use_fog=use_fog,
+        use_color_shift=use_color_shift,
+    )
+    return [builder(img)[0] for builder in builders]
+
+
+def augment_image_with_matrices(img: np.ndarray, variants_per_image: int, seed: Optional[int] = None, **options) -> List[Variant]:
+    """
+    Return up to `variants_per_image` randomly chosen `(variant, affine matrix or None)` pairs.
+    Only the chosen variants are generated. With `seed`, both the choice and
+    the variants' random parameters are reproducible.
+    """
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+    builders = enabled_augmentations(**options)
+    random.shuffle(builders)
+    return [builder(img) for builder in builders[:max(0, int(variants_per_image))]]
+
+
+def augment_image(img: np.ndarray, variants_per_image: int, seed: Optional[int] = None, **options) -> List[np.ndarray]:
+    """Return up to `variants_per_image` randomly chosen variants of `img` (see `augment_image_with_matrices`)."""
+    return [variant for variant, _ in augment_image_with_matrices(img, variants_per_image, seed=seed, **options)]
+
+
+# ---------------------------
+# YOLO label handling
+# ---------------------------
+
+# A transformed box is kept when at least this share of it stays inside the image.
+MIN_BOX_VISIBILITY = 0.25
+MIN_BOX_SIZE_PX = 2.0
+
+
+def read_yolo_labels(txt_path: str) -> Optional[np.ndarray]:
+    """Return `(class_id, cx, cy, w, h)` rows as an (N, 5) float array, or None if the file is missing."""
+    try:
+        with open(txt_path, "r") as file_obj:
+            lines = file_obj.readlines()
+    except OSError:
+        return None
+    rows = []
+    for line in lines:
+        parts = line.split()
+        # Only detection boxes; segmentation polygons have more columns.
+        if len(parts) != 5:
+            continue
+        try:
+            rows.append([float(value) for value in parts])
+        except ValueError:
+            continue
+    return np.asarray(rows, dtype=np.float64).reshape(-1, 5)
+
+
+def write_yolo_labels(txt_path: str, boxes: np.ndarray) -> None:
+    """Write (N, 5) `(class_id, cx, cy, w, h)` rows in YOLO text format."""
+    with open(txt_path, "w") as file_obj:
+        for class_id, cx, cy, w, h in boxes:
+            file_obj.write(f"{int(class_id)} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}\n")
+
+
+def transform_yolo_boxes(
+    boxes: np.ndarray,
+    matrix: Optional[np.ndarray],
+    width: int,
+    height: int,
+    min_visibility: float = MIN_BOX_VISIBILITY,
+    min_size_px: float = MIN_BOX_SIZE_PX,
+) -> Tuple[np.ndarray, int]:
+    """
+    Apply a 2x3 affine `matrix` to normalized YOLO boxes of a `width` x `height` image.
+    Each box becomes the axis-aligned hull of its transformed corners, clipped to
+    the image. Boxes left mostly outside the frame or smaller than `min_size_px`
+    are dropped. Returns (boxes, number dropped).
+    """
+    if matrix is None or len(boxes) == 0:
+        return boxes, 0
+
+    cx = boxes[:, 1] * width
+    cy = boxes[:, 2] * height
+    half_w = boxes[:, 3] * width / 2
+    half_h = boxes[:, 4] * height / 2
+    xs = np.stack([cx - half_w, cx + half_w, cx + half_w, cx - half_w], axis=1)
+    ys = np.stack([cy - half_h, cy - half_h, cy + half_h, cy + half_h], axis=1)
+
+    tx = matrix[0, 0] * xs + matrix[0, 1] * ys + matrix[0, 2]
+    ty = matrix[1, 0] * xs + matrix[1, 1] * ys + matrix[1, 2]
+    x1, x2 = tx.min(axis=1), tx.max(axis=1)
+    y1, y2 = ty.min(axis=1), ty.max(axis=1)
+    full_area = (x2 - x1) * (y2 - y1)
+
+    x1, x2 = np.clip(x1, 0, width), np.clip(x2, 0, width)
+    y1, y2 = np.clip(y1, 0, height), np.clip(y2, 0, height)
+    clipped_w, clipped_h = x2 - x1, y2 - y1
+
+    keep = (
+        (clipped_w >= min_size_px)
+        & (clipped_h >= min_size_px)
+        & (clipped_w * clipped_h >= min_visibility * full_area)
+    )
+    out = np.stack([
+        boxes[:, 0],
+        (x1 + x2) / 2 / width,
+        (y1 + y2) / 2 / height,
+        clipped_w / width,
+        clipped_h / height,
+    ], axis=1)[keep]
+    return out, int(len(boxes) - keep.sum())
 
 
 # ---------------------------
@@ -153,6 +345,224 @@ def ensure_dirs(base_dir: str) -> None:
         os.makedirs(os.path.join(base_dir, d), exist_ok=True)
 
 
+# Leave one core for the UI / job runner by default.
+DEFAULT_AUGMENT_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+# Frames stacked per batch when batching is switched on.
+DEFAULT_AUGMENT_BATCH_SIZE = 32
+
+
+def image_seed(seed: int, rel_path: str) -> int:
+    """Derive the per-image seed from the run seed and the image path relative to the input folder."""
+    return zlib.crc32(f"{int(seed)}:{rel_path}".encode("utf-8"))
+
+
+def _init_augment_worker() -> None:
+    # One OpenCV thread per process; the pool already uses every core.
+    cv2.setNumThreads(1)
+
+
+def _collect_sources(input_dir: str, seed: int, exclude_dir: Optional[str] = None) -> List[tuple]:
+    """
+    Return `(path, dir relative to input_dir, file name, per-image seed)` for every image, in a stable order.
+    - exclude_dir: folder inside input_dir to skip (an output folder from earlier runs).
+    """
+    excluded = os.path.realpath(exclude_dir) if exclude_dir else None
+    sources = []
+    for root, dirs, files in os.walk(input_dir):
+        if excluded is not None:
+            dirs[:] = [d for d in dirs if os.path.realpath(os.path.join(root, d)) != excluded]
+        dirs.sort()
+        rel = os.path.relpath(root, input_dir)
+        for f in sorted(files):
+            if is_image_file(f):
+                rel_path = os.path.normpath(os.path.join(rel, f)).replace(os.sep, "/")
+                sources.append((os.path.join(root, f), rel, f, image_seed(seed, rel_path)))
+    return sources
+
+
+def _label_variants(variants: List[Variant], boxes: Optional[np.ndarray], width: int, height: int) -> List[tuple]:
+    """Pair each variant with its transformed labels: `[(variant, labels or None, boxes dropped)]`."""
+    # Unlabelled sources stay unlabelled rather than getting an empty label file.
+    if boxes is None:
+        return [(aug, None, 0) for aug, _ in variants]
+    return [(aug, *transform_yolo_boxes(boxes, matrix, width, height)) for aug, matrix in variants]
+
+
+def _augment_source(in_path: str, seed: int, variants_per_image: int, with_labels: bool, options: dict):
+    """Return `[(variant, labels or None, boxes dropped)]` for one image, or None if it can't be read."""
+    img = cv2.imread(in_path)
+    if img is None:
+        return None
+
+    boxes = read_yolo_labels(os.path.splitext(in_path)[0] + ".txt") if with_labels else None
+    height, width = img.shape[:2]
+    variants = augment_image_with_matrices(img, variants_per_image, seed=seed, **options)
+    return _label_variants(variants, boxes, width, height)
+
+
+def _write_variants(out_root: str, f: str, suffix_prefix: str, variants, result: dict) -> dict:
+    """Write labelled variants of source file `f` into out_root and count them in `result`."""
+    if variants is None:
+        result["unreadable"] = True
+        return result
+
+    os.makedirs(out_root, exist_ok=True)
+    name, ext = os.path.splitext(f)
+    for i, (aug, boxes, dropped) in enumerate(variants):
+        out_stem = os.path.join(out_root, f"{name}_{suffix_prefix}{i+1}")
+        cv2.imwrite(out_stem + ext, aug)
+        result["written"] += 1
+        if boxes is not None:
+            write_yolo_labels(out_stem + ".txt", boxes)
+            result["labels"] += 1
+            result["dropped_boxes"] += dropped
+    return result
+
+
+def _new_file_result(f: str) -> dict:
+    return {"file": f, "written": 0, "labels": 0, "dropped_boxes": 0, "unreadable": False}
+
+
+def _augment_file(task: tuple) -> dict:
+    """Augment one source image and write its variants (and transformed labels)."""
+    in_path, out_root, f, seed, variants_per_image, suffix_prefix, with_labels, options = task
+    variants = _augment_source(in_path, seed, variants_per_image, with_labels, options)
+    return _write_variants(out_root, f, suffix_prefix, variants, _new_file_result(f))
+
+
+def _augment_unit(tasks: List[tuple]) -> List[dict]:
+    return [_augment_file(task) for task in tasks]
+
+
+def _augment_chunk(tasks: List[tuple]) -> List[dict]:
+    """Augment consecutive source images together, batching those that share a resolution."""
+    from core.batch_augmentation import augment_batch
+
+    results = [_new_file_result(task[2]) for task in tasks]
+    by_shape = {}
+    for position, task in enumerate(tasks):
+        img = cv2.imread(task[0])
+        if img is None or img.ndim != 3:
+            results[position]["unreadable"] = True
+            continue
+        by_shape.setdefault(img.shape, []).append((position, img))
+
+    for (height, width, _), members in by_shape.items():
+        seeds = [tasks[position][3] for position, _ in members]
+        first = tasks[members[0][0]]
+        variants_per_image, with_labels, options = first[4], first[6], first[7]
+        batch_variants = augment_batch(
+            np.stack([img for _, img in members]), variants_per_image, seeds=seeds, **options
+        )
+        for (position, _), variants in zip(members, batch_variants):
+            in_path, out_root, f, _, _, suffix_prefix, _, _ = tasks[position]
+            boxes = read_yolo_labels(os.path.splitext(in_path)[0] + ".txt") if with_labels else None
+            _write_variants(out_root, f, suffix_prefix, _label_variants(variants, boxes, width, height), results[position])
+    return results
+
+
+def augment_images_with_stats(
+    input_dir: str,
+    output_dir: Optional[str] = None,
+    variants_per_image: int = 2,
+    suffix_prefix: str = "aug",
+    *,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    with_labels: bool = False,
+    batch_size: int = 0,
+    progress_callback=None,
+    **options,
+) -> dict:
+    """
+    Augment all images in input_dir (see `augment_images_in_dir`) and return run statistics:
+    written, labels_written, dropped_boxes, images, unreadable, workers, seed, seconds and images_per_s.
+    - workers: processes to spread images over; 1 runs in this process.
+    - with_labels: transform each image's same-stem YOLO `.txt` with its variant
+      and write it next to the variant.
+    - batch_size: when > 0, augment runs of this many consecutive images together,
+      stacking those that share a resolution (`core.batch_augmentation`). Output
+      is deterministic per seed but differs from the per-image engines.
+    - seed: run seed. Each image is seeded from it and its relative path, so
+      output does not depend on `workers` or on completion order.
+    """
+    if output_dir is None:
+        output_dir = input_dir
+    os.makedirs(output_dir, exist_ok=True)
+    enabled_augmentations(**options)  # reject unknown options before starting workers
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
+
+    # Collect sources up front so progress has a total and new outputs are not re-augmented.
+    # Relative structure from input_dir is preserved in output_dir.
+    tasks = [
+        (
+            in_path, os.path.join(output_dir, rel) if rel != "." else output_dir, f, source_seed,
+            variants_per_image, suffix_prefix, with_labels, options,
+        )
+        for in_path, rel, f, source_seed in _collect_sources(
+            input_dir, seed, exclude_dir=None if os.path.realpath(input_dir) == os.path.realpath(output_dir) else output_dir
+        )
+    ]
+
+    # Keep the class list next to the transformed labels.
+    classes_src = os.path.join(input_dir, "classes.txt")
+    classes_dst = os.path.join(output_dir, "classes.txt")
+    if with_labels and os.path.isfile(classes_src) and not os.path.exists(classes_dst):
+        shutil.copy2(classes_src, classes_dst)
+
+    batch_size = max(0, int(batch_size))
+    workers = max(1, min(int(workers), len(tasks) or 1))
+    totals = {"written": 0, "labels_written": 0, "dropped_boxes": 0, "unreadable": 0}
+    started = time.perf_counter()
+
+    done = 0
+
+    def record(results: List[dict]) -> None:
+        nonlocal done
+        for result in results:
+            done += 1
+            totals["written"] += result["written"]
+            totals["labels_written"] += result["labels"]
+            totals["dropped_boxes"] += result["dropped_boxes"]
+            totals["unreadable"] += int(result["unreadable"])
+            if progress_callback is not None:
+                progress_callback(done, len(tasks), result["file"])
+
+    # Sources are sorted, so consecutive frames of one video usually share a resolution.
+    if batch_size > 0:
+        units = [tasks[start:start + batch_size] for start in range(0, len(tasks), batch_size)]
+        run_unit = _augment_chunk
+    else:
+        units = [[task] for task in tasks]
+        run_unit = _augment_unit
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_augment_worker) as pool:
+            futures = [pool.submit(run_unit, unit) for unit in units]
+            for future in as_completed(futures):
+                record(future.result())
+    else:
+        # Per-image seeding touches the global RNGs; restore them for the caller.
+        py_state, np_state = random.getstate(), np.random.get_state()
+        try:
+            for unit in units:
+                record(run_unit(unit))
+        finally:
+            random.setstate(py_state)
+            np.random.set_state(np_state)
+
+    seconds = time.perf_counter() - started
+    return {
+        **totals,
+        "images": len(tasks),
+        "workers": workers,
+        "seed": seed,
+        "seconds": round(seconds, 3),
+        "images_per_s": round(len(tasks) / seconds, 2) if seconds > 0 else None,
+    }
+
+
 def augment_images_in_dir(
     input_dir: str,
     output_dir: Optional[str] = None,
@@ -167,55 +577,195 @@ def augment_images_in_dir(
     use_motion_blur: bool = True,
     use_fog: bool = False,
     use_color_shift: bool = False,
+    engine: str = "reference",
+    workers: int = 1,
+    seed: Optional[int] = None,
+    with_labels: bool = False,
+    batch_size: int = 0,
+    progress_callback=None,
 ) -> int:
     """
     Augment all images in input_dir and save alongside originals (or into output_dir if specified).
-    - variants_per_image: cap number of variants written per image.
+    - variants_per_image: cap number of variants written per image; only those are generated.
+    - engine: "reference" or "fast" (single-pass kernels from `core.fast_augmentation`).
+    - workers: processes to spread images over (1 = serial).
+    - seed: makes the output reproducible and identical for any `workers`.
+    - with_labels: also write each variant's YOLO label, transformed from the source's `.txt`.
+    - batch_size: augment same-resolution runs of this many images as stacked batches (0 = per image).
+    - progress_callback: optional `callback(done, total, message)` called after each source image.
     Returns number of augmented files written.
     """
-    if output_dir is None:
-        output_dir = input_dir
-    os.makedirs(output_dir, exist_ok=True)
+    stats = augment_images_with_stats(
+        input_dir,
+        output_dir,
+        variants_per_image,
+        suffix_prefix,
+        workers=workers,
+        seed=seed,
+        with_labels=with_labels,
+        batch_size=batch_size,
+        progress_callback=progress_callback,
+        use_gaussian_noise=use_gaussian_noise,
+        use_salt_pepper=use_salt_pepper,
+        use_small_rotate=use_small_rotate,
+        use_brightness_contrast=use_brightness_contrast,
+        use_gaussian_blur=use_gaussian_blur,
+        use_motion_blur=use_motion_blur,
+        use_fog=use_fog,
+        use_color_shift=use_color_shift,
+        engine=engine,
+    )
+    return stats["written"]
 
-    written = 0
-    for root, _, files in os.walk(input_dir):
-        # Preserve relative structure from input_dir to output_dir
-        rel = os.path.relpath(root, input_dir)
-        out_root = os.path.join(output_dir, rel) if rel != "." else output_dir
-        os.makedirs(out_root, exist_ok=True)
-
-        for f in files:
-            if not is_image_file(f):
-                continue
-            in_path = os.path.join(root, f)
-            img = cv2.imread(in_path)
-            if img is None:
-                continue
-
-            variants = apply_augmentations(
-                img,
-                use_gaussian_noise=use_gaussian_noise,
-                use_salt_pepper=use_salt_pepper,
-                use_small_rotate=use_small_rotate,
-                use_brightness_contrast=use_brightness_contrast,
-                use_gaussian_blur=use_gaussian_blur,
-                use_motion_blur=use_motion_blur,
-                use_fog=use_fog,
-                use_color_shift=use_color_shift,
-            )
-            random.shuffle(variants)
-            for i, aug in enumerate(variants[:max(0, int(variants_per_image))]):
-                name, ext = os.path.splitext(f)
-                out_path = os.path.join(out_root, f"{name}_{suffix_prefix}{i+1}{ext}")
-                cv2.imwrite(out_path, aug)
-                written += 1
 
-    return written
+# ---------------------------
+# Streaming augmentation
+# ---------------------------
+
+class AugmentedSample(NamedTuple):
+    image: "np.ndarray"
+    labels: Optional["np.ndarray"]  # (N, 5) YOLO rows, None when the source has no label file
+    source: str  # source image path relative to the input folder
+    name: str  # suggested output path relative to the output folder
+
 
+def _augment_source_in_memory(task: tuple) -> List[AugmentedSample]:
+    in_path, rel, f, seed, variants_per_image, suffix_prefix, with_labels, options = task
+    variants = _augment_source(in_path, seed, variants_per_image, with_labels, options)
+    if not variants:
+        return []
+    stem, ext = os.path.splitext(f)
+    source = os.path.normpath(os.path.join(rel, f)).replace(os.sep, "/")
+    samples = []
+    for i, (aug, boxes, _) in enumerate(variants):
+        name = os.path.normpath(os.path.join(rel, f"{stem}_{suffix_prefix}{i+1}{ext}")).replace(os.sep, "/")
+        samples.append(AugmentedSample(aug, boxes, source, name))
+    return samples
 
-def extract_frames_every(video_path: str, output_dir: str, interval_seconds: int = 3) -> int:
+
+def iter_augmented(
+    input_dir: str,
+    variants_per_image: int = 2,
+    suffix_prefix: str = "aug",
+    *,
+    seed: Optional[int] = None,
+    with_labels: bool = True,
+    workers: int = 1,
+    max_in_flight: Optional[int] = None,
+    **options,
+) -> Iterator[AugmentedSample]:
+    """
+    Yield augmented `(image, labels, source, name)` samples for the images in input_dir
+    without writing anything to disk.
+    - Samples come in source order, and for a given seed they match what
+      `augment_images_in_dir` writes, whatever `workers` is.
+    - workers > 1 augments in a process pool. At most `max_in_flight` source
+      images (default 2 per worker) are being processed or waiting to be
+      consumed, so memory stays bounded however large the folder is.
+    Suitable as the body of a training loader's `__iter__`, or as input to `export_augmented`.
+    """
+    enabled_augmentations(**options)
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
+    tasks = (
+        (in_path, rel, f, source_seed, variants_per_image, suffix_prefix, with_labels, options)
+        for in_path, rel, f, source_seed in _collect_sources(input_dir, seed)
+    )
+
+    if int(workers) <= 1:
+        for task in tasks:
+            # Restore the caller's global RNG state around each image; the caller runs between yields.
+            py_state, np_state = random.getstate(), np.random.get_state()
+            try:
+                samples = _augment_source_in_memory(task)
+            finally:
+                random.setstate(py_state)
+                np.random.set_state(np_state)
+            yield from samples
+        return
+
+    window = max(1, int(max_in_flight or 2 * int(workers)))
+    pool = ProcessPoolExecutor(max_workers=int(workers), initializer=_init_augment_worker)
+    pending = deque()
+    try:
+        for task in tasks:
+            pending.append(pool.submit(_augment_source_in_memory, task))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # Also reached when the consumer stops early: drop work nobody will read.
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+def _write_sample(sample: AugmentedSample, image_path: str, label_path: str) -> bool:
+    os.makedirs(os.path.dirname(image_path), exist_ok=True)
+    cv2.imwrite(image_path, sample.image)
+    if sample.labels is None:
+        return False
+    os.makedirs(os.path.dirname(label_path), exist_ok=True)
+    write_yolo_labels(label_path, sample.labels)
+    return True
+
+
+def export_augmented(samples, output_dir: str, layout: str = "flat", writers: int = 4, progress_callback=None) -> dict:
+    """
+    Write samples from `iter_augmented` to output_dir and return run statistics.
+    - layout: "flat" puts each label next to its image; "yolo" writes `images/` and
+      `labels/` trees, ready to point a YOLO dataset YAML at.
+    - writers: threads encoding and writing files (OpenCV releases the GIL while encoding).
+    - progress_callback: optional `callback(done, total, message)`; total is 0 as the stream length is unknown.
+    """
+    if layout not in ("flat", "yolo"):
+        raise ValueError(f"Unknown layout: {layout!r} (expected 'flat' or 'yolo')")
+    image_root = os.path.join(output_dir, "images") if layout == "yolo" else output_dir
+    label_root = os.path.join(output_dir, "labels") if layout == "yolo" else output_dir
+
+    written = 0
+    labels_written = 0
+    started = time.perf_counter()
+    pending = deque()
+    window = 2 * max(1, int(writers))
+
+    def collect(future) -> None:
+        nonlocal written, labels_written
+        labels_written += int(future.result())
+        written += 1
+        if progress_callback is not None:
+            progress_callback(written, 0, "")
+
+    with ThreadPoolExecutor(max_workers=max(1, int(writers))) as pool:
+        for sample in samples:
+            stem = os.path.splitext(sample.name)[0]
+            pending.append(pool.submit(
+                _write_sample,
+                sample,
+                os.path.join(image_root, sample.name),
+                os.path.join(label_root, stem + ".txt"),
+            ))
+            # Bound the number of encoded-but-unwritten images held in memory.
+            while len(pending) >= window:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
+
+    seconds = time.perf_counter() - started
+    return {
+        "written": written,
+        "labels_written": labels_written,
+        "layout": layout,
+        "seconds": round(seconds, 3),
+        "images_per_s": round(written / seconds, 2) if seconds > 0 else None,
+    }
+
+
+def extract_frames_every(video_path: str, output_dir: str, interval_seconds: int = 3, progress_callback=None) -> int:
     """
     Extract one frame every `interval_seconds` from video into output_dir.
+    - progress_callback: optional `callback(done, total, message)` called after each frame.
     Returns number of frames written.
     """
     os.makedirs(output_dir, exist_ok=True)
@@ -230,6 +780,8 @@ def extract_frames_every(video_path: str, output_dir: str, interval_seconds: int
     frame_index = 0
     current_time = 0.0
     written = 0
+    step = max(1, int(interval_seconds))
+    expected = int(duration_secs // step) + (1 if duration_secs % step else 0)
 
     while current_time < duration_secs:
         cam.set(cv2.CAP_PROP_POS_MSEC, current_time * 1000)
@@ -240,7 +792,9 @@ def extract_frames_every(video_path: str, output_dir: str, interval_seconds: int
         cv2.imwrite(filename, frame)
         written += 1
         frame_index += 1
-        current_time += max(1, int(interval_seconds))
+        current_time += step
+        if progress_callback is not None:
+            progress_callback(written, max(expected, written), os.path.basename(filename))
 
     cam.release()
     return written
@@ -1,99 +1,97 @@
-import os
-import sys
+#!/usr/bin/env python3
+"""
+Dataset Statistics
+==================
+Reports class counts, box size/aspect histograms, boxes per image, empty label
+files and out-of-range coordinates for a folder of YOLO label files
+(see `core/dataset_stats.py`).
+
+Label files are found through the directory index, so any file naming works.
+Results are cached per folder signature; an unchanged folder reports instantly.
+
+Usage:
+    python tools/analyze_dataset.py
+    python tools/analyze_dataset.py --annot-dir output_annotation --output class_counts.txt
+    python tools/analyze_dataset.py --annot-dir annotated_data/video1 --json stats.json --refresh
+"""
+
 import argparse
-from collections import defaultdict
+import json
+import sys
 from pathlib import Path
 
-def analyze_annotations(annotations_dir: str, output_file: str = None, start_frame: int = 1, end_frame: int = None):
-    """Analyze annotation files and count class occurrences
-    
-    Args:
-        annotations_dir: Directory containing annotation .txt files
-        output_file: Output file path for results (optional)
-        start_frame: Starting frame number
-        end_frame: Ending frame number (if None, processes all files)
-    """
-    
-    if not os.path.exists(annotations_dir):
-        print(f"[ERROR] Annotations directory not found: {annotations_dir}")
-        return {}
-    
-    # Auto-detect end frame if not provided
-    if end_frame is None:
-        # Count .txt files in directory
-        txt_files = [f for f in os.listdir(annotations_dir) if f.endswith('.txt') and f.startswith('frame')]
-        if txt_files:
-            # Extract frame numbers and find max
-            frame_nums = []
-            for f in txt_files:
-                try:
-                    num = int(f.replace('frame', '').replace('.txt', ''))
-                    frame_nums.append(num)
-                except ValueError:
-                    pass
-            end_frame = max(frame_nums) if frame_nums else 0
-        else:
-            end_frame = 0
-    
-    if end_frame == 0:
-        print(f"[WARN] No frames found in {annotations_dir}")
+APP_DIR = Path(__file__).resolve().parent.parent
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from core.dataset_stats import DEFAULT_STATS_WORKERS, get_dataset_stats  # noqa: E402
+
+
+def write_class_counts(class_counts: dict, output_file: str) -> None:
+    """Write `Class_ID<TAB>Count` lines, sorted by class id."""
+    with open(output_file, "w") as out:
+        out.write("Class_ID\tCount\n")
+        for class_id in sorted(class_counts):
+            out.write(f"{class_id}\t\t\t{class_counts[class_id]}\n")
+
+
+def analyze_annotations(annotations_dir: str, output_file: str = None, workers: int = DEFAULT_STATS_WORKERS, refresh: bool = False):
+    """Analyze annotation files and return `{class_id: box count}`; the full report is printed."""
+    try:
+        stats = get_dataset_stats(annotations_dir, workers=workers, refresh=refresh)
+    except FileNotFoundError as exc:
+        print(f"[ERROR] {exc}")
         return {}
-    
-    print(f"[INFO] Analyzing frames {start_frame} to {end_frame} from: {annotations_dir}")
-    
-    # Dictionary to count class occurrences
-    class_counts = defaultdict(int)
-    frames_found = 0
-    
-    # Loop through desired frame numbers and build file names
-    for i in range(start_frame, end_frame + 1):
-        fname = f"frame{i}.txt"
-        path = os.path.join(annotations_dir, fname)
-        
-        if not os.path.isfile(path):
-            continue
-        
-        frames_found += 1
-        with open(path, 'r') as f:
-            for line in f:
-                if line.strip() == "":
-                    continue
-                parts = line.strip().split()
-                if len(parts) > 0:
-                    class_id = parts[0]
-                    class_counts[class_id] += 1
-    
-    if frames_found == 0:
-        print(f"[WARN] No annotation files found in range {start_frame}-{end_frame}")
+    if not stats["files"]:
+        print(f"[WARN] No label files found in {annotations_dir}")
         return {}
-    
-    print(f"[OK] Found and processed {frames_found} annotation files")
-    
-    # Write the results to a file if specified
+
+    source = "cached" if stats["cached"] else f"{stats['seconds']:.2f}s"
+    print(f"[OK] {stats['files']} label files, {stats['boxes']} boxes ({source})")
+    print(
+        f"[INFO] {stats['images']} images, {stats['images_without_labels']} without labels, "
+        f"{stats['empty_label_files']} empty label files, {stats['mean_boxes_per_image']:.2f} boxes per image"
+    )
+    names = stats["class_names"]
+    for class_id, count in sorted(stats["class_counts"].items()):
+        name = names[class_id] if 0 <= class_id < len(names) else "?"
+        print(f"  {class_id:>4} {name:<24} {count:>8} boxes {stats['images_per_class'].get(class_id, 0):>8} images")
+
+    for title, hist in (("Box size", stats["box_size_hist"]), ("Box aspect", stats["aspect_hist"])):
+        print(f"[INFO] {title}: " + ", ".join(f"{label} {count}" for label, count in zip(hist["labels"], hist["counts"])))
+
+    if stats["out_of_range_boxes"]:
+        print(f"[WARN] {stats['out_of_range_boxes']} boxes outside the image, e.g. {stats['out_of_range_files'][0]}")
+    if stats["unknown_class_boxes"]:
+        print(f"[WARN] {stats['unknown_class_boxes']} boxes with a class id missing from classes.txt")
+    if stats["malformed_files_count"]:
+        print(f"[WARN] {stats['malformed_files_count']} label files with malformed lines, e.g. {stats['malformed_files'][0]}")
+
     if output_file:
         try:
-            with open(output_file, 'w') as out:
-                out.write("Class_ID\tCount\n")
-                for class_id in sorted(class_counts, key=lambda x: int(x)):
-                    out.write(f"{class_id}\t\t\t{class_counts[class_id]}\n")
+            write_class_counts(stats["class_counts"], output_file)
             print(f"[OK] Class counts written to: {output_file}")
-        except Exception as e:
-            print(f"[ERROR] Error writing output file: {e}")
-    
-    return class_counts
+        except OSError as exc:
+            print(f"[ERROR] Error writing output file: {exc}")
+    return stats["class_counts"]
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Analyze annotation dataset and count class occurrences")
+
+def main():
+    """CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Analyze a YOLO label folder: class counts, box statistics and label problems")
     parser.add_argument("--annot-dir", type=str, default="output_annotation", help="Annotations directory")
-    parser.add_argument("--output", type=str, default="class_counts.txt", help="Output file for results")
-    parser.add_argument("--start-frame", type=int, default=1, help="Starting frame number")
-    parser.add_argument("--end-frame", type=int, default=None, help="Ending frame number (auto-detect if not provided)")
-    
+    parser.add_argument("--output", type=str, default="class_counts.txt", help="Output file for class counts")
+    parser.add_argument("--json", type=str, default=None, help="Also write the full report as JSON")
+    parser.add_argument("--workers", type=int, default=DEFAULT_STATS_WORKERS, help="Parser processes for large folders")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the cached report")
     args = parser.parse_args()
-    
-    analyze_annotations(
-        annotations_dir=args.annot_dir,
-        output_file=args.output,
-        start_frame=args.start_frame,
-        end_frame=args.end_frame
-    )
+
+    class_counts = analyze_annotations(args.annot_dir, output_file=args.output, workers=args.workers, refresh=args.refresh)
+    if args.json and class_counts:
+        stats = get_dataset_stats(args.annot_dir, workers=args.workers)
+        Path(args.json).write_text(json.dumps(stats, indent=2))
+        print(f"[OK] Report written to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
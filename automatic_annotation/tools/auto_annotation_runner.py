@@ -9,14 +9,24 @@ import sys
 import argparse
 from pathlib import Path
 
+APP_DIR = Path(__file__).resolve().parent.parent
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from core.progress_events import ProgressReporter, add_json_progress_argument
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif')
+
 def main():
     parser = argparse.ArgumentParser(description="YOLO-based auto-annotation for frames")
     parser.add_argument("--frames-dir", type=str, default="output_frames", help="Directory containing input frames")
     parser.add_argument("--annot-dir", type=str, default="output_annotation", help="Directory to save annotations")
     parser.add_argument("--old-classes", type=str, default="class/old_classes.txt", help="Path to old classes file")
     parser.add_argument("--new-classes", type=str, default="class/new_classes.txt", help="Path to new classes file")
+    add_json_progress_argument(parser)
     
     args = parser.parse_args()
+    reporter = ProgressReporter("auto_annotate", enabled=args.json_progress)
     
     frames_dir = args.frames_dir
     annot_dir = args.annot_dir
@@ -30,25 +40,30 @@ def main():
         for model_file in model_files:
             if os.path.exists(model_file):
                 print(f"[OK] Loading model: {model_file}")
-                model = YOLO(model_file)
+                with reporter.stage("model_load"):
+                    model = YOLO(model_file)
                 break
         
         if model is None:
             print(f"[ERROR] No YOLO model found. Checked for: {', '.join(model_files)}")
+            reporter.error(f"No YOLO model found. Checked for: {', '.join(model_files)}")
             sys.exit(1)
         
         # Verify class files exist
         if not os.path.exists(old_class_filename):
             print(f"[ERROR] {old_class_filename} not found")
+            reporter.error(f"{old_class_filename} not found")
             sys.exit(1)
         
         if not os.path.exists(new_class_filename):
             print(f"[ERROR] {new_class_filename} not found")
+            reporter.error(f"{new_class_filename} not found")
             sys.exit(1)
         
         # Verify frames directory exists and has images
         if not os.path.exists(frames_dir):
             print(f"[ERROR] {frames_dir} directory not found")
+            reporter.error(f"{frames_dir} directory not found")
             sys.exit(1)
         
         # Create annotation directory
@@ -103,63 +118,82 @@ def main():
         
         if not label_dict:
             print("[WARN] No classes were mapped. Check your class files.")
+            reporter.warning("No classes were mapped. Check your class files.")
         
-        # Process frames
-        frame_count = 0
-        processed_count = 0
-        
+        # Collect frames up front so progress has a total
+        frame_paths = []
         for root, dirs, files in os.walk(frames_dir):
             for f in files:
-                if not f.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp', '.tif')):
-                    continue
-                
-                frame_count += 1
-                datapath = os.path.join(root, f)
-                frame_name = str(f).split(".")[0]
-                
-                print(f"\nProcessing frame {frame_count}: {f}")
-                
-                # Read image
-                img = cv2.imread(datapath)
-                if img is None:
-                    print(f"  [ERROR] Error reading image {datapath}")
-                    continue
-                
-                # Prepare output paths
-                label_filename = os.path.join(annot_dir, frame_name + ".txt")
-                img_filename = os.path.join(annot_dir, frame_name + ".jpg")
-                
-                # Save copy of image
-                cv2.imwrite(img_filename, img)
-                print(f"  [OK] Saved image: {img_filename}")
-                
-                # Run YOLO inference
-                results = model(img)
-                
-                annotation_count = 0
-                for result in results:
-                    boxes = result.boxes.numpy()
-                    for box in boxes:
-                        b = box.xywhn[0]
-                        c = box.cls
-                        if int(c[0]) in label_dict:
-                            new_id = label_dict[int(c[0])]
-                            str_data = f"{new_id} {b[0]} {b[1]} {b[2]} {b[3]}\n"
-                            with open(label_filename, "a+") as lf:
-                                lf.write(str_data)
-                            annotation_count += 1
-                
-                processed_count += 1
-                print(f"  [OK] Generated annotation: {label_filename} ({annotation_count} boxes)")
+                if f.lower().endswith(IMAGE_EXTENSIONS):
+                    frame_paths.append((os.path.join(root, f), f))
         
+        # Process frames
+        frame_count = 0
+        processed_count = 0
+        box_count = 0
+        reporter.start(total=len(frame_paths), frames_dir=frames_dir, annot_dir=annot_dir)
+        
+        for datapath, f in frame_paths:
+            frame_count += 1
+            frame_name = str(f).split(".")[0]
+            
+            print(f"\nProcessing frame {frame_count}: {f}")
+            
+            # Read image
+            img = cv2.imread(datapath)
+            if img is None:
+                print(f"  [ERROR] Error reading image {datapath}")
+                reporter.warning(f"Error reading image {datapath}")
+                reporter.progress(frame_count, message=f)
+                continue
+            
+            # Prepare output paths
+            label_filename = os.path.join(annot_dir, frame_name + ".txt")
+            img_filename = os.path.join(annot_dir, frame_name + ".jpg")
+            
+            # Save copy of image
+            cv2.imwrite(img_filename, img)
+            print(f"  [OK] Saved image: {img_filename}")
+            
+            # Run YOLO inference
+            results = model(img)
+            
+            annotation_count = 0
+            for result in results:
+                boxes = result.boxes.numpy()
+                for box in boxes:
+                    b = box.xywhn[0]
+                    c = box.cls
+                    if int(c[0]) in label_dict:
+                        new_id = label_dict[int(c[0])]
+                        str_data = f"{new_id} {b[0]} {b[1]} {b[2]} {b[3]}\n"
+                        with open(label_filename, "a+") as lf:
+                            lf.write(str_data)
+                        annotation_count += 1
+            
+            processed_count += 1
+            box_count += annotation_count
+            print(f"  [OK] Generated annotation: {label_filename} ({annotation_count} boxes)")
+            reporter.progress(frame_count, message=f)
+    
         print(f"\n" + "="*60)
         print(f"[OK] Auto-annotation completed successfully.")
         print(f"  Frames processed: {processed_count}/{frame_count}")
         print(f"  Output directory: {annot_dir}")
         print(f"="*60)
+        reporter.summary(
+            {
+                "frames_total": frame_count,
+                "frames_processed": processed_count,
+                "boxes_written": box_count,
+                "annot_dir": annot_dir,
+            },
+            message=f"Annotated {processed_count}/{frame_count} frames.",
+        )
 
     except Exception as e:
         print(f"[ERROR] FATAL ERROR: {str(e)}", file=sys.stderr)
+        reporter.error(f"FATAL ERROR: {str(e)}")
         import traceback
         traceback.print_exc()
         sys.exit(1)
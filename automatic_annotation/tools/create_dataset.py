@@ -1,90 +1,100 @@
-import cv2
-import numpy as np
-import time
-import os
-from pathlib import Path
-
-annotated_data_folder = Path("annotated_data/")
-output_folder_name = "dataset/headlight2/"
-
-annotated_folder_names = [f.name for f in annotated_data_folder.iterdir() if f.is_dir()]
-print(annotated_folder_names)
+#!/usr/bin/env python3
+"""
+Dataset Builder
+===============
+Builds a YOLO train/val dataset from the annotated folders in `annotated_data/`
+(see `core/dataset_builder.py` for the layout and the split rules).
 
-train_val_split = int(100/12)
+Frames and labels are hardlinked (or cloned/copied) instead of re-encoded,
+by a pool of worker threads. A rebuild only processes folders that are new
+or changed since the previous build, using `manifest.json` in the output.
 
-image_dir_train = "images/train/"
-image_dir_val = "images/val/"
-label_dir_train = "labels/train/"
-label_dir_val = "labels/val/"
-image_dir_path_train = os.path.join(output_folder_name, image_dir_train)
-image_dir_path_val = os.path.join(output_folder_name, image_dir_val)
-label_dir_path_train = os.path.join(output_folder_name, label_dir_train)
-label_dir_path_val = os.path.join(output_folder_name, label_dir_val)
+Usage:
+    python tools/create_dataset.py
+    python tools/create_dataset.py --source annotated_data --output dataset/headlight2 --val-ratio 0.15
+    python tools/create_dataset.py --split stratified --group-by folder
+    python tools/create_dataset.py --mode copy --full-rebuild --json-progress
+    python tools/create_dataset.py --prune-untracked   # first run over an old numbered dataset
+"""
 
-# Create the directory
-os.makedirs(image_dir_path_train, exist_ok=True)
-os.makedirs(image_dir_path_val, exist_ok=True)
-os.makedirs(label_dir_path_train, exist_ok=True)
-os.makedirs(label_dir_path_val, exist_ok=True)
-
-file_dict = {}
-
-file_count = 0
+import argparse
+import sys
+from pathlib import Path
 
-train_count = sum(1 for f in Path(image_dir_path_train).iterdir() if f.is_file())
-val_count = sum(1 for f in Path(image_dir_path_val).iterdir() if f.is_file())
+APP_DIR = Path(__file__).resolve().parent.parent
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
 
-output_file_name = ""
+from core.dataset_builder import (  # noqa: E402
+    DEFAULT_BUILD_WORKERS,
+    DEFAULT_VAL_RATIO,
+    GROUP_MODES,
+    MATERIALIZE_MODES,
+    SPLIT_METHODS,
+    build_dataset,
+)
+from core.progress_events import ProgressReporter, add_json_progress_argument  # noqa: E402
 
-for folder_names in annotated_folder_names:
-	folder_path = "annotated_data/" + str(folder_names) + "/"
-	for root, dirs, files in os.walk(folder_path):
-		for f in files:
-			datapath = os.path.join(root,f)
-			file_name = str(f).split(".")[0]
-			file_format = str(f).split(".")[1]
-			file_count += 1
-			if(file_count % train_val_split == 0):
-				if((file_name not in file_dict) and (file_name != "classes")):
-					val_count += 1
-					file_dict[file_name] = [val_count,"val"]
-			else:
-				if((file_name not in file_dict) and (file_name != "classes")):
-					train_count += 1
-					file_dict[file_name] = [train_count,"train"]
-			
-			if(file_name in file_dict):
-				if(file_format == "jpg"):
-					img = cv2.imread(datapath)
-					if(file_dict[file_name][1] == "val"):
-						output_file_name = image_dir_path_val + str(file_dict[file_name][0]) + "." + file_format
-					if(file_dict[file_name][1] == "train"):
-						output_file_name = image_dir_path_train + str(file_dict[file_name][0]) + "." + file_format
-					cv2.imwrite(output_file_name,img)
-				if(file_format == "txt"):
-					if(file_dict[file_name][1] == "val"):
-						output_file_name = label_dir_path_val + str(file_dict[file_name][0]) + "." + file_format
-					if(file_dict[file_name][1] == "train"):
-						output_file_name = label_dir_path_train + str(file_dict[file_name][0]) + "." + file_format
-					with open(datapath, 'r') as txt_file:
-						contents = txt_file.read()
-					with open(output_file_name, 'w') as dest_file:
-						dest_file.write(contents)
-			if(file_name == "classes"):
-				with open(datapath, 'r') as txt_file:
-					content_class = txt_file.read()
-				output_file_name = label_dir_path_val + file_name + "." + file_format
-				with open(output_file_name, 'w') as dest_file:
-					dest_file.write(content_class)
-				output_file_name = label_dir_path_train + file_name + "." + file_format
-				with open(output_file_name, 'w') as dest_file:
-					dest_file.write(content_class)
-									
-	print(file_dict)
 
-			
-		
+def main():
+    """CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Build a YOLO train/val dataset from annotated folders")
+    parser.add_argument("--source", type=str, default="annotated_data", help="Folder containing one subfolder per annotated set")
+    parser.add_argument("--output", type=str, default="dataset/headlight2", help="Dataset output folder")
+    parser.add_argument("--val-ratio", type=float, default=DEFAULT_VAL_RATIO, help="Fraction of samples in the val split")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the split (changing it reshuffles train/val)")
+    parser.add_argument("--split", choices=sorted(SPLIT_METHODS), default="hash", help="Split method")
+    parser.add_argument(
+        "--group-by", choices=GROUP_MODES, default="none",
+        help="Keep groups in one split: folder = one video per folder, prefix = frame names minus the frame number",
+    )
+    parser.add_argument("--mode", choices=MATERIALIZE_MODES, default="hardlink", help="How files are placed in the dataset")
+    parser.add_argument("--workers", type=int, default=DEFAULT_BUILD_WORKERS, help="Worker threads placing files")
+    parser.add_argument("--full-rebuild", action="store_true", help="Ignore the previous manifest and process every folder")
+    parser.add_argument(
+        "--prune-untracked", action="store_true",
+        help="Delete files in the split folders that the builder did not place (e.g. an old numbered dataset)",
+    )
+    add_json_progress_argument(parser)
+    args = parser.parse_args()
 
+    reporter = ProgressReporter("create_dataset", enabled=args.json_progress)
+    reporter.start(source=args.source, output=args.output)
+    try:
+        stats = build_dataset(
+            args.source,
+            args.output,
+            val_ratio=args.val_ratio,
+            seed=args.seed,
+            split=args.split,
+            group_by=args.group_by,
+            mode=args.mode,
+            workers=args.workers,
+            incremental=not args.full_rebuild,
+            prune_untracked=args.prune_untracked,
+            progress_callback=reporter.callback(),
+        )
+    except (OSError, ValueError) as exc:
+        print(f"[ERROR] {exc}")
+        reporter.error(str(exc))
+        sys.exit(1)
 
+    print(
+        f"[OK] {stats['samples']} samples ({stats['train']} train / {stats['val']} val) in {stats['output_dir']}"
+    )
+    print(
+        f"[INFO] {stats['folders_rebuilt']}/{stats['folders']} folders processed, {stats['folders_removed']} removed; "
+        f"{stats['files_placed']} files placed, {stats['files_unchanged']} unchanged, "
+        f"{stats['files_removed']} deleted in {stats['seconds']:.2f}s"
+    )
+    if stats["copy_fallbacks"]:
+        print(f"[WARN] {stats['copy_fallbacks']} files were copied because {args.mode} is not supported there")
+        reporter.warning(f"{stats['copy_fallbacks']} files copied instead of {args.mode}")
+    if stats["untracked_files"]:
+        print(f"[WARN] {stats['untracked_files']} files in the split folders are not from this build; --prune-untracked deletes them")
+        reporter.warning(f"{stats['untracked_files']} untracked files in the dataset folders")
+    reporter.summary(stats, message="Dataset built.")
 
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Class Relabel
+=============
+Rewrites every YOLO label file in a folder after classes were reordered,
+merged, renamed or deleted, then replaces `classes.txt`
+(see `core/class_remap.py`).
+
+The new class list is matched to the current `classes.txt` by name; classes
+left out are deleted with their boxes. `--alias old=new` renames a class or
+merges several into one. Files are rewritten in parallel, each atomically,
+and the run is journaled: `--resume` finishes an interrupted run.
+
+Usage:
+    python tools/relabel_classes.py --annot-dir output_annotation --classes person,vehicle --alias car=vehicle --alias truck=vehicle --dry-run
+    python tools/relabel_classes.py --annot-dir output_annotation --classes-file new_classes.txt
+    python tools/relabel_classes.py --annot-dir output_annotation --resume --json-progress
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from core import class_manager as class_utils  # noqa: E402
+from core.class_remap import (  # noqa: E402
+    DEFAULT_REMAP_WORKERS,
+    apply_remap,
+    build_mapping,
+    describe_mapping,
+    dry_run,
+    parse_aliases,
+    resume_remap,
+)
+from core.progress_events import ProgressReporter, add_json_progress_argument  # noqa: E402
+
+
+def main():
+    """CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Remap class ids in every label file of a folder")
+    parser.add_argument("--annot-dir", type=str, default="output_annotation", help="Folder with the label files and classes.txt")
+    classes_group = parser.add_mutually_exclusive_group()
+    classes_group.add_argument("--classes", type=str, help="New class list, comma-separated, in id order")
+    classes_group.add_argument("--classes-file", type=str, help="File with the new class list, one per line")
+    parser.add_argument("--alias", action="append", default=[], help="old=new rename or merge (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    parser.add_argument("--resume", action="store_true", help="Finish an interrupted remap from its journal")
+    parser.add_argument("--workers", type=int, default=DEFAULT_REMAP_WORKERS, help="Worker threads rewriting files")
+    add_json_progress_argument(parser)
+    args = parser.parse_args()
+
+    label_dir = Path(args.annot_dir)
+    reporter = ProgressReporter("relabel_classes", enabled=args.json_progress)
+    reporter.start(annot_dir=str(label_dir))
+    try:
+        if args.resume:
+            summary = resume_remap(label_dir, workers=args.workers, progress_callback=reporter.callback())
+        else:
+            if args.classes is None and args.classes_file is None:
+                parser.error("--classes or --classes-file is required unless --resume is given")
+            old_classes = class_utils.load_classes_file(label_dir / "classes.txt")
+            if args.classes is not None:
+                new_classes = [name.strip() for name in args.classes.split(",") if name.strip()]
+            else:
+                new_classes = class_utils.load_classes_file(Path(args.classes_file))
+            mapping = build_mapping(old_classes, new_classes, parse_aliases(args.alias))
+            for line in describe_mapping(mapping, old_classes, new_classes) or ["no class id changes"]:
+                print(f"[INFO] {line}")
+            if args.dry_run:
+                summary = dry_run(label_dir, mapping, workers=args.workers)
+            else:
+                summary = apply_remap(label_dir, mapping, new_classes, workers=args.workers, progress_callback=reporter.callback())
+    except (OSError, RuntimeError, ValueError) as exc:
+        print(f"[ERROR] {exc}")
+        reporter.error(str(exc))
+        sys.exit(1)
+
+    verb = "would change" if args.dry_run else "changed"
+    print(
+        f"[OK] {summary['files_affected']}/{summary['files']} label files {verb}: "
+        f"{summary['boxes_moved']} boxes renumbered, {summary['boxes_deleted']} deleted in {summary['seconds']:.2f}s"
+    )
+    if summary.get("files_skipped"):
+        print(f"[INFO] {summary['files_skipped']} files were already rewritten by the interrupted run")
+    if summary["error_count"]:
+        for name, error in summary["errors"]:
+            print(f"[WARN] {name}: {error}")
+        print("[ERROR] Some files were not rewritten; fix them and run again with --resume")
+        reporter.error(f"{summary['error_count']} files failed")
+        sys.exit(1)
+    reporter.summary(summary, message="Dry run finished." if args.dry_run else "Labels remapped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ Splits large video files into smaller chunks of 200MB each.
 Useful for uploading videos to the ARAS Auto-Annotation Studio when file size exceeds 200MB.
 
 Usage:
-    python segment_video.py <input_video> [output_directory] [chunk_size_mb]
+    python segment_video.py <input_video> [output_directory] [chunk_size_mb] [--json-progress]
 
 Examples:
     python segment_video.py large_video.mp4
@@ -23,6 +23,12 @@ import subprocess
 from pathlib import Path
 from typing import Optional
 
+APP_DIR = Path(__file__).resolve().parent.parent
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from core.progress_events import JSON_PROGRESS_FLAG, ProgressReporter
+
 
 def get_video_duration(video_path: str) -> float:
     """Get video duration in seconds using ffprobe."""
@@ -98,6 +104,7 @@ def segment_video(
     output_dir: str = "./segmented_videos",
     chunk_size_mb: int = 200,
     codec: str = "copy",
+    reporter: Optional[ProgressReporter] = None,
 ) -> bool:
     """
     Segment a video file into chunks of specified size.
@@ -107,13 +114,17 @@ def segment_video(
         output_dir: Directory to save segmented videos
         chunk_size_mb: Target size for each segment in MB
         codec: Video codec to use ('copy' for no re-encoding, or 'libx264', etc.)
+        reporter: Optional JSON-lines progress reporter
 
     Returns:
         bool: True if successful, False otherwise
     """
+    reporter = reporter or ProgressReporter("segment_video", enabled=False)
+
     # Validate input
     if not os.path.exists(input_video):
         print(f"[ERROR] Input video '{input_video}' not found")
+        reporter.error(f"Input video '{input_video}' not found")
         return False
 
     input_path = Path(input_video)
@@ -131,10 +142,12 @@ def segment_video(
     if file_size_mb <= chunk_size_mb:
         print(f"\n[OK] Video is already under {chunk_size_mb}MB ({file_size_mb:.2f}MB)")
         print("  No segmentation needed!")
+        reporter.summary({"segments": 0, "output_dir": str(output_path.absolute())}, message="No segmentation needed.")
         return True
 
     total_duration = get_video_duration(input_video)
     if total_duration is None:
+        reporter.error("Could not read video duration")
         return False
 
     print(f"   Duration: {total_duration / 60:.2f} minutes")
@@ -144,9 +157,11 @@ def segment_video(
 
     if segment_duration <= 0:
         print("[ERROR] Could not calculate segment duration")
+        reporter.error("Could not calculate segment duration")
         return False
 
     num_segments = int(total_duration / segment_duration) + 1
+    reporter.start(total=num_segments, input_video=str(input_path), chunk_size_mb=chunk_size_mb)
 
     print(f"\n[PLAN] Segmentation Plan:")
     print(f"   Target chunk size: {chunk_size_mb}MB")
@@ -185,13 +200,16 @@ def segment_video(
         ]
 
         try:
-            subprocess.run(cmd, check=True, capture_output=True)
+            with reporter.stage(f"segment_{segment_num:03d}"):
+                subprocess.run(cmd, check=True, capture_output=True)
             output_size = get_file_size_mb(str(output_file))
             print(f"          [OK] Created ({output_size:.2f}MB)\n")
             segment_num += 1
             start_time = end_time
+            reporter.progress(segment_num, max(num_segments, segment_num), message=output_file.name, force=True)
         except subprocess.CalledProcessError as e:
             print(f"          [ERROR] Error creating segment: {e}\n")
+            reporter.error(f"Error creating segment {output_file.name}: {e}")
             return False
 
     print(f"\n[OK] Segmentation completed successfully.")
@@ -204,20 +222,27 @@ def segment_video(
     print(f"   2. All segments will be saved to the same output_frames directory")
     print(f"   3. All segments can be processed together for unified annotation\n")
 
+    reporter.summary(
+        {"segments": segment_num, "output_dir": str(output_path.absolute())},
+        message=f"Created {segment_num} segments.",
+    )
     return True
 
 
 def main():
     """Main entry point."""
-    if len(sys.argv) < 2:
+    json_progress = JSON_PROGRESS_FLAG in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != JSON_PROGRESS_FLAG]
+    if len(args) < 1:
         print(__doc__)
         sys.exit(1)
 
-    input_video = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else "./segmented_videos"
-    chunk_size_mb = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    input_video = args[0]
+    output_dir = args[1] if len(args) > 1 else "./segmented_videos"
+    chunk_size_mb = int(args[2]) if len(args) > 2 else 200
 
-    success = segment_video(input_video, output_dir, chunk_size_mb)
+    reporter = ProgressReporter("segment_video", enabled=json_progress)
+    success = segment_video(input_video, output_dir, chunk_size_mb, reporter=reporter)
     sys.exit(0 if success else 1)
 
 
@@ -0,0 +1,139 @@
+"""Benchmark the fast augmentation kernels against the reference transforms.
+
+For each variant builder the same seeded random parameters are fed to the
+reference implementation (`data_augmentation.AUGMENTATIONS`) and the fast one
+(`core.fast_augmentation.FAST_AUGMENTATIONS`). The report shows:
+1) milliseconds per variant for both engines and the speedup,
+2) the largest per-pixel difference between the two outputs (0 = bit-identical),
+3) per-frame time of `core.batch_augmentation.augment_batch` on a stack of
+   frames against augmenting the same frames one at a time.
+
+Usage:
+    python performance_testing/benchmark_augmentation.py
+    python performance_testing/benchmark_augmentation.py --image path/to/frame.jpg --repeats 50
+    python performance_testing/benchmark_augmentation.py --width 1920 --height 1080
+    python performance_testing/benchmark_augmentation.py --batch 32 --variants 3
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+APP_DIR = Path(__file__).resolve().parent.parent / "automatic_annotation"
+sys.path.insert(0, str(APP_DIR))
+
+from core.batch_augmentation import augment_batch  # noqa: E402
+from core.fast_augmentation import FAST_AUGMENTATIONS  # noqa: E402
+from data_augmentation import AUGMENTATIONS, DEFAULT_AUGMENTATION_OPTIONS, augment_image  # noqa: E402
+
+# Variants expected to match the reference exactly for the same seed.
+EXACT_VARIANTS = {"use_small_rotate", "use_brightness_contrast", "use_gaussian_blur", "use_fog", "use_color_shift"}
+
+
+def load_image(path: str, width: int, height: int) -> np.ndarray:
+    """Load `path`, or build a synthetic frame with gradients and edges."""
+    if path:
+        img = cv2.imread(path)
+        if img is None:
+            raise SystemExit(f"[ERROR] Could not read image: {path}")
+        return img
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    img = np.stack([np.broadcast_to(x, (height, width)), np.broadcast_to(y, (height, width)), (x + y) / 2], axis=2)
+    img = img + rng.normal(0, 8, img.shape)
+    cv2.rectangle(img, (width // 4, height // 4), (width // 2, height // 2), (255, 255, 255), 4)
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def time_builder(builder, img: np.ndarray, repeats: int, seed: int) -> float:
+    """Return mean milliseconds per call, seeding the RNGs the same way for every engine."""
+    random.seed(seed)
+    np.random.seed(seed)
+    builder(img)  # warm caches (LUTs, kernels, noise banks) outside the timed loop
+    started = time.perf_counter()
+    for _ in range(repeats):
+        builder(img)
+    return (time.perf_counter() - started) * 1000 / repeats
+
+
+def max_difference(reference, fast, img: np.ndarray, seed: int) -> int:
+    random.seed(seed)
+    np.random.seed(seed)
+    expected, _ = reference(img)
+    random.seed(seed)
+    np.random.seed(seed)
+    actual, _ = fast(img)
+    return int(cv2.absdiff(expected, actual).max())
+
+
+def benchmark_batch(img: np.ndarray, batch: int, variants: int, repeats: int) -> None:
+    """Compare per-frame time of batched and per-image augmentation with every variant enabled."""
+    options = {flag: True for flag in DEFAULT_AUGMENTATION_OPTIONS}
+    frames = np.stack([img] * batch)
+    seeds = list(range(batch))
+
+    augment_batch(frames, variants, seeds=seeds, **options)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        augment_batch(frames, variants, seeds=seeds, **options)
+    batch_ms = (time.perf_counter() - started) * 1000 / (repeats * batch)
+
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for seed, frame in zip(seeds, frames):
+            augment_image(frame, variants, seed=seed, engine="fast", **options)
+    single_ms = (time.perf_counter() - started) * 1000 / (repeats * batch)
+
+    print(f"\nBatch of {batch} frames, {variants} variants each (all transforms enabled):")
+    print(f"  per image (fast engine): {single_ms:8.2f} ms/frame")
+    print(f"  augment_batch:           {batch_ms:8.2f} ms/frame ({single_ms / batch_ms:.1f}x)")
+
+
+def main():
+    """CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Benchmark fast augmentation kernels against the reference")
+    parser.add_argument("--image", default="", help="Frame to augment (default: synthetic frame)")
+    parser.add_argument("--width", type=int, default=1280, help="Synthetic frame width")
+    parser.add_argument("--height", type=int, default=720, help="Synthetic frame height")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed calls per variant and engine")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the random variant parameters")
+    parser.add_argument("--batch", type=int, default=16, help="Frames per stack in the batch comparison (0 = skip)")
+    parser.add_argument("--variants", type=int, default=2, help="Variants per frame in the batch comparison")
+    args = parser.parse_args()
+
+    img = load_image(args.image, args.width, args.height)
+    print(f"Frame {img.shape[1]}x{img.shape[0]}, {args.repeats} calls per variant\n")
+    print(f"{'variant':<26} {'reference':>11} {'fast':>9} {'speedup':>8} {'max diff':>9}")
+
+    fast_builders = dict(FAST_AUGMENTATIONS)
+    total_ref = total_fast = 0.0
+    ok = True
+    for flag, reference in AUGMENTATIONS:
+        fast = fast_builders[flag]
+        ref_ms = time_builder(reference, img, args.repeats, args.seed)
+        fast_ms = time_builder(fast, img, args.repeats, args.seed)
+        diff = max_difference(reference, fast, img, args.seed)
+        total_ref += ref_ms
+        total_fast += fast_ms
+        print(f"{flag:<26} {ref_ms:>8.2f} ms {fast_ms:>6.2f} ms {ref_ms / fast_ms:>7.1f}x {diff:>9}")
+        if flag in EXACT_VARIANTS and diff:
+            print(f"[ERROR] {flag}: fast output differs from the reference (max diff {diff})")
+            ok = False
+
+    print(f"\n{'all variants':<26} {total_ref:>8.2f} ms {total_fast:>6.2f} ms {total_ref / total_fast:>7.1f}x")
+
+    if args.batch > 0:
+        benchmark_batch(img, args.batch, args.variants, max(1, args.repeats // 4))
+    if ok:
+        print("[OK] Fast kernels match the reference where expected")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
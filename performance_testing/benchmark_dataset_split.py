@@ -0,0 +1,127 @@
+"""Speed and class balance of the stratified dataset split.
+
+Writes a synthetic set of YOLO label files to a temporary folder. Frames are
+grouped into videos, and a few rare classes appear in only a handful of videos.
+The script then:
+1) times `read_label_counts` (one pass over every label file),
+2) times `stratified_assignment` with video grouping,
+3) compares each class's val share with the hash split `create_dataset.py`
+   uses by default.
+
+[OK] means every class with boxes in at least two videos is present in both
+splits. It also means no class spread over at least ten videos has a val share
+further than `--tolerance` from the target. Classes in fewer videos can't hit
+the ratio, as videos are never split.
+
+Usage:
+    python performance_testing/benchmark_dataset_split.py
+    python performance_testing/benchmark_dataset_split.py --images 200000 --videos 400 --classes 30
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+APP_DIR = Path(__file__).resolve().parent.parent / "automatic_annotation"
+sys.path.insert(0, str(APP_DIR))
+
+from core.dataset_builder import Sample, hash_split  # noqa: E402
+from core.dataset_split import group_ids, read_label_counts, split_report, stratified_assignment  # noqa: E402
+
+
+def write_labels(root: Path, images: int, videos: int, classes: int, seed: int) -> list:
+    """Write synthetic label files (Zipf-like class frequencies, rare classes in few videos)."""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) ** 1.3 for rank in range(classes)]
+    rare = set(range(classes - max(1, classes // 5), classes))
+    rare_videos = {class_id: set(rng.sample(range(videos), k=min(videos, 3))) for class_id in rare}
+    samples = []
+    for i in range(images):
+        video = i % videos
+        folder = root / f"video{video:04d}"
+        folder.mkdir(exist_ok=True)
+        lines = []
+        for _ in range(rng.randint(0, 6)):
+            class_id = rng.choices(range(classes), weights=weights)[0]
+            if class_id in rare and video not in rare_videos[class_id]:
+                continue
+            lines.append(f"{class_id} {rng.random():.4f} {rng.random():.4f} 0.05 0.08")
+        name = f"frame{i // videos}"
+        (folder / f"{name}.txt").write_text("\n".join(lines) + ("\n" if lines else ""))
+        samples.append(Sample(key=f"video{video:04d}/{name}", folder=f"video{video:04d}", image="", label=f"video{video:04d}/{name}.txt"))
+    return samples
+
+
+def deviation(report: dict, val_ratio: float, eligible) -> float:
+    shares = [report["class_val_share"][class_id] for class_id in eligible]
+    return max((abs(share - val_ratio) for share in shares), default=0.0)
+
+
+def main():
+    """CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Speed and class balance of the stratified dataset split")
+    parser.add_argument("--images", type=int, default=50000, help="Synthetic label files")
+    parser.add_argument("--videos", type=int, default=200, help="Videos the frames are grouped into")
+    parser.add_argument("--classes", type=int, default=20, help="Number of classes")
+    parser.add_argument("--val-ratio", type=float, default=0.125, help="Target val share")
+    parser.add_argument("--tolerance", type=float, default=0.08, help="Allowed per-class deviation from the target")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data and the split")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        print(f"Writing {args.images} label files in {args.videos} videos...")
+        samples = write_labels(root, args.images, args.videos, args.classes, args.seed)
+
+        started = time.perf_counter()
+        counts = read_label_counts([root / sample.label for sample in samples], num_classes=args.classes)
+        read_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    groups = group_ids([sample.key for sample in samples], "folder")
+    val_mask = stratified_assignment(counts, args.val_ratio, groups=groups, seed=args.seed)
+    split_s = time.perf_counter() - started
+
+    hashed = hash_split(samples, val_ratio=args.val_ratio, seed=args.seed, group_by="folder")
+    hash_mask = np.asarray([hashed[sample.key] == "val" for sample in samples])
+
+    stratified = split_report(counts, val_mask)
+    baseline = split_report(counts, hash_mask)
+    group_classes = np.zeros((groups.max() + 1, counts.shape[1]), dtype=np.int64)
+    np.add.at(group_classes, groups, counts)
+    videos_per_class = (group_classes > 0).sum(axis=0)
+    eligible = [class_id for class_id in range(counts.shape[1]) if videos_per_class[class_id] >= 2]
+    balanced = [class_id for class_id in eligible if videos_per_class[class_id] >= 10]
+
+    print(f"\nread_label_counts:     {read_s:6.2f} s ({len(samples) / read_s:,.0f} files/s)")
+    print(f"stratified_assignment: {split_s:6.2f} s ({int(groups.max()) + 1} video groups)\n")
+    print(f"{'class':>5} {'boxes':>8} {'hash val':>9} {'stratified val':>15}")
+    for class_id in range(counts.shape[1]):
+        print(
+            f"{class_id:>5} {stratified['class_boxes'][class_id]:>8} "
+            f"{baseline['class_val_share'][class_id]:>9.1%} {stratified['class_val_share'][class_id]:>15.1%}"
+        )
+    print(f"\nval share of images: hash {baseline['val_share']:.1%}, stratified {stratified['val_share']:.1%}")
+    print(
+        f"worst class deviation (classes in 10+ videos): hash {deviation(baseline, args.val_ratio, balanced):.1%}, "
+        f"stratified {deviation(stratified, args.val_ratio, balanced):.1%}"
+    )
+
+    missing = [c for c in stratified["classes_missing_from_val"] + stratified["classes_missing_from_train"] if c in eligible]
+    ok = not missing and deviation(stratified, args.val_ratio, balanced) <= args.tolerance
+    if missing:
+        print(f"[ERROR] Classes missing from one split: {sorted(set(missing))}")
+    elif not ok:
+        print(f"[ERROR] A class deviates more than {args.tolerance:.0%} from the target val share")
+    else:
+        print("[OK] Every class is represented in both splits within tolerance")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
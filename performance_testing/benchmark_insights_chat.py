@@ -0,0 +1,202 @@
+"""Latency of Insights chat requests, streamed and non-streamed.
+
+A local stand-in for an OpenAI-compatible provider answers
+`POST /v1/chat/completions`. It waits `--first-token-ms` before the first
+token and `--token-ms` between tokens, either as one JSON body or as
+server-sent events (`stream=True`). The script then times
+`core.insights_chat.stream_chat_completion` and `request_chat_completion`
+against it and reports:
+1) median time to first token and total time for both modes,
+2) whether the streamed answer matches the non-streamed one,
+3) how many TCP connections the pooled client opened (1 = reused).
+
+Usage:
+    python performance_testing/benchmark_insights_chat.py
+    python performance_testing/benchmark_insights_chat.py --requests 20 --tokens 120 --token-ms 15
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "automatic_annotation"
+sys.path.insert(0, str(APP_DIR))
+
+from core import insights_chat  # noqa: E402
+
+# Any configured provider; requests go to the local stand-in via `base_url`.
+PROVIDER = next(iter(insights_chat.PROVIDER_CONFIG))
+
+ANSWER_WORDS = (
+    "Recall on small objects is the weakest metric across the compared models. "
+    "The latest run improves mAP50 by two points but loses precision on the person class. "
+    "Collect more night frames and re-check the confidence threshold before the next training run."
+).split()
+
+
+class FakeProvider(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible chat endpoint with configurable token timing."""
+
+    protocol_version = "HTTP/1.1"
+    tokens = 60
+    first_token_s = 0.2
+    token_s = 0.01
+    client_ports = set()
+
+    def log_message(self, *args):
+        pass
+
+    def _answer_tokens(self):
+        words = [ANSWER_WORDS[i % len(ANSWER_WORDS)] for i in range(self.tokens)]
+        return [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self.send_error(404)
+            return
+        FakeProvider.client_ports.add(self.client_address[1])
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        tokens = self._answer_tokens()
+        base = {"id": "chatcmpl-bench", "created": int(time.time()), "model": body.get("model", "bench")}
+        time.sleep(self.first_token_s)
+
+        if not body.get("stream"):
+            time.sleep(self.token_s * (len(tokens) - 1))
+            payload = json.dumps({
+                **base,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i, token in enumerate(tokens):
+                if i:
+                    time.sleep(self.token_s)
+                self._write_event({
+                    **base,
+                    "object": "chat.completion.chunk",
+                    "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+                })
+            self._write_event({
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            })
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client closed the stream early (answer cap reached).
+            self.close_connection = True
+
+    def _write_event(self, payload: dict) -> None:
+        self._write_chunk(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def time_streamed(base_url: str, messages, requests: int):
+    """Return (ttft list, total list, last text) for streamed requests."""
+    ttfts, totals, text = [], [], ""
+    for _ in range(requests):
+        stats = {}
+        text = "".join(insights_chat.stream_chat_completion(
+            provider=PROVIDER,
+            api_key="bench-key",
+            model_name="bench-model",
+            messages=messages,
+            stats=stats,
+            base_url=base_url,
+        ))
+        ttfts.append(stats["ttft_s"])
+        totals.append(stats["total_s"])
+    return ttfts, totals, text
+
+
+def time_blocking(base_url: str, messages, requests: int):
+    """Return (total list, last text) for non-streamed requests."""
+    totals, text = [], ""
+    for _ in range(requests):
+        started = time.perf_counter()
+        text = insights_chat.request_chat_completion(
+            provider=PROVIDER,
+            api_key="bench-key",
+            model_name="bench-model",
+            messages=messages,
+            base_url=base_url,
+        )
+        totals.append(time.perf_counter() - started)
+    return totals, text
+
+
+def main():
+    """CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Latency of streamed and non-streamed Insights chat requests")
+    parser.add_argument("--requests", type=int, default=10, help="Requests per mode")
+    parser.add_argument("--tokens", type=int, default=60, help="Tokens per answer")
+    parser.add_argument("--first-token-ms", type=float, default=200.0, help="Provider delay before the first token")
+    parser.add_argument("--token-ms", type=float, default=10.0, help="Provider delay between tokens")
+    args = parser.parse_args()
+
+    FakeProvider.tokens = max(1, args.tokens)
+    FakeProvider.first_token_s = args.first_token_ms / 1000
+    FakeProvider.token_s = args.token_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeProvider)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    messages = insights_chat.build_messages([{"role": "user", "content": "Which model is best?"}], "No metrics.")
+    ok = True
+    try:
+        ttfts, stream_totals, streamed = time_streamed(base_url, messages, args.requests)
+        blocking_totals, blocking = time_blocking(base_url, messages, args.requests)
+    except Exception as exc:
+        print(f"[ERROR] Requests against the local provider failed: {exc}")
+        sys.exit(1)
+    finally:
+        server.shutdown()
+
+    print(f"{args.requests} requests per mode, {args.tokens} tokens, "
+          f"{args.first_token_ms:.0f} ms to first token, {args.token_ms:.0f} ms per token\n")
+    print(f"{'mode':<12} {'first token':>12} {'total':>10}")
+    print(f"{'streamed':<12} {statistics.median(ttfts) * 1000:>9.0f} ms {statistics.median(stream_totals) * 1000:>7.0f} ms")
+    blocking_ms = statistics.median(blocking_totals) * 1000
+    print(f"{'blocking':<12} {blocking_ms:>9.0f} ms {blocking_ms:>7.0f} ms")
+
+    if streamed != blocking:
+        print("[ERROR] Streamed answer differs from the non-streamed answer")
+        ok = False
+    connections = len(FakeProvider.client_ports)
+    print(f"\nTCP connections opened: {connections} for {2 * args.requests} requests")
+    if connections > 1:
+        print("[ERROR] The pooled client did not reuse its connection")
+        ok = False
+
+    if ok:
+        print("[OK] Streaming matches the blocking answer and the connection was reused")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
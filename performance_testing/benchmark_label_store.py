@@ -0,0 +1,112 @@
+"""Label access through the packed label store vs. parsing `.txt` files.
+
+Writes synthetic YOLO label files to a temporary folder, then times:
+1) parsing every file line by line (what the galleries and metrics did before),
+2) the first sync of a `LabelStore` (parse everything, write the packed arrays),
+3) reopening the store from disk (memory-mapped, only `stat` calls),
+4) per-image lookups through the reopened store,
+5) a sync after editing a few files.
+
+[OK] means every lookup returns the same boxes as the line-by-line parser.
+
+Usage:
+    python performance_testing/benchmark_label_store.py
+    python performance_testing/benchmark_label_store.py --images 100000 --edits 50
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+APP_DIR = Path(__file__).resolve().parent.parent / "automatic_annotation"
+sys.path.insert(0, str(APP_DIR))
+
+from core.label_store import LabelStore  # noqa: E402
+
+
+def write_labels(root: Path, images: int, seed: int) -> list:
+    rng = random.Random(seed)
+    paths = []
+    for i in range(images):
+        lines = [
+            f"{rng.randrange(10)} {rng.random():.6f} {rng.random():.6f} {rng.uniform(0.01, 0.3):.6f} {rng.uniform(0.01, 0.3):.6f}"
+            for _ in range(rng.randint(0, 8))
+        ]
+        path = root / f"frame{i}.txt"
+        path.write_text("\n".join(lines) + ("\n" if lines else ""))
+        paths.append(path)
+    return paths
+
+
+def parse_lines(path: Path) -> list:
+    boxes = []
+    with open(path, "r") as file_obj:
+        for line in file_obj:
+            parts = line.split()
+            if len(parts) == 5:
+                boxes.append([float(value) for value in parts])
+    return boxes
+
+
+def main():
+    """CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Benchmark the packed label store")
+    parser.add_argument("--images", type=int, default=20000, help="Synthetic label files")
+    parser.add_argument("--edits", type=int, default=20, help="Files edited before the incremental sync")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic labels")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "labels"
+        root.mkdir()
+        store_dir = Path(tmp) / "store"
+        print(f"Writing {args.images} label files...")
+        paths = write_labels(root, args.images, args.seed)
+
+        started = time.perf_counter()
+        expected = [parse_lines(path) for path in paths]
+        text_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        LabelStore(root, store_dir=store_dir).sync()
+        cold_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        store = LabelStore(root, store_dir=store_dir)
+        changed = store.sync()
+        reopen_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        looked_up = [store.boxes(path) for path in paths]
+        lookup_s = time.perf_counter() - started
+
+        mismatches = sum(
+            1 for boxes, rows in zip(looked_up, expected)
+            if not np.allclose(boxes, np.asarray(rows, dtype=np.float32).reshape(-1, 5))
+        )
+
+        for path in random.Random(args.seed).sample(paths, k=min(args.edits, len(paths))):
+            path.write_text("0 0.5 0.5 0.1 0.1\n")
+        started = time.perf_counter()
+        store.sync()
+        edit_s = time.perf_counter() - started
+
+    print(f"\nline-by-line parse:    {text_s:7.3f} s")
+    print(f"store first sync:      {cold_s:7.3f} s")
+    print(f"store reopen + check:  {reopen_s:7.3f} s (changed: {changed})")
+    print(f"{len(paths)} lookups:        {lookup_s:7.3f} s ({lookup_s / max(1, len(paths)) * 1e6:.1f} us each)")
+    print(f"sync after {args.edits} edits:   {edit_s:7.3f} s")
+
+    if mismatches or changed:
+        print(f"[ERROR] {mismatches} files differ from the line parser" if mismatches else "[ERROR] Reopened store was stale")
+        sys.exit(1)
+    print("[OK] Store lookups match the text files")
+
+
+if __name__ == "__main__":
+    main()
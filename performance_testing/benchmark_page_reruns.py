@@ -0,0 +1,178 @@
+"""Per-rerun script time for each page of the Streamlit app.
+
+Every widget interaction reruns the app script, so this measures the steady
+state a user feels while clicking around: each page is run once to warm the
+caches and then rerun `--reruns` times through Streamlit's `AppTest` harness.
+Every (script, page) pair runs in a fresh interpreter so module caches from
+one measurement don't flatter the next.
+
+`--baseline-rev` also measures `streamlit_app.py` as it was at a git revision
+and prints a before/after table.
+
+Usage:
+    python performance_testing/benchmark_page_reruns.py
+    python performance_testing/benchmark_page_reruns.py --reruns 20 --page model
+    python performance_testing/benchmark_page_reruns.py --baseline-rev HEAD~1
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+APP_DIR = REPO_DIR / "automatic_annotation"
+APP_PATH = APP_DIR / "streamlit_app.py"
+
+PAGES = ("annotate", "model", "insights")
+
+
+def run_child(script: str, page: str, reruns: int, timeout: float) -> None:
+    """Time the first run and `reruns` reruns of one page and print JSON (child process)."""
+    sys.path.insert(0, str(APP_DIR))
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(script, default_timeout=timeout)
+    app.query_params["page"] = page
+    started = time.perf_counter()
+    app.run()
+    first_ms = (time.perf_counter() - started) * 1000
+
+    rerun_ms = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        app.run()
+        rerun_ms.append((time.perf_counter() - started) * 1000)
+
+    print(json.dumps({
+        "page": page,
+        "first_run_ms": round(first_ms, 1),
+        "rerun_ms": [round(value, 1) for value in rerun_ms],
+        "exceptions": [str(getattr(item, "value", item)) for item in app.exception],
+    }))
+
+
+def measure(script: Path, page: str, reruns: int, timeout: float):
+    """Run one page of `script` in a child interpreter; return its result dict or None."""
+    proc = subprocess.run(
+        [
+            sys.executable, str(Path(__file__).resolve()),
+            "--child", str(script), "--page", page,
+            "--reruns", str(reruns), "--timeout", str(timeout),
+        ],
+        cwd=str(APP_DIR),
+        capture_output=True,
+        text=True,
+    )
+    for line in reversed(proc.stdout.splitlines()):
+        try:
+            return json.loads(line)
+        except ValueError:
+            continue
+    print(f"[ERROR] {script.name} / {page}: benchmark child failed (code {proc.returncode})")
+    print(proc.stderr[-2000:])
+    return None
+
+
+def summarize(result) -> dict:
+    """Reduce a child result to first-run, mean and median rerun times."""
+    reruns = result["rerun_ms"] or [result["first_run_ms"]]
+    return {
+        "first": result["first_run_ms"],
+        "mean": statistics.fmean(reruns),
+        "median": statistics.median(reruns),
+    }
+
+
+def export_revision(rev: str) -> Path:
+    """Write `streamlit_app.py` at `rev` next to the current one and return its path."""
+    source = subprocess.run(
+        ["git", "show", f"{rev}:automatic_annotation/streamlit_app.py"],
+        cwd=str(REPO_DIR),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    # Kept inside the app folder so the old script's relative imports and paths still resolve.
+    handle = tempfile.NamedTemporaryFile(
+        "w", suffix=".py", prefix="_baseline_app_", dir=str(APP_DIR), delete=False, encoding="utf-8"
+    )
+    with handle:
+        handle.write(source)
+    return Path(handle.name)
+
+
+def main():
+    """CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Per-rerun script time for each app page")
+    parser.add_argument("--page", choices=PAGES, action="append", help="Page to benchmark (repeatable, default: all)")
+    parser.add_argument("--reruns", type=int, default=10, help="Reruns to time after the warm-up run")
+    parser.add_argument("--script", default=str(APP_PATH), help="App script to benchmark")
+    parser.add_argument("--baseline-rev", default=None, help="Also benchmark streamlit_app.py at this git revision")
+    parser.add_argument("--timeout", type=float, default=120.0, help="AppTest run timeout in seconds")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.page[0], args.reruns, args.timeout)
+        return
+
+    pages = args.page or PAGES
+    scripts = [("current", Path(args.script).resolve())]
+    baseline_path = None
+    if args.baseline_rev:
+        try:
+            baseline_path = export_revision(args.baseline_rev)
+        except subprocess.CalledProcessError as exc:
+            print(f"[ERROR] Could not read streamlit_app.py at {args.baseline_rev}: {exc.stderr.strip()}")
+            sys.exit(1)
+        scripts.insert(0, (args.baseline_rev, baseline_path))
+
+    results = {}
+    ok = True
+    try:
+        for name, script in scripts:
+            for page in pages:
+                result = measure(script, page, args.reruns, args.timeout)
+                if result is None:
+                    ok = False
+                    continue
+                if result["exceptions"]:
+                    print(f"[ERROR] {name} / {page}: script raised: {result['exceptions']}")
+                    ok = False
+                results[(name, page)] = summarize(result)
+    finally:
+        if baseline_path is not None:
+            baseline_path.unlink(missing_ok=True)
+
+    print(f"\n{'script':<12} {'page':<10} {'first run':>11} {'rerun mean':>11} {'rerun median':>13}")
+    for name, _ in scripts:
+        for page in pages:
+            stats = results.get((name, page))
+            if stats is None:
+                continue
+            print(
+                f"{name:<12} {page:<10} {stats['first']:>8.0f} ms {stats['mean']:>8.0f} ms {stats['median']:>10.0f} ms"
+            )
+
+    if args.baseline_rev:
+        print("\nRerun median, before -> after:")
+        for page in pages:
+            before = results.get((args.baseline_rev, page))
+            after = results.get(("current", page))
+            if before is None or after is None:
+                continue
+            change = (after["median"] - before["median"]) / before["median"] * 100 if before["median"] else 0.0
+            print(f"  {page:<10} {before['median']:>7.0f} ms -> {after['median']:>7.0f} ms ({change:+.0f}%)")
+
+    if ok:
+        print(f"\n[OK] Benchmarked {len(pages)} page(s) x {len(scripts)} script(s), {args.reruns} reruns each")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
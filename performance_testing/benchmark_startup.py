@@ -0,0 +1,177 @@
+"""Cold-start benchmark for the Streamlit app with an import-time breakdown.
+
+Each page is run once in a fresh interpreter under `python -X importtime`
+through Streamlit's `AppTest` harness. The report shows:
+1) wall time of the first script run (what a user waits for on cold start),
+2) the packages whose imports cost the most during that run,
+3) heavy modules the page loaded although it should not need them.
+
+The process exits non-zero when a page goes over its budget or loads a
+forbidden module, so the script doubles as a startup regression check.
+
+Usage:
+    python performance_testing/benchmark_startup.py
+    python performance_testing/benchmark_startup.py --page insights --top 15
+    python performance_testing/benchmark_startup.py --budget-ms 2500
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "automatic_annotation"
+APP_PATH = APP_DIR / "streamlit_app.py"
+
+PAGES = ("annotate", "model", "insights")
+
+# First-run budgets in milliseconds, measured on a warm disk cache.
+STARTUP_BUDGET_MS = {
+    "annotate": 4000,
+    "model": 4000,
+    "insights": 3000,
+}
+
+# Modules each page must not import on its first run.
+FORBIDDEN_MODULES = {
+    "annotate": ("openai",),
+    "model": ("openai",),
+    "insights": ("cv2", "ultralytics", "torch"),
+}
+
+APP_PHASE_MARKER = "=== app run ==="
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_child(page: str, timeout: float) -> None:
+    """Run one page through AppTest and print timings as JSON (child process)."""
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    streamlit_ms = (time.perf_counter() - started) * 1000
+
+    print(APP_PHASE_MARKER, file=sys.stderr, flush=True)
+    started = time.perf_counter()
+    app = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    app.query_params["page"] = page
+    app.run()
+    app_ms = (time.perf_counter() - started) * 1000
+
+    print(json.dumps({
+        "page": page,
+        "streamlit_import_ms": round(streamlit_ms, 1),
+        "first_run_ms": round(app_ms, 1),
+        "exceptions": [str(getattr(item, "value", item)) for item in app.exception],
+    }))
+
+
+def parse_importtime(stderr: str):
+    """Split `-X importtime` output into (modules before the app run, app-run rows)."""
+    before = set()
+    rows = []
+    in_app_phase = False
+    for line in stderr.splitlines():
+        if line.strip() == APP_PHASE_MARKER:
+            in_app_phase = True
+            continue
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        if in_app_phase:
+            rows.append({
+                "name": name,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": len(indent) // 2,
+            })
+        else:
+            before.add(name)
+    return before, rows
+
+
+def summarize_packages(rows, top: int):
+    """Sum self time per top-level package, largest first."""
+    per_package = defaultdict(int)
+    for row in rows:
+        per_package[row["name"].split(".")[0]] += row["self_us"]
+    return sorted(per_package.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def benchmark_page(page: str, budget_ms: float, top: int, timeout: float) -> bool:
+    """Benchmark one page in a fresh interpreter; return True when within budget."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(Path(__file__).resolve()), "--child", page, "--timeout", str(timeout)],
+        cwd=str(APP_DIR),
+        capture_output=True,
+        text=True,
+    )
+    result = None
+    for line in reversed(proc.stdout.splitlines()):
+        try:
+            result = json.loads(line)
+            break
+        except ValueError:
+            continue
+
+    if proc.returncode != 0 or result is None:
+        print(f"[ERROR] {page}: benchmark child failed (code {proc.returncode})")
+        print(proc.stderr[-2000:])
+        return False
+
+    before, rows = parse_importtime(proc.stderr)
+    app_imports = {row["name"] for row in rows}
+    loaded = before | app_imports
+    import_ms = sum(row["self_us"] for row in rows) / 1000
+
+    print(f"\n=== {page} ===")
+    print(f"  streamlit import:  {result['streamlit_import_ms']:.0f} ms")
+    print(f"  first script run:  {result['first_run_ms']:.0f} ms (budget {budget_ms:.0f} ms)")
+    print(f"  imports during run: {len(app_imports)} modules, {import_ms:.0f} ms")
+    print("  heaviest packages (self time during run):")
+    for package, self_us in summarize_packages(rows, top):
+        print(f"    {package:<28} {self_us / 1000:8.1f} ms")
+
+    ok = True
+    if result["exceptions"]:
+        print(f"[ERROR] {page}: script raised: {result['exceptions']}")
+        ok = False
+    if result["first_run_ms"] > budget_ms:
+        print(f"[ERROR] {page}: first run {result['first_run_ms']:.0f} ms exceeds budget {budget_ms:.0f} ms")
+        ok = False
+    forbidden = [name for name in FORBIDDEN_MODULES.get(page, ()) if name in loaded]
+    if forbidden:
+        print(f"[ERROR] {page}: loaded modules it should not need: {', '.join(forbidden)}")
+        ok = False
+    if ok:
+        print(f"[OK] {page} within budget")
+    return ok
+
+
+def main():
+    """CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the Streamlit app")
+    parser.add_argument("--page", choices=PAGES, action="append", help="Page to benchmark (repeatable, default: all)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Override the per-page first-run budget")
+    parser.add_argument("--top", type=int, default=10, help="Number of packages in the import breakdown")
+    parser.add_argument("--timeout", type=float, default=120.0, help="AppTest run timeout in seconds")
+    parser.add_argument("--child", choices=PAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.timeout)
+        return
+
+    results = []
+    for page in args.page or PAGES:
+        budget = args.budget_ms if args.budget_ms is not None else STARTUP_BUDGET_MS[page]
+        results.append(benchmark_page(page, budget, args.top, args.timeout))
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
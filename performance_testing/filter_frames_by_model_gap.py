@@ -12,11 +12,21 @@ import argparse
 import json
 import os
 import shutil
+import sys
 from pathlib import Path
 
 import cv2
+import numpy as np
 from ultralytics import YOLO
 
+APP_DIR = Path(__file__).resolve().parent.parent / "automatic_annotation"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from core import file_index as file_index_utils
+from core import label_store as label_store_utils
+from core.progress_events import ProgressReporter, add_json_progress_argument
+
 
 def _load_label_dict(class_filename="data/class/classes.txt"):
     """Load class index -> class name mapping from a classes.txt file."""
@@ -38,26 +48,11 @@ label_dict = _load_label_dict()
 
 def load_yolo_gt(label_path, img_w, img_h):
     """Read YOLO txt labels and convert normalized boxes to pixel coordinates."""
-    gt = []
-    if not os.path.exists(label_path):
-        return gt
-
-    with open(label_path) as f:
-        for line in f:
-            cls, xc, yc, bw, bh = map(float, line.split())
-
-            xc *= img_w
-            yc *= img_h
-            bw *= img_w
-            bh *= img_h
-
-            x1 = int(xc - bw / 2)
-            y1 = int(yc - bh / 2)
-            x2 = int(xc + bw / 2)
-            y2 = int(yc + bh / 2)
-
-            gt.append([int(cls), x1, y1, x2, y2])
-    return gt
+    labels = label_store_utils.parse_label_file(label_path).astype(np.float64)
+    xc, yc = labels[:, 1] * img_w, labels[:, 2] * img_h
+    bw, bh = labels[:, 3] * img_w, labels[:, 4] * img_h
+    corners = np.stack([xc - bw / 2, yc - bh / 2, xc + bw / 2, yc + bh / 2], axis=1).astype(int)
+    return [[int(cls), *box] for cls, box in zip(labels[:, 0], corners.tolist())]
 
 
 def iou(boxA, boxB):
@@ -139,18 +134,8 @@ def custom_model_is_worse(
 
 
 def _iter_image_files(folder_path):
-    """List top-level image files in sorted order for deterministic processing."""
-    image_exts = {".jpg", ".jpeg", ".png", ".bmp"}
-    folder = Path(folder_path)
-    if not folder.exists():
-        return []
-
-    files = [
-        path
-        for path in sorted(folder.iterdir())
-        if path.is_file() and path.suffix.lower() in image_exts
-    ]
-    return files
+    """List top-level image files in natural sort order for deterministic processing."""
+    return list(file_index_utils.list_indexed(Path(folder_path), file_index_utils.IMAGE_EXTENSIONS, recursive=False))
 
 
 def _iter_label_files(folder_path):
@@ -246,6 +231,7 @@ def filter_poor_frames(
     max_allowed_box_diff=1,
     clear_destination=True,
     create_annotated=True,
+    reporter=None,
 ):
     """Split frames into poor and non-poor sets using model-gap comparison.
 
@@ -254,7 +240,9 @@ def filter_poor_frames(
     - Matching `.txt` labels (same filename stem) are copied with each frame when present.
     - Annotated images with both model predictions are saved to `{destination_dir}_annotated`.
     - Destination folders can be cleared first for clean output.
+    - `reporter` (a `ProgressReporter`) receives per-frame progress and stage timings.
     """
+    reporter = reporter or ProgressReporter("filter", enabled=False)
     source_path = Path(source_dir)
     destination_path = Path(destination_dir)
     annotated_path = Path(str(destination_dir) + "_annotated") if create_annotated else None
@@ -283,16 +271,21 @@ def filter_poor_frames(
             for file_path in _iter_label_files(other_destination_path):
                 file_path.unlink(missing_ok=True)
 
-    custom_model = YOLO(str(new_model_path))
-    yolo_model = YOLO(str(yolo_model_path))
+    with reporter.stage("model_load"):
+        custom_model = YOLO(str(new_model_path))
+        yolo_model = YOLO(str(yolo_model_path))
 
-    image_files = _iter_image_files(source_path)
+    with reporter.stage("list_frames"):
+        image_files = _iter_image_files(source_path)
     poor_count = 0
     other_count = 0
+    reporter.start(total=len(image_files), source_dir=str(source_path))
 
-    for image_path in image_files:
+    for frame_idx, image_path in enumerate(image_files, start=1):
         frame = cv2.imread(str(image_path))
         if frame is None:
+            reporter.warning(f"Could not read {image_path.name}")
+            reporter.progress(frame_idx, message=image_path.name)
             continue
 
         custom_result = custom_model(frame, conf=conf_thresh, verbose=False)[0]
@@ -326,6 +319,8 @@ def filter_poor_frames(
             _copy_image_and_label(image_path, other_destination_path)
             other_count += 1
 
+        reporter.progress(frame_idx, message=image_path.name)
+
     return {
         "source_dir": str(source_path),
         "destination_dir": str(destination_path),
@@ -347,19 +342,22 @@ def evaluate_folder(
     folder_path,
     output_dir,
     iou_thresh=0.5,
-    conf_thresh=0.25
+    conf_thresh=0.25,
+    reporter=None,
 ):
     """Evaluate one model against YOLO labels and save visualization frames.
 
     Returns dataset-level precision/recall via printed output.
     """
+    reporter = reporter or ProgressReporter("evaluate", enabled=False)
     os.makedirs(output_dir, exist_ok=True)
 
     TP = FP = FN = 0
 
-    for file in sorted(os.listdir(folder_path)):
-        if not file.lower().endswith(".jpg"):
-            continue
+    files = [file for file in sorted(os.listdir(folder_path)) if file.lower().endswith(".jpg")]
+    reporter.start(total=len(files), folder_path=str(folder_path))
+
+    for file_idx, file in enumerate(files, start=1):
 
         img_path = os.path.join(folder_path, file)
         label_path = os.path.join(
@@ -368,6 +366,8 @@ def evaluate_folder(
 
         img = cv2.imread(img_path)
         if img is None:
+            reporter.warning(f"Could not read {file}")
+            reporter.progress(file_idx, message=file)
             continue
 
         h, w, _ = img.shape
@@ -433,6 +433,7 @@ def evaluate_folder(
 
         cv2.imwrite(os.path.join(output_dir, file), img)
         print(f"Processed {file}")
+        reporter.progress(file_idx, message=file)
 
     precision = TP / (TP + FP) if (TP + FP) > 0 else 0
     recall = TP / (TP + FN) if (TP + FN) > 0 else 0
@@ -441,6 +442,10 @@ def evaluate_folder(
     print(f"TP: {TP}, FP: {FP}, FN: {FN}")
     print(f"Precision: {precision:.3f}")
     print(f"Recall:    {recall:.3f}")
+    reporter.summary(
+        {"tp": TP, "fp": FP, "fn": FN, "precision": precision, "recall": recall},
+        message=f"Precision {precision:.3f} | Recall {recall:.3f}",
+    )
 
 
 def main():
@@ -461,17 +466,21 @@ def main():
     parser.add_argument("--conf-thresh", type=float, default=0.25)
     parser.add_argument("--max-allowed-box-diff", type=int, default=1)
     parser.add_argument("--clear-destination", action="store_true")
+    add_json_progress_argument(parser)
 
     args = parser.parse_args()
+    reporter = ProgressReporter(args.mode, enabled=args.json_progress)
 
     if args.mode == "evaluate":
-        model = YOLO(args.model)
+        with reporter.stage("model_load"):
+            model = YOLO(args.model)
         evaluate_folder(
             model,
             folder_path=args.folder_path,
             output_dir=args.output_dir,
             iou_thresh=args.iou_thresh,
             conf_thresh=args.conf_thresh,
+            reporter=reporter,
         )
         return
 
@@ -490,9 +499,17 @@ def main():
         iou_thresh=args.iou_thresh,
         max_allowed_box_diff=args.max_allowed_box_diff,
         clear_destination=args.clear_destination,
+        reporter=reporter,
     )
 
-    print(json.dumps(summary))
+    if args.json_progress:
+        reporter.summary(
+            summary,
+            message=f"{summary['poor_images']} poor / {summary['other_images']} other of {summary['total_images']} frames.",
+        )
+    else:
+        # Older callers read the last stdout line as the summary.
+        print(json.dumps(summary))
 
 
 if __name__ == "__main__":